@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""Benchmark commit ingestion backends of the analyzer.
+
+Builds a synthetic repository with `git fast-import` and times
+get_commits_between() with every backend, then compares peak Python
+memory of the in-memory and streaming changelog pipelines.
+
+Usage: python scripts/bench_analyzer.py [--commits 5000] [--repo PATH]
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from mcp_server.services.analyzer import BACKENDS, get_commits_between, get_repo
+
+TYPES = ["feat", "fix", "docs", "refactor", "chore", "perf"]
+
+
+def create_synthetic_repo(path: str, commits: int, files: int = 50) -> None:
+    """Create repository with `commits` linear commits via fast-import."""
+    subprocess.run(["git", "init", "-q", path], check=True)
+    lines = []
+    for i in range(commits):
+        message = f"{TYPES[i % len(TYPES)]}: synthetic change {i}\n".encode()
+        content = f"revision {i}\n".encode()
+        lines.append(b"commit refs/heads/main\n")
+        lines.append(b"committer Bench <bench@example.com> %d +0000\n" % (1_600_000_000 + i * 60))
+        lines.append(b"data %d\n%s" % (len(message), message))
+        lines.append(b"M 644 inline file%d.txt\n" % (i % files))
+        lines.append(b"data %d\n%s\n" % (len(content), content))
+        if i and i % 500 == 0:
+            lines.append(b"tag v0.%d.0\nfrom refs/heads/main\n" % (i // 500))
+            lines.append(b"tagger Bench <bench@example.com> %d +0000\n" % (1_600_000_000 + i * 60))
+            lines.append(b"data 0\n\n")
+    subprocess.run(
+        ["git", "fast-import", "--quiet"],
+        input=b"".join(lines), cwd=path, check=True,
+    )
+    subprocess.run(["git", "symbolic-ref", "HEAD", "refs/heads/main"], cwd=path, check=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commits", type=int, default=5000)
+    parser.add_argument("--repo", help="Existing repository (skips synthetic repo)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo_path = args.repo
+        if repo_path is None:
+            repo_path = os.path.join(tmpdir, "bench_repo")
+            create_synthetic_repo(repo_path, args.commits)
+
+        repo = get_repo(repo_path)
+        for include_stats in (True, False):
+            label = "stats" if include_stats else "headers"
+            for backend in sorted(BACKENDS):
+                start = time.perf_counter()
+                commits = get_commits_between(repo, backend=backend, include_stats=include_stats)
+                elapsed = time.perf_counter() - start
+                print(f"{backend:>10} ({label}): {len(commits)} commits in {elapsed:.2f}s")
+        repo.close()
+
+        bench_changelog(repo_path)
+
+
+def bench_changelog(repo_path: str) -> None:
+    """Peak traced memory of full changelog generation."""
+    from mcp_server.server import generate_changelog
+    from mcp_server.services.pipeline import stream_changelog
+
+    def in_memory():
+        generate_changelog(repo_path)
+
+    def streaming():
+        with open(os.devnull, "w") as f:
+            stream_changelog(repo_path, f)
+
+    for name, run in [("in-memory", in_memory), ("streaming", streaming)]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:>10}: changelog in {elapsed:.2f}s, peak {peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""Benchmark history queries with and without a commit-graph.
+
+Builds a synthetic repository with `git fast-import`, times
+reachability, topological and path-limited queries, writes a
+commit-graph with changed-path Bloom filters and times them again.
+
+Usage: python scripts/bench_commit_graph.py [--commits 100000] [--repo PATH]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from bench_analyzer import create_synthetic_repo
+
+from mcp_server.services.analyzer import get_commits_between, get_repo
+from mcp_server.services.maintenance import commit_graph_status, write_commit_graph
+
+
+def run_queries(repo) -> dict[str, float]:
+    """Time each query once; returns name -> seconds."""
+    root = repo.git.rev_list("--max-parents=0", "HEAD").split()[0]
+    queries = {
+        "is-ancestor(root, HEAD)": lambda: repo.is_ancestor(root, "HEAD"),
+        "log --topo-order -n 20": lambda: repo.git.log("--topo-order", "-n", "20", "--format=%H"),
+        "paths=[file7.txt]": lambda: get_commits_between(
+            repo, include_stats=False, paths=["file7.txt"]
+        ),
+    }
+    timings = {}
+    for name, query in queries.items():
+        start = time.perf_counter()
+        query()
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commits", type=int, default=100_000)
+    parser.add_argument("--repo", help="Existing repository (skips synthetic repo)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo_path = args.repo
+        if repo_path is None:
+            repo_path = os.path.join(tmpdir, "bench_repo")
+            create_synthetic_repo(repo_path, args.commits, files=500)
+
+        repo = get_repo(repo_path)
+        if commit_graph_status(repo)["commit_graph"]:
+            print("Repository already has a commit-graph; 'before' includes it")
+
+        before = run_queries(repo)
+        start = time.perf_counter()
+        status = write_commit_graph(repo)
+        print(f"commit-graph write: {time.perf_counter() - start:.2f}s ({status['commits']} commits)")
+        after = run_queries(repo)
+        repo.close()
+
+    for name in before:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:>26}: {before[name]:.3f}s -> {after[name]:.3f}s ({speedup:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
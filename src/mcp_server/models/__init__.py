@@ -1,5 +1,5 @@
 """Changelog models."""
 
-from .changelog import ChangelogCommit, ChangelogVersion
+from .changelog import ChangelogCommit, ChangelogVersion, DiffStats
 
-__all__ = ["ChangelogCommit", "ChangelogVersion"]
+__all__ = ["ChangelogCommit", "ChangelogVersion", "DiffStats"]
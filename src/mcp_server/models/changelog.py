@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List
 
 
 @dataclass
@@ -18,6 +18,14 @@ class ChangelogCommit:
     date: datetime
 
 
+@dataclass(frozen=True)
+class DiffStats:
+    """Net line changes between two trees."""
+    files_changed: int = 0
+    insertions: int = 0
+    deletions: int = 0
+
+
 @dataclass
 class ChangelogVersion:
     """Version entry in changelog."""
@@ -26,6 +34,9 @@ class ChangelogVersion:
     commits: List[ChangelogCommit] = field(default_factory=list)
     breaking_changes: List[ChangelogCommit] = field(default_factory=list)
     commits_by_type: Dict[str, List[ChangelogCommit]] = field(default_factory=dict)
+    stats: DiffStats | None = None  # Set when diff stats are requested
+    # Creates the lists of commits_by_type (spill.SpilledList under a memory budget)
+    new_list: Callable[[], Any] = field(default=list, repr=False, compare=False)
     
     def add_commit(self, commit: ChangelogCommit) -> None:
         """Add commit to version."""
@@ -35,5 +46,5 @@ class ChangelogVersion:
             self.breaking_changes.append(commit)
         
         if commit.type not in self.commits_by_type:
-            self.commits_by_type[commit.type] = []
+            self.commits_by_type[commit.type] = self.new_list()
         self.commits_by_type[commit.type].append(commit)
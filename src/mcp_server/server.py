@@ -1,96 +1,511 @@
 """Git Changelog MCP Server implementation."""
 
-from fastmcp import FastMCP
+import asyncio
+import functools
+import inspect
+import io
+import os
+
+import anyio
+from fastmcp import Context, FastMCP
 from starlette.responses import JSONResponse
 
 mcp = FastMCP("Git Changelog")
 
 
+class _ClientNotifier:
+    """Forward progress and partial output from a tool thread to the MCP client."""
+
+    def __init__(self, ctx: Context | None):
+        self.ctx = ctx
+
+    def progress(self, progress: float, total: float | None = None, message: str | None = None) -> None:
+        """Send a progress notification."""
+        self._call(self.ctx.report_progress if self.ctx else None, progress, total, message)
+
+    def partial(self, text: str) -> None:
+        """Send a chunk of rendered output as a log notification."""
+        self._call(self.ctx.log if self.ctx else None, text, "info", "changelog.partial")
+
+    def _call(self, fn, *args) -> None:
+        if fn is None:
+            return
+        try:
+            # Sync tools run in a worker thread; hop back to the event loop
+            anyio.from_thread.run(fn, *args)
+        except RuntimeError:
+            # Not called from an event loop worker thread (direct call)
+            pass
+
+
+def _client_cancelled() -> bool:
+    """Check from a tool thread whether the client cancelled the request."""
+    try:
+        anyio.from_thread.check_cancelled()
+    except RuntimeError:
+        # Not called from an event loop worker thread (direct call)
+        return False
+    except asyncio.CancelledError:
+        return True
+    return False
+
+
+def _cancellable(error_result=lambda message: message):
+    """
+    Run a tool with a deadline and a cancellation token.
+    
+    The tool's timeout parameter (default: TOOL_TIMEOUT environment
+    variable) sets the deadline. When it passes, or the client cancels
+    the request, running git processes are killed and the tool returns
+    an error message; with return_partial=True the output that was
+    ready is appended (see services.cancellation).
+    
+    Args:
+        error_result: Builds the tool result from an error message
+    """
+    def decorate(tool):
+        signature = inspect.signature(tool)
+        
+        @functools.wraps(tool)
+        def wrapper(*args, **kwargs):
+            from mcp_server.services.cancellation import (
+                CancelToken,
+                OperationCancelled,
+                cancel_scope,
+                default_timeout,
+            )
+            
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            timeout = arguments.arguments.get("timeout")
+            try:
+                if timeout is None:
+                    timeout = default_timeout()
+                elif timeout <= 0:
+                    raise ValueError(f"timeout must be positive, got {timeout}")
+            except ValueError as e:
+                return error_result(f"Error: {str(e)}")
+            
+            with cancel_scope(CancelToken(timeout, poll=_client_cancelled)):
+                try:
+                    return tool(*args, **kwargs)
+                except OperationCancelled as e:
+                    message = f"Error: {str(e)}"
+                    if e.partial and arguments.arguments.get("return_partial"):
+                        message += f". Partial output:\n\n{e.partial}"
+                    return error_result(message)
+        
+        return wrapper
+    return decorate
+
+
 @mcp.custom_route("/health", methods=["GET"])
 def health_check(request):
     """Health check endpoint for monitoring and load balancers."""
     return JSONResponse({"status": "healthy", "service": "git-changelog-mcp"})
 
 
+@mcp.custom_route("/stats/cache", methods=["GET"])
+def cache_stats(request):
+    """Analysis cache counters (hits, misses, evictions, memory use)."""
+    from mcp_server.services.analysis_cache import get_analysis_cache
+
+    return JSONResponse(get_analysis_cache().stats())
+
+
+@mcp.custom_route("/stats/repos", methods=["GET"])
+def repo_pool_stats(request):
+    """Repository handle pool counters (idle, checked out, opened, reused, closed)."""
+    from mcp_server.services.repo_pool import get_repo_pool
+
+    return JSONResponse(get_repo_pool().stats())
+
+
+# output_format -> template file
+_TEMPLATE_MAP = {
+    "markdown": "changelog.md.j2",
+    "md": "changelog.md.j2",
+    "json": "changelog.json.j2",
+    "keepachangelog": "keepachangelog.md.j2",
+    "kal": "keepachangelog.md.j2",
+}
+
+
+def _parse_release_tags(spec: str | None):
+    """Parse the release_tags tool parameter (None: environment default)."""
+    from mcp_server.services.tag_filter import TagFilter
+    
+    return TagFilter.parse(spec) if spec is not None else None
+
+
+def _parse_memory_budget(spec: str | None) -> int | None:
+    """Parse the memory_budget tool parameter (None: environment default)."""
+    from mcp_server.services.spill import default_memory_budget, parse_size
+    
+    return parse_size(spec) if spec is not None else default_memory_budget()
+
 
 @mcp.tool()
+@_cancellable()
 def generate_changelog(
     repo_path: str,
     output_format: str = "markdown",
     from_version: str | None = None,
     include_unreleased: bool = True,
+    to_version: str | None = None,
+    output_path: str | None = None,
+    stream: bool = False,
+    dedupe_cherry_picks: bool = False,
+    first_parent: bool = False,
+    release_tags: str | None = None,
+    diff_stats: bool = False,
+    commit_types: list[str] | None = None,
+    authors: list[str] | None = None,
+    breaking_only: bool = False,
+    since: str | None = None,
+    until: str | None = None,
+    max_commits: int | None = None,
+    paths: list[str] | None = None,
+    memory_budget: str | None = None,
+    timeout: float | None = None,
+    return_partial: bool = False,
+    ctx: Context | None = None,
 ) -> str:
     """
     Generate changelog from git history.
     
+    Version bounds are compared by semver precedence (v1.10.0 > v1.9.0)
+    and translated into a git revision range, so only that slice of
+    history is walked. Commit filters (types, authors, breaking_only,
+    since/until) are passed to git log, which skips other commits
+    before they are parsed.
+    
+    With output_path or stream the changelog is generated release by
+    release (see services.pipeline), so memory does not grow with the
+    size of the history. A memory budget also selects this path, and
+    releases larger than the budget are sorted and grouped through
+    temporary files. Progress (commits walked, versions grouped,
+    bytes rendered) is reported to clients that send a progress token;
+    with stream, rendered output is also sent as 'changelog.partial'
+    log notifications as soon as each release is done.
+    
     Args:
-        repo_path: Path to the git repository
+        repo_path: Path to the git repository or registered repository name
         output_format: Output format (markdown, json, keepachangelog)
-        from_version: Start from specific version tag (optional)
+        from_version: Start from specific version, inclusive (optional)
         include_unreleased: Include unreleased changes (default: True)
+        to_version: End at specific version, inclusive (optional).
+                    Unreleased changes are never included when set.
+        output_path: Write the changelog to this file instead of
+                     returning it, relative to the server's
+                     CHANGELOG_OUTPUT_DIR (optional; disabled when
+                     that variable is unset)
+        stream: Send partial output while generating (default: False)
+        dedupe_cherry_picks: Show commits with identical patches
+                             (cherry-picks) once, in the oldest release
+                             (default: False)
+        first_parent: Walk only the mainline; every merged PR is one
+                      entry titled from the PR title or the merged
+                      branch (default: False)
+        release_tags: Tags that count as releases: comma-separated
+                      globs, '!glob' to exclude, 're:<regex>'
+                      (e.g. 'v*,!*-rc*'). Default: RELEASE_TAGS
+                      environment variable, or every tag
+        diff_stats: Add files changed/insertions/deletions per
+                    version, from one tag-to-tag diff each. Rendered
+                    by the json format only; the markdown formats
+                    ignore them (default: False). Not combined with
+                    paths or the commit filters below, since the diff
+                    covers every commit of the release.
+        commit_types: Only these types, e.g. ['feat', 'fix'] (optional)
+        authors: Only commits by these author names/emails (optional)
+        breaking_only: Only breaking changes (default: False)
+        since: Only commits after this date, e.g. '2024-01-01' or
+               '1 year ago' (optional)
+        until: Only commits before this date (optional)
+        max_commits: Keep only the newest N commits (optional)
+        paths: Only commits touching these files or directories,
+               e.g. ['packages/api'] (optional). Releases are still
+               bounded by the repository's tags. Not combined with
+               diff_stats.
+        memory_budget: Memory a release may use before it spills to
+                       disk, e.g. '256M'. Default:
+                       CHANGELOG_MEMORY_BUDGET environment variable,
+                       or no limit
+        timeout: Seconds before the call is abandoned and its git
+                 processes are killed. Default: TOOL_TIMEOUT
+                 environment variable, or no limit
+        return_partial: On timeout or cancellation, append the releases
+                        rendered so far (stream/memory_budget path)
+                        to the error message (default: False)
         
     Returns:
-        Formatted changelog string
+        Formatted changelog string, or a summary when output_path is set
     """
     from mcp_server.services.analyzer import analyze_repo
+    from mcp_server.services.commit_filter import CommitFilter
     from mcp_server.services.template_service import TemplateService
+    from mcp_server.services.versioning import select_version_range
     
     # Validate repo_path
     if not repo_path or not isinstance(repo_path, str):
         return "Error: Invalid repo_path"
-    
-    # Analyze repository
     try:
-        result = analyze_repo(repo_path)
-    except Exception as e:
+        tag_filter = _parse_release_tags(release_tags)
+        commit_filter = CommitFilter.build(
+            commit_types, authors, breaking_only, since, until, max_commits
+        )
+        budget = _parse_memory_budget(memory_budget)
+    except ValueError as e:
         return f"Error: {str(e)}"
+    if paths and diff_stats:
+        return "Error: diff_stats cannot be combined with paths"
+    if commit_filter.active and diff_stats:
+        return "Error: diff_stats cannot be combined with commit filters"
+    if output_path:
+        from mcp_server.services.pipeline import resolve_output_path
+        
+        try:
+            output_path = resolve_output_path(output_path)
+        except ValueError as e:
+            return f"Error: {str(e)}"
+    
+    # Select template
+    template_name = _TEMPLATE_MAP.get(output_format.lower(), "changelog.md.j2")
+    notifier = _ClientNotifier(ctx)
+    
+    # The pipeline groups releases like the in-memory path (see
+    # pipeline.iter_release_walks): a budget only changes where commits are held
+    if output_path or stream or budget is not None:
+        from mcp_server.services.cancellation import OperationCancelled
+        from mcp_server.services.pipeline import stream_changelog
+        
+        def on_progress(progress):
+            # One step per release plus a final one for rendering
+            notifier.progress(
+                progress.versions + progress.done,
+                progress.total_versions + 1,
+                progress.describe(),
+            )
+        
+        options = dict(
+            output_format=template_name,
+            from_version=from_version,
+            to_version=to_version,
+            include_unreleased=include_unreleased,
+            on_progress=on_progress,
+            on_partial=notifier.partial if stream else None,
+            dedupe=dedupe_cherry_picks,
+            first_parent=first_parent,
+            tag_filter=tag_filter,
+            diff_stats=diff_stats,
+            commit_filter=commit_filter,
+            memory_budget=budget,
+            paths=paths or (),
+        )
+        try:
+            if output_path:
+                with open(output_path, "w", encoding="utf-8") as f:
+                    written = stream_changelog(repo_path, f, **options)
+                return f"Changelog written to {output_path} ({written} characters)"
+            output = io.StringIO()
+            try:
+                stream_changelog(repo_path, output, **options)
+            except OperationCancelled as e:
+                # Releases rendered before the cancellation
+                e.partial = output.getvalue()
+                raise
+            return output.getvalue()
+        except Exception as e:
+            return f"Error: {str(e)}"
     
-    # Group commits by version
     ts = TemplateService()
-    versions = ts.group_commits_by_version(result['commits'], result['tags'])
+    fields = ts.required_fields(template_name)
+    
+    # Translate version bounds into a revision range
+    try:
+        tags = analyze_repo(repo_path, fields={"tags"}, tag_filter=tag_filter)["tags"]
+    except Exception as e:
+        return f"Error: {str(e)}"
+    from_ref, to_ref, tags = select_version_range(tags, from_version, to_version)
+    notifier.progress(1, 4, f"{len(tags)} tags read")
     
-    # Filter by from_version if specified
-    if from_version:
-        versions = [v for v in versions if v.version >= from_version]
+    if to_version and to_ref is None:
+        # No release at or below to_version
+        versions = []
+    else:
+        # Analyze only that slice of history (and only what the template renders)
+        try:
+            result = analyze_repo(
+                repo_path, from_ref=from_ref, to_ref=to_ref, fields=fields - {"tags"},
+                paths=paths or (), first_parent=first_parent, commit_filter=commit_filter,
+            )
+        except Exception as e:
+            return f"Error: {str(e)}"
+        
+        notifier.progress(2, 4, f"{len(result['commits'])} commits walked")
+        
+        patch_ids = None
+        if dedupe_cherry_picks:
+            from mcp_server.services.patch_ids import get_patch_ids
+            from mcp_server.services.repo_pool import pooled_repo
+            
+            try:
+                with pooled_repo(repo_path) as repo:
+                    patch_ids = get_patch_ids(repo, [c.hash for c in result['commits']])
+            except Exception as e:
+                return f"Error: {str(e)}"
+        
+        # Group commits by version
+        versions = ts.group_commits_by_version(
+            result['commits'], tags, result.get('graph'), patch_ids
+        )
+    notifier.progress(3, 4, f"{len(versions)} versions grouped")
     
     # Filter unreleased if not included
     if not include_unreleased:
         versions = [v for v in versions if v.version != "Unreleased"]
     
-    # Select template
-    template_map = {
-        "markdown": "changelog.md.j2",
-        "md": "changelog.md.j2",
-        "json": "changelog.json.j2",
-        "keepachangelog": "keepachangelog.md.j2",
-        "kal": "keepachangelog.md.j2",
-    }
-    template_name = template_map.get(output_format.lower(), "changelog.md.j2")
+    if diff_stats and versions:
+        from mcp_server.services.diff_stats import add_version_stats
+        from mcp_server.services.pipeline import iter_release_ranges
+        from mcp_server.services.repo_pool import pooled_repo
+        
+        ranges = {
+            name: rev_range
+            for name, _, rev_range in iter_release_ranges(tags, from_ref, True)
+        }
+        try:
+            with pooled_repo(repo_path) as repo:
+                add_version_stats(repo, versions, ranges)
+        except Exception as e:
+            return f"Error: {str(e)}"
     
     # Render changelog
     try:
-        return ts.render_changelog(versions, template_name)
+        rendered = ts.render_changelog(versions, template_name)
     except Exception as e:
         return f"Error rendering changelog: {str(e)}"
+    notifier.progress(4, 4, f"{len(rendered.encode('utf-8'))} bytes rendered")
+    return rendered
 
 
 @mcp.tool()
+@_cancellable(lambda message: {"error": message})
+def generate_branch_changelogs(
+    repo_path: str,
+    branches: list[str],
+    output_format: str = "markdown",
+    include_unreleased: bool = True,
+    release_tags: str | None = None,
+    timeout: float | None = None,
+) -> dict[str, str]:
+    """
+    Generate changelogs for several branches from one history walk.
+    
+    The union of the branches' histories is read once and every commit
+    is marked with the branches that contain it, so asking for
+    release/2.x, release/3.x and main costs about as much as the
+    largest branch alone.
+    
+    Args:
+        repo_path: Path to the git repository or registered repository name
+        branches: Branch names (e.g. ['main', 'release/2.x'])
+        output_format: Output format (markdown, json, keepachangelog)
+        include_unreleased: Include unreleased changes (default: True)
+        release_tags: Tags that count as releases (see generate_changelog)
+        timeout: Seconds before the call is abandoned (see generate_changelog)
+        
+    Returns:
+        Dict branch -> formatted changelog, or {'error': message}
+    """
+    from mcp_server.services.branches import iter_branch_versions
+    from mcp_server.services.repo_pool import pooled_repo
+    from mcp_server.services.template_service import TemplateService
+    
+    if not repo_path or not isinstance(repo_path, str):
+        return {"error": "Error: Invalid repo_path"}
+    if not branches:
+        return {"error": "Error: At least one branch is required"}
+    try:
+        tag_filter = _parse_release_tags(release_tags)
+    except ValueError as e:
+        return {"error": f"Error: {str(e)}"}
+    
+    template_name = _TEMPLATE_MAP.get(output_format.lower(), "changelog.md.j2")
+    ts = TemplateService()
+    try:
+        with pooled_repo(repo_path) as repo:
+            return {
+                branch: ts.render_changelog(versions, template_name)
+                for branch, versions in iter_branch_versions(
+                    repo, branches, include_unreleased, tag_filter
+                )
+            }
+    except Exception as e:
+        return {"error": f"Error: {str(e)}"}
+
+
+@mcp.tool()
+@_cancellable()
 def generate_release_notes(
     repo_path: str,
-    version: str,
+    version: str | None = None,
     style: str = "markdown",
     use_ai: bool = True,
     include_breaking_changes: bool = True,
+    from_ref: str | None = None,
+    to_ref: str | None = None,
+    first_parent: bool = False,
+    release_tags: str | None = None,
+    commit_types: list[str] | None = None,
+    authors: list[str] | None = None,
+    breaking_only: bool = False,
+    since: str | None = None,
+    until: str | None = None,
+    max_commits: int | None = None,
+    paths: list[str] | None = None,
+    timeout: float | None = None,
+    return_partial: bool = False,
 ) -> str:
     """
     Generate release notes for a specific version.
 
+    Only the history of that release is walked: the version tag
+    minus the older release tags (for 'Unreleased', HEAD minus every
+    release), so commits are grouped as in generate_changelog and a
+    fix shipped in a merged-back maintenance release is not repeated.
+
     Args:
-        repo_path: Path to the git repository
-        version: Version to generate notes for (e.g., 'v1.2.0')
+        repo_path: Path to the git repository or registered repository name
+        version: Version to generate notes for (e.g., 'v1.2.0' or 'Unreleased').
+                 Optional when to_ref is given (used as the title).
         style: Output style (markdown, brief, detailed)
         use_ai: Use AI generation (requires GITHUB_TOKEN)
         include_breaking_changes: Include breaking changes section
+        from_ref: Start of a custom range (exclusive), e.g. 'main'.
+                  With version alone, replaces the previous release
+                  tag as the start.
+        to_ref: End of a custom range, e.g. 'feature/login'.
+                'main..feature' covers the branch since its merge-base.
+        first_parent: Walk only the mainline; every merged PR is one
+                      entry (default: False)
+        release_tags: Tags that count as releases (see generate_changelog);
+                      the previous release is looked up among them
+        commit_types: Only these types, e.g. ['feat', 'fix'] (optional)
+        authors: Only commits by these author names/emails (optional)
+        breaking_only: Only breaking changes (default: False)
+        since: Only commits after this date, e.g. '2024-01-01' or
+               '1 year ago' (optional)
+        until: Only commits before this date (optional)
+        max_commits: Keep only the newest N commits (optional)
+        paths: Only commits touching these files or directories
+               (optional)
+        timeout: Seconds before the call is abandoned, including the
+                 request to the AI provider (see generate_changelog)
+        return_partial: If the AI request is cut off, append the
+                        template-based notes to the error message
+                        (default: False)
 
     Returns:
         Formatted release notes string
@@ -99,9 +514,15 @@ def generate_release_notes(
         AI generation requires GITHUB_TOKEN environment variable.
         Falls back to template-based generation if AI unavailable.
     """
-    from mcp_server.services.analyzer import analyze_repo
+    from mcp_server.services.analyzer import analyze_repo, find_previous_tag, resolve_commits
+    from mcp_server.services.commit_filter import CommitFilter
+    from mcp_server.services.diff_stats import get_diff_stats
+    from mcp_server.services.pipeline import get_release_commits
+    from mcp_server.services.repo_pool import pooled_repo
+    from mcp_server.services.versioning import order_tags
     from mcp_server.services.template_service import TemplateService
     from mcp_server.services.ai import get_ai_client, AIGenerationError, ReleaseNotesStyle
+    from mcp_server.services.cancellation import OperationCancelled
     import logging
 
     logger = logging.getLogger(__name__)
@@ -109,29 +530,86 @@ def generate_release_notes(
     # Validate inputs
     if not repo_path or not isinstance(repo_path, str):
         return "Error: Invalid repo_path"
-    if not version:
+    if not version and not to_ref:
         return "Error: Version is required"
+    if not version:
+        version = to_ref
+    try:
+        tag_filter = _parse_release_tags(release_tags)
+        commit_filter = CommitFilter.build(
+            commit_types, authors, breaking_only, since, until, max_commits
+        )
+    except ValueError as e:
+        return f"Error: {str(e)}"
+
+    # Client refs reach git only as the SHAs they resolve to
+    client_refs = [ref for ref in (from_ref, to_ref) if ref is not None]
+    if client_refs:
+        try:
+            with pooled_repo(repo_path) as repo:
+                shas = iter(resolve_commits(repo, client_refs))
+        except Exception as e:
+            return f"Error analyzing repo: {str(e)}"
+        from_ref = next(shas) if from_ref is not None else None
+        to_ref = next(shas) if to_ref is not None else None
+
+    ts = TemplateService()
+    fields = ts.required_fields("release_notes.md.j2") - {"tags"}
+    version_date = None
+
+    # Resolve the release range from tags
+    walk_tags = None
+    if to_ref is None:
+        try:
+            tags = analyze_repo(repo_path, fields={"tags"}, tag_filter=tag_filter)["tags"]
+        except Exception as e:
+            return f"Error analyzing repo: {str(e)}"
+
+        if version == "Unreleased":
+            to_ref = "HEAD"
+        else:
+            tag = next((t for t in tags if t["name"] == version), None)
+            if tag is None:
+                available = [t["name"] for t in tags] + ["Unreleased"]
+                return f"Error: Version '{version}' not found. Available: {available}"
+            to_ref = version
+            version_date = tag["date"].strftime('%Y-%m-%d')
+        if from_ref is None:
+            # Commits are grouped like generate_changelog; the diff
+            # stats still run from the previous release tag
+            walk_tags = tags
+            if version == "Unreleased":
+                from_ref = order_tags(tags)[-1]["name"] if tags else None
+            else:
+                previous = find_previous_tag(tags, version)
+                from_ref = previous["name"] if previous else None
 
-    # Analyze repository
+    # Walk only this release's history (headers only)
     try:
-        result = analyze_repo(repo_path)
+        if walk_tags is not None:
+            with pooled_repo(repo_path) as repo:
+                commits = get_release_commits(
+                    repo, walk_tags, version, first_parent, commit_filter, paths or (),
+                )
+        else:
+            commits = analyze_repo(
+                repo_path, from_ref=from_ref, to_ref=to_ref, fields=fields,
+                paths=paths or (), first_parent=first_parent, commit_filter=commit_filter,
+            )['commits']
     except Exception as e:
         return f"Error analyzing repo: {str(e)}"
 
-    # Get commits for this version
-    ts = TemplateService()
-    versions = ts.group_commits_by_version(result['commits'], result['tags'])
-    
-    # Find specific version
-    target_version = None
-    for v in versions:
-        if v.version == version:
-            target_version = v
-            break
-    
-    if not target_version:
-        available = [v.version for v in versions]
-        return f"Error: Version '{version}' not found. Available: {available}"
+    target_version = ts.create_version(commits, version, version_date)
+
+    # Net line changes of the release: one diff instead of per-commit
+    # stats. They cover the whole release, so not with commit filters
+    # or paths.
+    if not commit_filter.active and not paths:
+        try:
+            with pooled_repo(repo_path) as repo:
+                target_version.stats = get_diff_stats(repo, from_ref, to_ref)
+        except Exception as e:
+            return f"Error analyzing repo: {str(e)}"
 
     # Convert to dict format for AI
     commits_data = []
@@ -159,6 +637,10 @@ def generate_release_notes(
                 style=style_enum,
                 language="ru"
             )
+        except OperationCancelled as e:
+            # The template notes need no more git work
+            e.partial = ts.render_changelog([target_version], "release_notes.md.j2")
+            raise
         except AIGenerationError as e:
             logger.info(f"AI not available ({e}), falling back to templates")
         except Exception as e:
@@ -172,8 +654,106 @@ def generate_release_notes(
         return f"Error generating release notes: {str(e)}"
 
 
+@mcp.tool()
+def optimize_repository(
+    repo_path: str,
+    changed_paths: bool = True,
+    multi_pack_index: bool = True,
+) -> str:
+    """
+    Write or refresh commit-graph and multi-pack-index data.
+    
+    The commit-graph (generation numbers, optional changed-path Bloom
+    filters) speeds up every history walk the other tools run:
+    reachability checks, version ranges and path-limited queries.
+    Run it again after large fetches to cover new commits.
+    
+    Args:
+        repo_path: Path to the git repository or registered repository name
+        changed_paths: Compute changed-path Bloom filters (default: True)
+        multi_pack_index: Also write a multi-pack-index (default: True)
+    
+    Returns:
+        Summary of the repository state before and after
+    """
+    from mcp_server.services.analyzer import InvalidRepoError
+    from mcp_server.services.maintenance import commit_graph_status, write_commit_graph
+    from mcp_server.services.repo_pool import pooled_repo
+    
+    if not repo_path or not isinstance(repo_path, str):
+        return "Error: Invalid repo_path"
+    
+    try:
+        with pooled_repo(repo_path) as repo:
+            before = commit_graph_status(repo)
+            after = write_commit_graph(repo, changed_paths, multi_pack_index)
+    except InvalidRepoError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        return f"Error writing commit-graph: {str(e)}"
+    
+    def describe(status: dict) -> str:
+        if not status["commit_graph"]:
+            graph = "no commit-graph"
+        else:
+            graph = (
+                f"commit-graph with {status['commits']} commits "
+                f"in {status['layers']} layer(s), "
+                f"Bloom filters: {'yes' if status['bloom_filters'] else 'no'}"
+            )
+        midx = "yes" if status["multi_pack_index"] else "no"
+        return f"{graph}; multi-pack-index: {midx}"
+    
+    return f"Before: {describe(before)}\nAfter: {describe(after)}"
+
+
+@mcp.tool()
+def list_repositories() -> list[dict]:
+    """
+    List repositories registered on the server.
+    
+    Registered names can be passed as repo_path to every other tool;
+    they resolve to bare mirrors kept warm by the server.
+    
+    Returns:
+        List of {name, mirror, upstream, refreshed, error}
+    """
+    from mcp_server.services.registry import get_registry
+    
+    return get_registry().describe()
+
+
+@mcp.tool()
+def refresh_repositories(names: list[str] | None = None) -> dict[str, str]:
+    """
+    Fetch new commits and tags into registered mirrors.
+    
+    Each mirror is updated incrementally from its upstream with
+    ``git fetch --prune``; only new objects are transferred.
+    
+    Args:
+        names: Repository names (default: all registered)
+    
+    Returns:
+        Dict name -> status ('up to date', 'N refs updated' or 'Error: ...')
+    """
+    from mcp_server.services.registry import get_registry
+    
+    return get_registry().refresh_all(names)
+
+
 def main() -> None:
     """Run the MCP server with Streamable HTTP transport."""
+    from mcp_server.services.registry import REFRESH_INTERVAL_ENV, get_registry
+    
+    # Refresh and pre-open registered mirrors before taking requests
+    registry = get_registry()
+    registry.refresh_all()
+    registry.warm()
+    interval = float(os.getenv(REFRESH_INTERVAL_ENV, "0"))
+    if interval > 0:
+        registry.start_refresher(interval)
+    
     mcp.run(
         transport="streamable-http",
         host="0.0.0.0",
@@ -3,6 +3,7 @@
 import os
 from typing import List
 
+from ..cancellation import current_token
 from .base import AIClient, AIGenerationError, ReleaseNotesStyle
 
 
@@ -58,11 +59,25 @@ class GitHubClient(AIClient):
         style: ReleaseNotesStyle = ReleaseNotesStyle.MARKDOWN,
         language: str = "ru"
     ) -> str:
-        """Generate release notes using GitHub Models."""
-        prompt = self._build_prompt(commits, version, style, language)
+        """
+        Generate release notes using GitHub Models.
 
-        try:
-            response = self.client.chat.completions.create(
+        Within a tool call the request is bounded by the call's deadline
+        and abandoned as soon as the call is cancelled (see cancellation).
+
+        Raises:
+            AIGenerationError: If the API request fails
+            OperationCancelled: If the tool call is cancelled or times out
+        """
+        prompt = self._build_prompt(commits, version, style, language)
+        token = current_token()
+        options = {}
+        if token is not None and token.deadline is not None:
+            # Omitted otherwise: an explicit None disables the client's timeout
+            options["timeout"] = token.remaining()
+
+        def request():
+            return self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": self._get_system_prompt()},
@@ -70,9 +85,16 @@ class GitHubClient(AIClient):
                 ],
                 temperature=0.7,
                 max_tokens=2000,
+                **options,
             )
+
+        try:
+            response = token.call(request) if token is not None else request()
             return response.choices[0].message.content or ""
         except Exception as e:
+            if token is not None:
+                # The HTTP timeout fired at the deadline
+                token.check()
             raise AIGenerationError(f"GitHub Models API error: {e}") from e
 
     def _build_prompt(
@@ -0,0 +1,229 @@
+"""In-process cache of analyze_repo results.
+
+Results are keyed by a cheap repository fingerprint (resolved HEAD and
+the state of packed/loose refs) plus request parameters, and evicted in
+LRU order to stay within a memory budget.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from git import Repo
+
+
+CACHE_MAX_BYTES_ENV = "ANALYSIS_CACHE_MAX_BYTES"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class AnalysisCache:
+    """Thread-safe LRU cache bounded by estimated memory size."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize cache.
+
+        Args:
+            max_bytes: Memory budget in bytes (0 disables caching)
+        """
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Get cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int | None = None) -> bool:
+        """
+        Store value, evicting least recently used entries over budget.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            size: Size in bytes. Default: estimated with estimate_size()
+
+        Returns:
+            True if stored, False if the value alone exceeds the budget
+        """
+        if size is None:
+            size = estimate_size(value)
+        with self._lock:
+            if size > self.max_bytes:
+                return False
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+            return True
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with hits, misses, evictions, entries, bytes, max_bytes
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def estimate_size(obj: Any) -> int:
+    """
+    Estimate memory used by an object graph.
+
+    Follows containers, dataclasses, plain and __slots__ objects;
+    shared objects are counted once.
+
+    Args:
+        obj: Object to measure
+
+    Returns:
+        Approximate size in bytes
+    """
+    seen: set[int] = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, type):
+            continue
+        else:
+            if hasattr(item, "__dict__"):
+                stack.append(item.__dict__)
+            # __slots__ objects (e.g. ParsedCommit, which references
+            # the raw message)
+            slots = getattr(type(item), "__slots__", ())
+            for slot in (slots,) if isinstance(slots, str) else slots:
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+    return total
+
+
+def repo_fingerprint(repo: Repo) -> str:
+    """
+    Cheap fingerprint of repository state.
+
+    Combines the resolved HEAD with stat() data of packed-refs and all
+    loose refs, so any commit, tag or branch update changes it.
+
+    Args:
+        repo: git.Repo instance
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha1()
+    try:
+        digest.update(repo.head.commit.hexsha.encode("ascii"))
+    except ValueError:
+        # Unborn HEAD (no commits yet)
+        digest.update(b"unborn")
+
+    digest.update(_stat_key(os.path.join(repo.common_dir, "HEAD")))
+    digest.update(refs_fingerprint(repo).encode("ascii"))
+    return digest.hexdigest()
+
+
+def refs_fingerprint(repo: Repo, namespace: str = "refs") -> str:
+    """
+    Fingerprint of the refs under a namespace.
+
+    Uses stat() data of packed-refs and of every loose ref file below
+    the namespace, so creating, moving or deleting a ref changes it.
+
+    Args:
+        repo: git.Repo instance
+        namespace: Ref directory, e.g. 'refs/tags'. Default: all refs
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha1()
+    common_dir = repo.common_dir
+    digest.update(_stat_key(os.path.join(common_dir, "packed-refs")))
+    for root, _, files in os.walk(os.path.join(common_dir, namespace)):
+        for name in files:
+            path = os.path.join(root, name)
+            digest.update(path.encode("utf-8", errors="replace"))
+            digest.update(_stat_key(path))
+    return digest.hexdigest()
+
+
+def _stat_key(path: str) -> bytes:
+    """mtime/size of a file, or a marker if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return b"-"
+    return f"{st.st_mtime_ns}:{st.st_size}".encode("ascii")
+
+
+_cache: AnalysisCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """
+    Get the process-wide analysis cache.
+
+    Budget is read from ANALYSIS_CACHE_MAX_BYTES on first use.
+
+    Returns:
+        Shared AnalysisCache instance
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            max_bytes = int(os.getenv(CACHE_MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+            _cache = AnalysisCache(max_bytes)
+        return _cache
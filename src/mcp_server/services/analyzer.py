@@ -6,10 +6,51 @@ Analyzes git repository commits with metadata enrichment.
 import os
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Iterable, Iterator, Sequence
 
 from git import GitCommandError, Repo
 
-from .parser_service import ParsedCommit, parse_commit
+from .analysis_cache import get_analysis_cache, refs_fingerprint, repo_fingerprint
+from .cancellation import check_cancelled
+from .cat_file import get_cat_file
+from .commit_filter import CommitFilter
+from .git_log import LogRecord, iter_log_records
+from .parser_service import (
+    NON_CONVENTIONAL_TYPE,
+    ParsedCommit,
+    is_merge_subject,
+    parse_commit,
+    parse_merge_unit,
+)
+from .repo_pool import pooled_repo
+from .tag_filter import TagFilter, default_tag_filter
+from .versioning import order_tags
+
+
+# Commit ingestion backends for get_commits_between
+BACKEND_LOG = "log"              # One streaming `git log --numstat` process
+BACKEND_GITPYTHON = "gitpython"  # iter_commits + commit.stats per commit
+BACKEND_INDEX = "index"          # Persistent SQLite index (see commit_index)
+BACKEND_OBJECTS = "objects"      # In-process pack/loose reader (see object_store)
+BACKENDS = {BACKEND_LOG, BACKEND_GITPYTHON, BACKEND_INDEX, BACKEND_OBJECTS}
+
+# Sections of the analyze_repo result that can be requested via `fields`
+FIELD_COMMITS = "commits"  # EnrichedCommit list
+FIELD_SUMMARY = "summary"  # Counts by type/author
+FIELD_STATS = "stats"      # files_changed/insertions/deletions (needs numstat)
+FIELD_TAGS = "tags"        # Tag list from get_tags
+FIELD_GRAPH = "graph"      # sha -> parent shas of every walked commit (incl. WIP)
+ANALYSIS_FIELDS = frozenset({
+    FIELD_COMMITS, FIELD_SUMMARY, FIELD_STATS, FIELD_TAGS, FIELD_GRAPH,
+})
+
+# get_tags fields: name, object type/SHA, peeled type/SHA, tagger (or
+# committer) date and the peeled commit's date for tags without tagger
+TAG_REF_FORMAT = (
+    "%(refname:strip=2)%00%(objecttype)%00%(objectname)%00"
+    "%(*objecttype)%00%(*objectname)%00%(creatordate:unix)%00"
+    "%(*committerdate:unix)"
+)
 
 
 @dataclass
@@ -24,6 +65,7 @@ class EnrichedCommit:
     files_changed: int
     insertions: int
     deletions: int
+    parents: tuple[str, ...] = ()
 
 
 class InvalidRepoError(Exception):
@@ -35,8 +77,10 @@ def get_repo(repo_path: str) -> Repo:
     """
     Open git repository with path validation.
     
+    Both working trees and bare repositories (mirrors) are accepted.
+    
     Args:
-        repo_path: Path to git repository
+        repo_path: Path to git repository (working tree or bare)
         
     Returns:
         git.Repo instance
@@ -52,7 +96,7 @@ def get_repo(repo_path: str) -> Repo:
         raise InvalidRepoError(f"Path does not exist: {repo_path}")
     
     # Check if it's a git repository
-    if not os.path.exists(os.path.join(repo_path, '.git')):
+    if not os.path.exists(os.path.join(repo_path, '.git')) and not is_bare_repo(repo_path):
         raise InvalidRepoError(f"Not a git repository: {repo_path}")
     
     # Try to open
@@ -62,10 +106,77 @@ def get_repo(repo_path: str) -> Repo:
         raise InvalidRepoError(f"Cannot open repository: {repo_path}") from e
 
 
+def is_bare_repo(path: str) -> bool:
+    """
+    Check whether a directory is a bare repository.
+    
+    Uses the layout git itself checks for: HEAD, objects/ and refs/.
+    
+    Args:
+        path: Directory path
+        
+    Returns:
+        True if path is a git directory
+    """
+    return (
+        os.path.isfile(os.path.join(path, 'HEAD'))
+        and os.path.isdir(os.path.join(path, 'objects'))
+        and os.path.isdir(os.path.join(path, 'refs'))
+    )
+
+
+def default_backend() -> str:
+    """
+    Get default ingestion backend.
+    
+    Returns:
+        'index' if CHANGELOG_INDEX_DIR is set, otherwise 'log'
+    """
+    from .commit_index import get_index_dir
+    
+    return BACKEND_INDEX if get_index_dir() else BACKEND_LOG
+
+
+def resolve_commits(repo: Repo, refs: Sequence[str]) -> list[str]:
+    """
+    Resolve refs to commit SHAs.
+    
+    Refs are looked up by the pooled ``git cat-file`` over stdin, so a
+    ref from a client never reaches a git command line, where one
+    starting with '-' would be parsed as an option.
+    
+    Args:
+        repo: git.Repo instance
+        refs: Refs (tag, branch, SHA, 'v1.0.0~1')
+        
+    Returns:
+        Commit SHA of every ref, in order
+        
+    Raises:
+        InvalidRepoError: If a ref does not name a commit
+    """
+    revs = [f"{ref}^{{commit}}" for ref in refs]
+    try:
+        resolved = get_cat_file(repo).resolve(revs)
+    except ValueError:
+        # Empty or multi-line name
+        resolved = {}
+    missing = [ref for ref, rev in zip(refs, revs) if rev not in resolved]
+    if missing:
+        raise InvalidRepoError(f"Invalid ref: {', '.join(missing)}")
+    return [resolved[rev] for rev in revs]
+
+
 def get_commits_between(
     repo: Repo,
     from_ref: str | None = None,
     to_ref: str | None = None,
+    backend: str = BACKEND_LOG,
+    include_stats: bool = True,
+    graph: dict[str, tuple[str, ...]] | None = None,
+    paths: Sequence[str] = (),
+    first_parent: bool = False,
+    commit_filter: CommitFilter | None = None,
 ) -> list[EnrichedCommit]:
     """
     Extract commits between refs.
@@ -74,13 +185,37 @@ def get_commits_between(
         repo: git.Repo instance
         from_ref: Start ref (tag, branch, commit). Default: None (all commits)
         to_ref: End ref. Default: None (HEAD)
+        backend: Ingestion backend ('log', 'gitpython', 'index' or
+                 'objects'). Default: 'log'. The index serves full
+                 histories only; ranges with from_ref are read with
+                 'log'. 'objects' reads headers without spawning git;
+                 stats and paths are read with 'log'.
+        include_stats: Compute files_changed/insertions/deletions.
+                       When False, only headers are read and stats are 0.
+        graph: Optional dict filled with sha -> parent shas for every
+               walked commit, including skipped WIP commits
+        paths: Only commits touching these paths. git answers these
+               from commit-graph Bloom filters when they exist (see
+               maintenance.write_commit_graph). Not served by the
+               index; graph still covers the whole range.
+        first_parent: Walk only the mainline; each merge commit is one
+                      unit titled from its PR title or merged branch
+                      (see parser_service.parse_merge_unit). Always
+                      read with 'log'.
+        commit_filter: Only matching commits, selected by git log
+                       options (see commit_filter). Always read with
+                       'log'; graph still covers the whole range.
         
     Returns:
         List of EnrichedCommit
         
     Raises:
         InvalidRepoError: If refs are invalid
+        ValueError: If backend is unknown
     """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}. Supported: {sorted(BACKENDS)}")
+
     # Resolve refs
     if to_ref is None:
         to_ref = "HEAD"
@@ -91,15 +226,243 @@ def get_commits_between(
     else:
         rev_range = f"{from_ref}..{to_ref}"
     
+    paths = tuple(paths)
+    
+    if (commit_filter is not None and commit_filter.active) or (paths and graph is not None):
+        enriched = list(iter_enriched_commits(
+            repo, rev_range, include_stats, None, paths, first_parent, commit_filter
+        ))
+        if graph is not None:
+            # Release grouping follows ancestry through the commits the
+            # filters leave out, so the graph covers the whole range
+            _fill_graph(repo, rev_range, graph, first_parent)
+        enriched.sort(key=lambda c: c.date, reverse=True)
+        return enriched
+    
+    if first_parent:
+        backend = BACKEND_LOG
+    
+    if backend == BACKEND_INDEX and from_ref is None and not paths:
+        # Already ordered newest first
+        return _get_commits_index(repo, to_ref, include_stats, graph)
+    
+    enriched = None
+    if backend == BACKEND_OBJECTS and not include_stats and not paths:
+        enriched = _get_commits_objects(repo, rev_range, graph)
+    
+    if enriched is None:
+        if backend == BACKEND_GITPYTHON:
+            enriched = _get_commits_gitpython(repo, rev_range, include_stats, graph, paths)
+        else:
+            enriched = _get_commits_log(
+                repo, rev_range, include_stats, graph, paths, first_parent
+            )
+
+    # Sort commits by date (newest first) for consistent ordering
+    enriched.sort(key=lambda c: c.date, reverse=True)
+
+    return enriched
+
+
+def _get_commits_index(
+    repo: Repo,
+    to_ref: str,
+    include_stats: bool = True,
+    graph: dict[str, tuple[str, ...]] | None = None,
+) -> list[EnrichedCommit]:
+    """Read commits from the persistent index, walking only new history."""
+    from .commit_index import CommitIndex
+    
+    with CommitIndex(repo) as index:
+        return index.get_commits(to_ref, include_stats, graph)
+
+
+def _get_commits_log(
+    repo: Repo,
+    rev_range: str,
+    include_stats: bool = True,
+    graph: dict[str, tuple[str, ...]] | None = None,
+    paths: Sequence[str] = (),
+    first_parent: bool = False,
+) -> list[EnrichedCommit]:
+    """Read commits from a single streaming git log process."""
+    return list(iter_enriched_commits(
+        repo, rev_range, include_stats, graph, paths, first_parent
+    ))
+
+
+def _fill_graph(
+    repo: Repo,
+    rev_range: str,
+    graph: dict[str, tuple[str, ...]],
+    first_parent: bool = False,
+) -> None:
+    """Record parents of every commit in the range (no messages read)."""
+    args = ["--format=%H %P"]
+    if first_parent:
+        args.append("--first-parent")
+    try:
+        output = repo.git.log(*args, "--end-of-options", rev_range, "--")
+    except GitCommandError as e:
+        raise InvalidRepoError(f"Invalid ref: {rev_range}") from e
+    for line in output.splitlines():
+        sha, *parents = line.split()
+        graph[sha] = tuple(parents)
+
+
+def _get_commits_objects(
+    repo: Repo,
+    rev_range: str,
+    graph: dict[str, tuple[str, ...]] | None = None,
+) -> list[EnrichedCommit] | None:
+    """
+    Read commit headers in-process from packs and loose objects.
+    
+    Returns None when the object store cannot serve the request
+    (unsupported revision syntax or object format); the caller then
+    falls back to git log.
+    """
+    from .object_store import ObjectStoreError, iter_object_records
+    
+    try:
+        return list(enrich_records(iter_object_records(repo, rev_range), graph))
+    except ObjectStoreError:
+        return None
+    except ValueError as e:
+        raise InvalidRepoError(f"Invalid ref: {rev_range}") from e
+
+
+def iter_enriched_commits(
+    repo: Repo,
+    rev_range: str | Sequence[str],
+    include_stats: bool = True,
+    graph: dict[str, tuple[str, ...]] | None = None,
+    paths: Sequence[str] = (),
+    first_parent: bool = False,
+    commit_filter: CommitFilter | None = None,
+) -> Iterator[EnrichedCommit]:
+    """
+    Stream non-WIP commits of a revision range in git log order.
+    
+    Commits are parsed as git produces them; nothing is buffered.
+    
+    Args:
+        repo: git.Repo instance
+        rev_range: Revision range (e.g. 'HEAD', 'v1.0.0..v1.1.0') or
+                   revision arguments (e.g. ['v1.1.0', '^v1.0.0'])
+        include_stats: Compute files_changed/insertions/deletions
+        graph: Optional dict filled with sha -> parent shas
+        paths: Only commits touching these paths
+        first_parent: Walk only the mainline, merges as units
+        commit_filter: Only matching commits; git applies what it can
+                       and stops after max_commits
+        
+    Yields:
+        EnrichedCommit
+        
+    Raises:
+        InvalidRepoError: If the range is invalid
+    """
+    extra_args = ["--first-parent"] if first_parent else []
+    if commit_filter is not None:
+        extra_args += commit_filter.log_args(first_parent)
+    try:
+        records = iter_log_records(
+            repo, rev_range, numstat=include_stats, paths=paths, extra_args=extra_args,
+        )
+        commits = enrich_records(records, graph, repo if first_parent else None)
+        if commit_filter is not None:
+            commits = commit_filter.apply(commits)
+        yield from commits
+    except GitCommandError as e:
+        if not isinstance(rev_range, str):
+            rev_range = " ".join(rev_range)
+        raise InvalidRepoError(f"Invalid ref: {rev_range}") from e
+
+
+def enrich_records(
+    records: Iterable[LogRecord],
+    graph: dict[str, tuple[str, ...]] | None = None,
+    merge_units: Repo | None = None,
+) -> Iterator[EnrichedCommit]:
+    """
+    Parse log records into EnrichedCommit, skipping WIP commits.
+    
+    With merge_units (the repository), merge commits are parsed as
+    changelog units; the merged branch tip is read only when the merge
+    message itself carries no conventional title.
+    """
+    for record in records:
+        # git-backed records check in iter_log_records; this also covers
+        # the in-process object walk
+        check_cancelled()
+        if graph is not None:
+            graph[record.hash] = record.parents
+        if merge_units is not None and len(record.parents) > 1:
+            parsed = _parse_merge_record(merge_units, record)
+        else:
+            parsed = parse_commit(record.message, record.trailers)
+        
+        # Skip WIP commits
+        if parsed is None:
+            continue
+        
+        yield EnrichedCommit(
+            parsed=parsed,
+            hash=record.hash,
+            short_hash=record.hash[:7],
+            author=record.author,
+            email=record.email,
+            date=datetime.fromtimestamp(record.timestamp),
+            files_changed=record.files_changed,
+            insertions=record.insertions,
+            deletions=record.deletions,
+            parents=record.parents,
+        )
+
+
+def _parse_merge_record(repo: Repo, record: LogRecord) -> ParsedCommit | None:
+    """Parse a merge commit as one unit, falling back to the side branch tip."""
+    parsed = parse_merge_unit(record.message)
+    if parsed is not None and parsed.type != NON_CONVENTIONAL_TYPE:
+        return parsed
+    if not is_merge_subject(record.message):
+        return parsed
+    
+    from .object_store import parse_commit_object
+    
+    side = record.parents[1]
+    [entry] = get_cat_file(repo).read([side])
+    if entry is None:
+        return parsed
+    side_message = parse_commit_object(side, entry[1]).message
+    return parse_merge_unit(record.message, side_message)
+
+
+def _get_commits_gitpython(
+    repo: Repo,
+    rev_range: str,
+    include_stats: bool = True,
+    graph: dict[str, tuple[str, ...]] | None = None,
+    paths: Sequence[str] = (),
+) -> list[EnrichedCommit]:
+    """Read commits via GitPython (one `git diff` per commit for stats)."""
     # Get commits from git with error handling
     try:
-        git_commits = list(repo.iter_commits(rev_range))
+        git_commits = list(repo.iter_commits(
+            rev_range, paths=list(paths), full_history=bool(paths)
+        ))
     except GitCommandError as e:
         raise InvalidRepoError(f"Invalid ref: {rev_range}") from e
     
     # Enrich each commit
     enriched = []
     for commit in git_commits:
+        check_cancelled()
+        parents = tuple(p.hexsha for p in commit.parents)
+        if graph is not None:
+            graph[commit.hexsha] = parents
+        
         # Parse commit message
         parsed = parse_commit(commit.message)
         
@@ -108,12 +471,14 @@ def get_commits_between(
             continue
         
         # Get commit stats
+        files_changed = insertions = deletions = 0
         try:
-            stats = commit.stats
-            # GitPython uses stats.total dict, not direct attributes
-            files_changed = stats.total.get('files', 0)
-            insertions = stats.total.get('insertions', 0)
-            deletions = stats.total.get('deletions', 0)
+            if include_stats:
+                stats = commit.stats
+                # GitPython uses stats.total dict, not direct attributes
+                files_changed = stats.total.get('files', 0)
+                insertions = stats.total.get('insertions', 0)
+                deletions = stats.total.get('deletions', 0)
         except Exception:
             files_changed = 0
             insertions = 0
@@ -130,45 +495,120 @@ def get_commits_between(
             files_changed=files_changed,
             insertions=insertions,
             deletions=deletions,
+            parents=parents,
         ))
 
-    # Sort commits by date (newest first) for consistent ordering
-    enriched.sort(key=lambda c: c.date, reverse=True)
-
     return enriched
 
 
-def get_tags(repo: Repo) -> list[dict]:
+def get_tags(
+    repo: Repo,
+    use_cache: bool = True,
+    tag_filter: TagFilter | None = None,
+) -> list[dict]:
     """
     Get list of annotated tags.
     
+    Tags are listed, peeled and sorted by date in one
+    ``git for-each-ref`` call. The result is cached until packed-refs
+    or a loose tag ref changes. Tags that do not point to a commit are
+    skipped.
+    
+    Only release tags selected by tag_filter are returned. Include
+    globs are passed to git as ref patterns; with exclude globs or a
+    regex, tag names are listed first (no objects are read) and only
+    the selected refs are peeled.
+    
     Args:
         repo: git.Repo instance
+        use_cache: Reuse a cached tag list. Default: True
+        tag_filter: Release tag selection. Default: None (RELEASE_TAGS
+                    environment variable, every tag when unset)
         
     Returns:
         List of tag info dicts: [{name, hash, date}, ...]
     """
+    if tag_filter is None:
+        tag_filter = default_tag_filter()
+    cache = get_analysis_cache()
+    key = (
+        "tags", os.path.abspath(repo.common_dir),
+        refs_fingerprint(repo, "refs/tags"), tag_filter,
+    )
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return list(cached)
+    
+    patterns = tag_filter.ref_patterns()
+    if tag_filter.needs_names:
+        names = repo.git.for_each_ref("--format=%(refname)", *patterns).splitlines()
+        selected = [n for n in names if tag_filter.matches(n[len("refs/tags/"):])]
+        if len(selected) < len(names):
+            # Tag names cannot contain glob characters: exact patterns
+            patterns = selected
+    
+    output = ""
+    if patterns:
+        output = repo.git.for_each_ref(
+            "--sort=creatordate", f"--format={TAG_REF_FORMAT}", *patterns
+        )
+    
     tags = []
-    for tag in repo.tags:
-        try:
-            # Annotated tag
-            tag_date = tag.tag.tagged_date if hasattr(tag, 'tag') and tag.tag else tag.commit.committed_date
-            tags.append({
-                "name": str(tag),
-                "hash": tag.commit.hexsha,
-                "date": datetime.fromtimestamp(tag_date),
-            })
-        except Exception:
-            # Lightweight tag
-            tags.append({
-                "name": str(tag),
-                "hash": tag.commit.hexsha,
-                "date": datetime.fromtimestamp(tag.commit.committed_date),
-            })
+    nested = []  # Tags of tags: peeled with cat-file below
+    for line in output.splitlines():
+        name, type_, sha, peeled_type, peeled, date, commit_date = line.split("\0")
+        if not tag_filter.matches(name):
+            # An exact pattern also matches refs below it (v1 -> v1/x)
+            continue
+        if type_ == "tag":
+            # Annotated tag: creatordate is the tagger date
+            if peeled_type == "tag":
+                nested.append(len(tags))
+            elif peeled_type != "commit":
+                continue
+            sha = peeled
+            date = date or commit_date
+        elif type_ != "commit":
+            continue
+        tags.append({
+            "name": name,
+            "hash": sha,
+            "date": datetime.fromtimestamp(int(date or 0)),
+        })
+    
+    if nested:
+        revs = [f"refs/tags/{tags[i]['name']}^{{commit}}" for i in nested]
+        resolved = get_cat_file(repo).resolve(revs)
+        for i, rev in zip(nested, revs):
+            tags[i]["hash"] = resolved.get(rev)
+        tags = [t for t in tags if t["hash"] is not None]
     
-    # Sort by date
-    tags.sort(key=lambda t: t["date"])
-    return tags
+    if use_cache:
+        cache.put(key, tags)
+    return list(tags)
+
+
+def find_previous_tag(tags: list[dict], name: str) -> dict | None:
+    """
+    Find the release tag preceding a given tag.
+    
+    Releases are ordered by semver precedence (see order_tags).
+    
+    Args:
+        tags: Tag list from get_tags
+        name: Tag name
+        
+    Returns:
+        Previous tag info dict, or None if name is the oldest tag
+        
+    Raises:
+        ValueError: If no tag has this name
+    """
+    ordered = order_tags(tags)
+    names = [t["name"] for t in ordered]
+    index = names.index(name)
+    return ordered[index - 1] if index > 0 else None
 
 
 def aggregate_stats(commits: list[EnrichedCommit]) -> dict:
@@ -214,44 +654,125 @@ def analyze_repo(
     repo_path: str,
     from_ref: str | None = None,
     to_ref: str | None = None,
+    backend: str | None = None,
+    fields: Iterable[str] | None = None,
+    include_stats: bool | None = None,
+    use_cache: bool = True,
+    paths: Sequence[str] = (),
+    first_parent: bool = False,
+    tag_filter: TagFilter | None = None,
+    commit_filter: CommitFilter | None = None,
 ) -> dict:
     """
     Analyze git repository.
     
+    Only the requested result sections are computed, so callers that
+    render commit headers can skip per-commit diff stats and tag lookup.
+    Results are shared through the in-process analysis cache and must
+    not be mutated by callers.
+    
     Args:
         repo_path: Path to git repository
         from_ref: Start ref. Default: None (all commits)
         to_ref: End ref. Default: None (HEAD)
+        backend: Commit ingestion backend ('log', 'gitpython', 'index',
+                 'objects'). Default: None (see default_backend)
+        fields: Result sections to compute (see ANALYSIS_FIELDS).
+                Default: None (all sections)
+        include_stats: Compute per-commit files/insertions/deletions.
+                       Default: None (only if 'stats' is requested)
+        use_cache: Use the in-process analysis cache. Default: True
+        paths: Only commits touching these paths. Default: all commits
+        first_parent: Walk only the mainline and treat every merge as
+                      one commit (PR title). Default: False
+        tag_filter: Release tags to return (see get_tags).
+                    Default: None (RELEASE_TAGS environment variable)
+        commit_filter: Only commits matching type/author/breaking/date
+                       filters, selected by git (see commit_filter).
+                       Summary and stats cover the selected commits.
         
     Returns:
-        Dict with full analysis
+        Dict with repo_path, from_ref, to_ref and the requested sections
+        
+    Raises:
+        ValueError: If fields contains unknown sections
     """
-    # Open repo
-    repo = get_repo(repo_path)
+    fields = ANALYSIS_FIELDS if fields is None else frozenset(fields)
+    unknown = fields - ANALYSIS_FIELDS
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {sorted(unknown)}. Supported: {sorted(ANALYSIS_FIELDS)}"
+        )
+    if include_stats is None:
+        include_stats = FIELD_STATS in fields
+    if backend is None:
+        backend = default_backend()
+    paths = tuple(paths)
+    if tag_filter is None:
+        tag_filter = default_tag_filter()
+    
+    # Borrow a pooled handle (closed or reused when done)
+    with pooled_repo(repo_path) as repo:
+        # Serve repeated requests for an unchanged repository from cache
+        cache = get_analysis_cache() if use_cache else None
+        if cache is not None:
+            cache_key = (
+                os.path.abspath(repo.common_dir),
+                repo_fingerprint(repo),
+                from_ref,
+                to_ref,
+                backend,
+                fields,
+                include_stats,
+                paths,
+                first_parent,
+                tag_filter,
+                commit_filter,
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "repo_path": repo_path}
     
-    # Get commits
-    commits = get_commits_between(repo, from_ref, to_ref)
+        result: dict = {
+            "repo_path": repo_path,
+            "from_ref": from_ref,
+            "to_ref": to_ref,
+        }
     
-    # Aggregate stats
-    stats = aggregate_stats(commits)
+        # Get commits
+        if fields & {FIELD_COMMITS, FIELD_SUMMARY, FIELD_STATS, FIELD_GRAPH}:
+            graph: dict[str, tuple[str, ...]] | None = {} if FIELD_GRAPH in fields else None
+            commits = get_commits_between(
+                repo, from_ref, to_ref, backend=backend,
+                include_stats=include_stats, graph=graph, paths=paths,
+                first_parent=first_parent, commit_filter=commit_filter,
+            )
+            if FIELD_COMMITS in fields:
+                result["commits"] = commits
+            if FIELD_GRAPH in fields:
+                result["graph"] = graph
+        
+            # Aggregate stats
+            if fields & {FIELD_SUMMARY, FIELD_STATS}:
+                stats = aggregate_stats(commits)
+                if FIELD_SUMMARY in fields:
+                    result["summary"] = {
+                        "total_commits": len(commits),
+                        "by_type": stats["by_type"],
+                        "by_author": stats["by_author"],
+                    }
+                if FIELD_STATS in fields:
+                    result["stats"] = {
+                        "files_changed": stats["files_changed"],
+                        "insertions": stats["insertions"],
+                        "deletions": stats["deletions"],
+                    }
     
-    # Get tags
-    tags = get_tags(repo)
+        # Get tags
+        if FIELD_TAGS in fields:
+            result["tags"] = get_tags(repo, use_cache=use_cache, tag_filter=tag_filter)
     
-    return {
-        "repo_path": repo_path,
-        "from_ref": from_ref,
-        "to_ref": to_ref,
-        "commits": commits,
-        "summary": {
-            "total_commits": len(commits),
-            "by_type": stats["by_type"],
-            "by_author": stats["by_author"],
-        },
-        "stats": {
-            "files_changed": stats["files_changed"],
-            "insertions": stats["insertions"],
-            "deletions": stats["deletions"],
-        },
-        "tags": tags,
-    }
+        if cache is not None:
+            cache.put(cache_key, result)
+    
+        return result
@@ -0,0 +1,144 @@
+"""Shared-walk changelogs for several branches.
+
+Release branches (release/2.x, release/3.x, main) share most of their
+history. Instead of one walk per branch, the union of their histories
+is read with a single ``git log --topo-order`` and every commit gets a
+bitset of the branches that contain it: bit i is set when tip i
+reaches the commit. Topological order emits children before parents,
+so a commit's bitset is complete when git emits it and can be pushed
+to its parents right away.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterator, Sequence
+
+from git import GitCommandError, Repo
+
+from ..models.changelog import ChangelogVersion
+from .analyzer import EnrichedCommit, InvalidRepoError, enrich_records, get_tags
+from .cat_file import get_cat_file
+from .git_log import LogRecord, iter_log_records
+from .tag_filter import TagFilter
+
+
+@dataclass
+class BranchWalk:
+    """Commits of several branches read in one pass."""
+    branches: list[str]
+    tips: list[str]
+    commits: list[EnrichedCommit] = field(default_factory=list)  # Topological order
+    membership: dict[str, int] = field(default_factory=dict)     # sha -> branch bitset
+    graph: dict[str, tuple[str, ...]] = field(default_factory=dict)
+
+    def contains(self, index: int, sha: str) -> bool:
+        """Check whether branch `index` contains a commit."""
+        return bool(self.membership.get(sha, 0) >> index & 1)
+
+    def commits_of(self, index: int) -> list[EnrichedCommit]:
+        """
+        Get the commits of one branch.
+
+        Args:
+            index: Branch position in `branches`
+
+        Returns:
+            Non-WIP commits reachable from the branch tip, newest first
+        """
+        bit = 1 << index
+        commits = [c for c in self.commits if self.membership[c.hash] & bit]
+        commits.sort(key=lambda c: c.date, reverse=True)
+        return commits
+
+
+def walk_branches(
+    repo: Repo,
+    branches: Sequence[str],
+    include_stats: bool = False,
+) -> BranchWalk:
+    """
+    Walk the union of several branches once.
+
+    Args:
+        repo: git.Repo instance
+        branches: Branch names or other revisions
+        include_stats: Compute files_changed/insertions/deletions
+
+    Returns:
+        BranchWalk with commits, membership bitsets and parent graph
+
+    Raises:
+        InvalidRepoError: If a branch does not resolve to a commit
+        ValueError: If no branches are given
+    """
+    branches = list(dict.fromkeys(branches))
+    if not branches:
+        raise ValueError("At least one branch is required")
+
+    revs = [f"{b}^{{commit}}" for b in branches]
+    resolved = get_cat_file(repo).resolve(revs)
+    missing = [b for b, rev in zip(branches, revs) if rev not in resolved]
+    if missing:
+        raise InvalidRepoError(f"Invalid ref: {', '.join(missing)}")
+    tips = [resolved[rev] for rev in revs]
+
+    walk = BranchWalk(branches=branches, tips=tips)
+    # Bits pushed down from already emitted children
+    pending: dict[str, int] = {}
+    for i, tip in enumerate(tips):
+        pending[tip] = pending.get(tip, 0) | 1 << i
+
+    def with_membership(records: Iterator[LogRecord]) -> Iterator[LogRecord]:
+        for record in records:
+            mask = pending.pop(record.hash, 0)
+            walk.membership[record.hash] = mask
+            for parent in record.parents:
+                pending[parent] = pending.get(parent, 0) | mask
+            yield record
+
+    records = iter_log_records(
+        repo, None, numstat=include_stats,
+        extra_args=["--topo-order"], stdin_revs=sorted(set(tips)),
+    )
+    try:
+        walk.commits = list(enrich_records(with_membership(records), walk.graph))
+    except GitCommandError as e:
+        raise InvalidRepoError(f"Invalid ref: {', '.join(branches)}") from e
+    return walk
+
+
+def iter_branch_versions(
+    repo: Repo,
+    branches: Sequence[str],
+    include_unreleased: bool = True,
+    tag_filter: TagFilter | None = None,
+) -> Iterator[tuple[str, list[ChangelogVersion]]]:
+    """
+    Group the commits of several branches into versions.
+
+    Tags are read once; each branch gets the tags that point into its
+    history and is grouped by ancestry over the shared graph.
+
+    Args:
+        repo: git.Repo instance
+        branches: Branch names
+        include_unreleased: Keep the Unreleased section
+        tag_filter: Release tags that bound versions (see get_tags)
+
+    Yields:
+        (branch, versions newest first)
+
+    Raises:
+        InvalidRepoError: If a branch does not resolve
+    """
+    from .template_service import TemplateService
+
+    ts = TemplateService()
+    walk = walk_branches(repo, branches)
+    tags = get_tags(repo, tag_filter=tag_filter)
+
+    for i, branch in enumerate(walk.branches):
+        branch_tags = [t for t in tags if walk.contains(i, t['hash'])]
+        versions = ts.group_commits_by_version(walk.commits_of(i), branch_tags, walk.graph)
+        if not include_unreleased:
+            versions = [v for v in versions if v.version != "Unreleased"]
+        yield branch, versions
@@ -0,0 +1,256 @@
+"""Cancellation and deadlines for tool calls.
+
+Every tool call runs with a CancelToken (see server._cancellable). The
+token is cancelled when the call runs past its deadline or when the MCP
+client cancels the request or disconnects. Cancelling kills the
+streaming ``git`` processes registered with the token and makes the
+next checkpoint raise, so abandoned calls stop walking history instead
+of starving live ones.
+
+The token of the running call is found through a context variable, so
+services reach it without passing it through every signature:
+
+    with cancel_scope(CancelToken(timeout=30)):
+        for record in iter_log_records(repo, "HEAD"):  # killed on cancel
+            ...
+"""
+
+import contextvars
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+
+TOOL_TIMEOUT_ENV = "TOOL_TIMEOUT"
+
+# Seconds between polls of the client's cancel state while waiting
+POLL_INTERVAL = 0.1
+
+
+class OperationCancelled(BaseException):
+    """
+    Raised when a tool call is cancelled.
+
+    A BaseException, like asyncio.CancelledError, so the broad
+    ``except Exception`` handlers of the tools do not turn it into an
+    ordinary error.
+    """
+
+    def __init__(self, message: str = "Cancelled by client"):
+        super().__init__(message)
+        # Output ready before the cancellation, attached by the tool
+        self.partial: str | None = None
+
+
+class DeadlineExceeded(OperationCancelled):
+    """Raised when a tool call runs past its deadline."""
+
+
+class CancelToken:
+    """Cancellation state of one tool call."""
+
+    def __init__(
+        self,
+        timeout: float | None = None,
+        poll: Callable[[], bool] | None = None,
+    ):
+        """
+        Initialize token.
+
+        Args:
+            timeout: Seconds until the deadline. Default: None (no deadline)
+            poll: Returns True once the client has cancelled the request.
+                  Called from the thread that checks the token.
+        """
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self._poll = poll
+        self._last_poll = 0.0
+        self._event = threading.Event()
+        self._error: OperationCancelled | None = None
+        self._lock = threading.Lock()
+        self._procs: set[subprocess.Popen] = set()
+        self._timer: threading.Timer | None = None
+        if timeout is not None:
+            # Kills processes even while the checking thread is blocked
+            self._timer = threading.Timer(max(timeout, 0), self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self, error: OperationCancelled | None = None) -> None:
+        """
+        Cancel the call and kill its registered processes.
+
+        Args:
+            error: Exception raised by checkpoints. Default: OperationCancelled
+        """
+        with self._lock:
+            if self._error is None:
+                self._error = error or OperationCancelled()
+            procs = list(self._procs)
+        self._event.set()
+        for proc in procs:
+            _kill(proc)
+
+    def _expire(self) -> None:
+        self.cancel(DeadlineExceeded(f"Timed out after {self.timeout:g}s"))
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the call is cancelled (polls the client at most every POLL_INTERVAL)."""
+        if not self._event.is_set() and self._poll is not None:
+            now = time.monotonic()
+            if now - self._last_poll >= POLL_INTERVAL:
+                self._last_poll = now
+                if self._poll():
+                    self.cancel()
+        return self._event.is_set()
+
+    def check(self) -> None:
+        """
+        Raise if the call is cancelled.
+
+        Raises:
+            OperationCancelled: If cancelled by the client
+            DeadlineExceeded: If the deadline has passed
+        """
+        if self.cancelled:
+            raise type(self._error)(*self._error.args)
+
+    def remaining(self) -> float | None:
+        """Seconds left until the deadline (None without one)."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    @contextmanager
+    def track(self, proc: subprocess.Popen) -> Iterator[None]:
+        """Kill a process if the call is cancelled while it runs."""
+        with self._lock:
+            self._procs.add(proc)
+            cancelled = self._error is not None
+        if cancelled:
+            _kill(proc)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._procs.discard(proc)
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking call that cannot be interrupted (e.g. an HTTP request).
+
+        The call runs in a helper thread; on cancellation it is
+        abandoned and left to end on its own timeout.
+
+        Returns:
+            Result of fn
+
+        Raises:
+            OperationCancelled: If cancelled before fn returns
+        """
+        result: dict[str, Any] = {}
+        done = threading.Event()
+
+        def run() -> None:
+            try:
+                result["value"] = fn(*args, **kwargs)
+            except BaseException as e:
+                result["error"] = e
+            finally:
+                done.set()
+
+        threading.Thread(target=run, name="cancellable-call", daemon=True).start()
+        while not done.wait(POLL_INTERVAL):
+            self.check()
+        if "error" in result:
+            raise result["error"]
+        return result["value"]
+
+    def close(self) -> None:
+        """Stop the deadline timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+
+
+def _kill(proc: subprocess.Popen) -> None:
+    try:
+        proc.kill()
+    except OSError:
+        pass  # Already exited
+
+
+_current: contextvars.ContextVar[CancelToken | None] = contextvars.ContextVar(
+    "cancel_token", default=None
+)
+
+
+def current_token() -> CancelToken | None:
+    """Get the token of the running tool call (None outside of one)."""
+    return _current.get()
+
+
+def check_cancelled() -> None:
+    """
+    Checkpoint: raise if the running tool call is cancelled.
+
+    Raises:
+        OperationCancelled: If the call is cancelled or past its deadline
+    """
+    token = _current.get()
+    if token is not None:
+        token.check()
+
+
+@contextmanager
+def track_process(proc: subprocess.Popen) -> Iterator[None]:
+    """Kill a process if the running tool call is cancelled (no-op outside of one)."""
+    token = _current.get()
+    if token is None:
+        yield
+        return
+    with token.track(proc):
+        yield
+
+
+@contextmanager
+def cancel_scope(token: CancelToken) -> Iterator[CancelToken]:
+    """
+    Make a token the running call's token.
+
+    Args:
+        token: Token for the call
+
+    Yields:
+        The token
+    """
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+        token.close()
+
+
+def default_timeout() -> float | None:
+    """
+    Get the deadline configured by the TOOL_TIMEOUT environment variable.
+
+    Returns:
+        Seconds, or None (no deadline) when unset or 0
+
+    Raises:
+        ValueError: If the variable is not a number
+    """
+    value = os.getenv(TOOL_TIMEOUT_ENV)
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError as e:
+        raise ValueError(f"{TOOL_TIMEOUT_ENV} must be a number of seconds, got '{value}'") from e
+    return seconds if seconds > 0 else None
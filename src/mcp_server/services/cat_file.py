@@ -0,0 +1,330 @@
+"""Persistent ``git cat-file`` object service.
+
+Keeps long-lived ``git cat-file --batch`` / ``--batch-check`` processes
+per repository and answers object reads over their pipes, so resolving
+hundreds of refs or objects is one round trip instead of one GitPython
+object access (or one subprocess) each.
+"""
+
+import atexit
+import os
+import queue
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable
+
+from git import Repo
+
+
+DEFAULT_TIMEOUT = 30.0   # Seconds to wait for a batch answer
+MAX_POOLED_REPOS = 16    # Repositories with live workers (LRU)
+CHUNK_SIZE = 64 * 1024
+
+MODE_BATCH = "--batch"              # Header + object content
+MODE_BATCH_CHECK = "--batch-check"  # Header only
+
+# Answers for objects that cannot be resolved
+_MISSING_SUFFIXES = (b" missing", b" ambiguous")
+
+
+class CatFileError(Exception):
+    """Raised when a cat-file worker dies and cannot be restarted."""
+    pass
+
+
+@dataclass(frozen=True)
+class ObjectInfo:
+    """Object header as reported by cat-file."""
+    sha: str
+    type: str  # commit, tag, tree, blob
+    size: int
+
+
+class _WorkerDied(Exception):
+    """The worker process exited or closed its pipes."""
+
+
+class CatFileWorker:
+    """One ``git cat-file`` process answering batched requests."""
+
+    def __init__(
+        self,
+        repo: Repo,
+        mode: str = MODE_BATCH,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        """
+        Initialize worker (the process is started on first request).
+
+        Args:
+            repo: git.Repo instance
+            mode: MODE_BATCH or MODE_BATCH_CHECK
+            timeout: Seconds to wait for the answer to a batch
+        """
+        self.git = repo.git
+        self.mode = mode
+        self.timeout = timeout
+        self._proc = None
+        self._chunks: queue.Queue | None = None
+        self._buffer = bytearray()
+        self._pos = 0
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        revs: Iterable[str],
+    ) -> list[tuple[ObjectInfo, bytes | None] | None]:
+        """
+        Look up objects in one round trip.
+
+        A dead worker is restarted and the batch retried once. On timeout
+        the worker is killed (and restarted by the next request).
+
+        Args:
+            revs: Object names (SHAs, refs, 'v1.0.0^{commit}', ...)
+
+        Returns:
+            For every rev, in order: (ObjectInfo, content) or None if the
+            object does not exist. Content is None in MODE_BATCH_CHECK.
+
+        Raises:
+            ValueError: If a rev is empty or contains a newline
+            TimeoutError: If git does not answer within the timeout
+            CatFileError: If the worker dies twice in a row
+        """
+        revs = list(revs)
+        for rev in revs:
+            if not rev or "\n" in rev:
+                raise ValueError(f"Invalid object name: {rev!r}")
+        if not revs:
+            return []
+
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    return self._request(revs)
+                except _WorkerDied as e:
+                    self._stop()
+                    if attempt:
+                        raise CatFileError(f"git cat-file {self.mode} died: {e}") from None
+                except TimeoutError:
+                    self._stop()
+                    raise
+
+    def close(self) -> None:
+        """Stop the worker process."""
+        with self._lock:
+            self._stop()
+
+    def _request(self, revs: list[str]) -> list[tuple[ObjectInfo, bytes | None] | None]:
+        """Send one batch and read all answers."""
+        if self._proc is None:
+            self._start()
+
+        payload = "".join(f"{rev}\n" for rev in revs).encode("utf-8")
+        try:
+            self._proc.stdin.write(payload)
+            self._proc.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as e:
+            raise _WorkerDied(str(e)) from None
+
+        deadline = time.monotonic() + self.timeout
+        results = []
+        for _ in revs:
+            header = self._read_line(deadline)
+            if header.endswith(_MISSING_SUFFIXES):
+                results.append(None)
+                continue
+            sha, type_, size = header.decode("ascii").split(" ")
+            info = ObjectInfo(sha=sha, type=type_, size=int(size))
+            content = None
+            if self.mode == MODE_BATCH:
+                # Content is followed by a newline
+                content = self._read_exact(info.size + 1, deadline)[:-1]
+            results.append((info, content))
+
+        # Everything answered: drop consumed bytes
+        del self._buffer[:self._pos]
+        self._pos = 0
+        return results
+
+    def _start(self) -> None:
+        """Start the cat-file process and its stdout reader thread."""
+        self._proc = self.git.cat_file(
+            self.mode, as_process=True, istream=subprocess.PIPE
+        )
+        # stdout is drained by a thread so large batches cannot deadlock
+        # (git blocked on stdout while we block on stdin) and reads can
+        # time out portably
+        self._chunks = queue.Queue()
+        threading.Thread(
+            target=_pump, args=(self._proc.stdout, self._chunks), daemon=True
+        ).start()
+
+    def _stop(self) -> None:
+        """Kill the process and reset buffers."""
+        proc, self._proc = self._proc, None
+        self._chunks = None
+        self._buffer = bytearray()
+        self._pos = 0
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.proc.kill()
+            proc.proc.wait()
+        except OSError:
+            pass
+
+    def _fill(self, deadline: float) -> None:
+        """Append the next chunk of output to the buffer."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"git cat-file {self.mode} did not answer in {self.timeout}s")
+        try:
+            chunk = self._chunks.get(timeout=remaining)
+        except queue.Empty:
+            raise TimeoutError(
+                f"git cat-file {self.mode} did not answer in {self.timeout}s"
+            ) from None
+        if not chunk:
+            raise _WorkerDied("unexpected end of output")
+        self._buffer += chunk
+
+    def _read_line(self, deadline: float) -> bytes:
+        """Read up to (and without) the next newline."""
+        while True:
+            end = self._buffer.find(b"\n", self._pos)
+            if end != -1:
+                line = bytes(self._buffer[self._pos:end])
+                self._pos = end + 1
+                return line
+            self._fill(deadline)
+
+    def _read_exact(self, size: int, deadline: float) -> bytes:
+        """Read exactly size bytes."""
+        while len(self._buffer) - self._pos < size:
+            self._fill(deadline)
+        data = bytes(self._buffer[self._pos:self._pos + size])
+        self._pos += size
+        return data
+
+
+def _pump(stream, chunks: queue.Queue) -> None:
+    """Copy a process stream into a queue; b'' marks end of output."""
+    try:
+        while True:
+            chunk = stream.read1(CHUNK_SIZE)
+            chunks.put(chunk)
+            if not chunk:
+                return
+    except (OSError, ValueError):
+        chunks.put(b"")
+
+
+class CatFile:
+    """Object reads for one repository via pooled cat-file workers."""
+
+    def __init__(self, repo: Repo, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Initialize service (workers start lazily).
+
+        Args:
+            repo: git.Repo instance
+            timeout: Seconds to wait for the answer to a batch
+        """
+        self._check = CatFileWorker(repo, MODE_BATCH_CHECK, timeout)
+        self._batch = CatFileWorker(repo, MODE_BATCH, timeout)
+
+    def info(self, revs: Iterable[str]) -> list[ObjectInfo | None]:
+        """
+        Get object headers.
+
+        Args:
+            revs: Object names
+
+        Returns:
+            ObjectInfo (or None if missing) for every rev, in order
+        """
+        return [r[0] if r else None for r in self._check.request(revs)]
+
+    def read(self, revs: Iterable[str]) -> list[tuple[ObjectInfo, bytes] | None]:
+        """
+        Get object headers and raw content.
+
+        Args:
+            revs: Object names
+
+        Returns:
+            (ObjectInfo, content) (or None if missing) for every rev, in order
+        """
+        return self._batch.request(revs)
+
+    def resolve(self, revs: Iterable[str]) -> dict[str, str]:
+        """
+        Resolve object names to SHAs.
+
+        Args:
+            revs: Object names (e.g. 'HEAD', 'v1.0.0^{commit}')
+
+        Returns:
+            Dict rev -> SHA; revs that do not resolve are absent
+        """
+        revs = list(revs)
+        return {
+            rev: info.sha
+            for rev, info in zip(revs, self.info(revs))
+            if info is not None
+        }
+
+    def close(self) -> None:
+        """Stop both workers."""
+        self._check.close()
+        self._batch.close()
+
+
+_pool: OrderedDict[str, CatFile] = OrderedDict()
+_pool_lock = threading.Lock()
+
+
+def get_cat_file(repo: Repo) -> CatFile:
+    """
+    Get the pooled cat-file service for a repository.
+
+    Services are keyed by git directory; the least recently used one is
+    closed when more than MAX_POOLED_REPOS are open.
+
+    Args:
+        repo: git.Repo instance
+
+    Returns:
+        Shared CatFile instance
+    """
+    key = os.path.abspath(repo.git_dir)
+    with _pool_lock:
+        service = _pool.get(key)
+        if service is None:
+            service = _pool[key] = CatFile(repo)
+            while len(_pool) > MAX_POOLED_REPOS:
+                _, evicted = _pool.popitem(last=False)
+                evicted.close()
+        else:
+            _pool.move_to_end(key)
+        return service
+
+
+def close_all() -> None:
+    """Stop all pooled workers."""
+    with _pool_lock:
+        while _pool:
+            _, service = _pool.popitem()
+            service.close()
+
+
+atexit.register(close_all)
@@ -0,0 +1,185 @@
+"""Commit filters evaluated by git.
+
+Filters on type, author, breaking changes and date are compiled into
+``git log`` options (``-E --grep``, ``--all-match``, ``--author``,
+``--since``/``--until``), so git drops non-matching commits in C while
+walking and only candidates reach the Python parser.
+
+The grep patterns match at the start of any message line, so they
+select a superset (a body line may look like a header); every
+candidate is checked again against its parsed header. WIP commits are
+still dropped by the parser: ``--invert-grep`` negates every --grep
+pattern together, so "type matches and not WIP" cannot be expressed
+in one git invocation, and WIP headers never match a type pattern
+anyway.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Sequence
+
+from .parser_service import COMMIT_TYPES, NON_CONVENTIONAL_TYPE
+
+
+# Optional scope and breaking marker after the type
+_HEADER_SUFFIX = r'(\([^)]*\))?'
+_BREAKING_GREP = rf'^(({"|".join(COMMIT_TYPES)}){_HEADER_SUFFIX}!:|BREAKING([ -]CHANGE)?:)'
+
+
+@dataclass(frozen=True)
+class CommitFilter:
+    """Commit selection pushed down into git log."""
+    commit_types: tuple[str, ...] = ()  # Conventional types; empty = all
+    authors: tuple[str, ...] = ()       # Substrings of 'Name <email>'; empty = all
+    breaking_only: bool = False
+    since: str | None = None            # git date ('2024-01-01', '1 year ago')
+    until: str | None = None
+    max_commits: int | None = None      # Newest commits kept, in git log order
+
+    @classmethod
+    def build(
+        cls,
+        commit_types: Sequence[str] | None = None,
+        authors: Sequence[str] | None = None,
+        breaking_only: bool = False,
+        since: str | None = None,
+        until: str | None = None,
+        max_commits: int | None = None,
+    ) -> "CommitFilter":
+        """
+        Validate filter arguments.
+
+        Args:
+            commit_types: Conventional types (e.g. ['feat', 'fix']) or
+                          'non-conventional'
+            authors: Author names or emails
+            breaking_only: Only breaking changes
+            since: Only commits committed after this git date
+            until: Only commits committed before this git date
+            max_commits: Keep at most this many commits
+
+        Returns:
+            CommitFilter
+
+        Raises:
+            ValueError: If a type is unknown or max_commits is negative
+        """
+        types = tuple(dict.fromkeys(commit_types or ()))
+        unknown = set(types) - set(COMMIT_TYPES) - {NON_CONVENTIONAL_TYPE}
+        if unknown:
+            raise ValueError(
+                f"Unknown commit types: {sorted(unknown)}. "
+                f"Supported: {[*COMMIT_TYPES, NON_CONVENTIONAL_TYPE]}"
+            )
+        if max_commits is not None and max_commits < 0:
+            raise ValueError("max_commits must not be negative")
+        return cls(
+            commit_types=types,
+            authors=tuple(a for a in authors or () if a),
+            breaking_only=breaking_only,
+            since=since or None,
+            until=until or None,
+            max_commits=max_commits,
+        )
+
+    @property
+    def active(self) -> bool:
+        """Whether the filter drops any commit."""
+        return self != CommitFilter()
+
+    def log_args(self, first_parent: bool = False) -> list[str]:
+        """
+        Compile the filter into git log options.
+
+        Args:
+            first_parent: Merges are changelog units titled from their
+                          PR or merged branch, which git cannot see, so
+                          message patterns are not pushed down
+
+        Returns:
+            git log options
+        """
+        greps = []
+        if not first_parent:
+            if self.commit_types and NON_CONVENTIONAL_TYPE not in self.commit_types:
+                types = "|".join(self.commit_types)
+                greps.append(f"--grep=^({types}){_HEADER_SUFFIX}!?:")
+            if self.breaking_only:
+                greps.append(f"--grep={_BREAKING_GREP}")
+
+        args = []
+        if greps or self.authors:
+            args.append("--extended-regexp")
+        if len(greps) > 1:
+            args.append("--all-match")
+        args += greps
+        args += [f"--author={re.escape(author)}" for author in self.authors]
+        if self.since:
+            args.append(f"--since={self.since}")
+        if self.until:
+            args.append(f"--until={self.until}")
+        return args
+
+    def matches(self, commit) -> bool:
+        """
+        Check a parsed commit (the exact test behind the git prefilter).
+
+        Args:
+            commit: EnrichedCommit
+
+        Returns:
+            True if the commit is selected
+        """
+        if self.commit_types and commit.parsed.type not in self.commit_types:
+            return False
+        if self.breaking_only and not commit.parsed.breaking:
+            return False
+        if self.authors:
+            ident = f"{commit.author} <{commit.email}>"
+            if not any(author in ident for author in self.authors):
+                return False
+        return True
+
+    def apply(self, commits: Iterable) -> Iterator:
+        """
+        Keep matching commits, stopping after max_commits.
+
+        Args:
+            commits: EnrichedCommit stream (e.g. from git log)
+
+        Yields:
+            Selected commits
+        """
+        yield from limit(commits, self.max_commits, self.matches)
+
+
+def limit(items: Iterable, count: int | None, predicate=None) -> Iterator:
+    """
+    Yield at most count items, then close the source.
+
+    Closing a git log stream stops the git process instead of letting
+    it write the rest of the history.
+
+    Args:
+        items: Source iterable
+        count: Maximum items. None for no limit
+        predicate: Only count and yield items it accepts
+
+    Yields:
+        Items from the source
+    """
+    if count == 0:
+        return
+    iterator = iter(items)
+    kept = 0
+    try:
+        for item in iterator:
+            if predicate is None or predicate(item):
+                yield item
+                kept += 1
+                if kept == count:
+                    return
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
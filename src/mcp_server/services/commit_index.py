@@ -0,0 +1,346 @@
+"""Persistent commit index.
+
+Stores parsed and enriched commits in a per-repository SQLite database,
+together with the last indexed tip of every ref. Repeat requests only
+walk ``last_tip..tip``; rewritten history (force-push) is detected and
+repaired from the merge-base.
+"""
+
+import hashlib
+import os
+import sqlite3
+from datetime import datetime
+from typing import Iterable
+
+from git import GitCommandError, Repo
+
+from .analyzer import EnrichedCommit, InvalidRepoError
+from .cat_file import get_cat_file
+from .git_log import LogRecord, iter_log_records
+from .parser_service import ParsedCommit, parse_commit
+
+
+INDEX_DIR_ENV = "CHANGELOG_INDEX_DIR"
+DEFAULT_INDEX_DIR = os.path.join("~", ".cache", "git-changelog-mcp")
+
+# Bump when the schema or stored parse results change
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    parents TEXT NOT NULL,
+    author TEXT NOT NULL,
+    email TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    walk INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    wip INTEGER NOT NULL,
+    type TEXT,
+    scope TEXT,
+    description TEXT,
+    breaking INTEGER,
+    body TEXT,
+    raw TEXT,
+    files_changed INTEGER,
+    insertions INTEGER,
+    deletions INTEGER
+);
+CREATE TABLE IF NOT EXISTS tips (
+    ref TEXT PRIMARY KEY,
+    sha TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reach (
+    ref TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    PRIMARY KEY (ref, sha)
+) WITHOUT ROWID;
+"""
+
+
+def get_index_dir() -> str | None:
+    """
+    Get index directory from CHANGELOG_INDEX_DIR env.
+
+    Returns:
+        Directory path, or None if the index is not configured
+    """
+    index_dir = os.getenv(INDEX_DIR_ENV)
+    return os.path.expanduser(index_dir) if index_dir else None
+
+
+class CommitIndex:
+    """SQLite-backed incremental commit index for one repository."""
+
+    def __init__(self, repo: Repo, index_dir: str | None = None):
+        """
+        Open (or create) the index for a repository.
+
+        Args:
+            repo: git.Repo instance
+            index_dir: Directory for index files.
+                       Default: CHANGELOG_INDEX_DIR or ~/.cache/git-changelog-mcp
+        """
+        self.repo = repo
+        index_dir = os.path.expanduser(index_dir or get_index_dir() or DEFAULT_INDEX_DIR)
+        os.makedirs(index_dir, exist_ok=True)
+
+        # One database per repository, keyed by its git directory
+        git_dir = os.path.abspath(repo.git_dir)
+        name = hashlib.sha1(git_dir.encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(index_dir, f"{name}.sqlite")
+
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._ensure_schema()
+
+    def __enter__(self) -> "CommitIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def get_commits(
+        self,
+        to_ref: str = "HEAD",
+        include_stats: bool = True,
+        graph: dict[str, tuple[str, ...]] | None = None,
+    ) -> list[EnrichedCommit]:
+        """
+        Get all non-WIP commits reachable from a ref, updating the index.
+
+        Args:
+            to_ref: Ref to read history for. Default: HEAD
+            include_stats: Fill files_changed/insertions/deletions
+            graph: Optional dict filled with sha -> parent shas of every
+                   reachable commit, including WIP commits
+
+        Returns:
+            List of EnrichedCommit, newest first
+
+        Raises:
+            InvalidRepoError: If the ref is invalid
+        """
+        self.update(to_ref, include_stats)
+        if include_stats:
+            self._fill_stats(to_ref)
+
+        if graph is not None:
+            for sha, parents in self.conn.execute(
+                """
+                SELECT c.sha, c.parents FROM reach r JOIN commits c ON c.sha = r.sha
+                WHERE r.ref = ?
+                """,
+                (to_ref,),
+            ):
+                graph[sha] = tuple(parents.split())
+
+        rows = self.conn.execute(
+            """
+            SELECT c.sha, c.parents, c.author, c.email, c.timestamp, c.type, c.scope,
+                   c.description, c.breaking, c.body, c.raw,
+                   c.files_changed, c.insertions, c.deletions
+            FROM reach r JOIN commits c ON c.sha = r.sha
+            WHERE r.ref = ? AND c.wip = 0
+            ORDER BY c.timestamp DESC, c.walk DESC, c.pos ASC
+            """,
+            (to_ref,),
+        )
+        return [_row_to_commit(row, include_stats) for row in rows]
+
+    def update(self, ref: str, include_stats: bool = False) -> str:
+        """
+        Bring the index for a ref up to date with the repository.
+
+        Args:
+            ref: Ref name (branch, tag, HEAD)
+            include_stats: Collect diff stats for newly walked commits
+
+        Returns:
+            Resolved tip SHA
+
+        Raises:
+            InvalidRepoError: If the ref is invalid
+        """
+        rev = f"{ref}^{{commit}}"
+        tip = get_cat_file(self.repo).resolve([rev]).get(rev)
+        if tip is None:
+            raise InvalidRepoError(f"Invalid ref: {ref}")
+
+        row = self.conn.execute("SELECT sha FROM tips WHERE ref = ?", (ref,)).fetchone()
+        old_tip = row[0] if row else None
+
+        if old_tip == tip:
+            return tip
+
+        with self.conn:
+            if old_tip is None:
+                self._walk(ref, tip, include_stats)
+            elif self._is_ancestor(old_tip, tip):
+                # Fast-forward: only the new commits are walked
+                self._walk(ref, f"{old_tip}..{tip}", include_stats)
+            else:
+                # History was rewritten: drop commits that are no longer
+                # reachable and walk the new side from the merge-base
+                self._repair(ref, old_tip, tip, include_stats)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tips (ref, sha) VALUES (?, ?)", (ref, tip)
+            )
+        return tip
+
+    def _ensure_schema(self) -> None:
+        """Create tables, dropping an index built with an older schema."""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            with self.conn:
+                self.conn.executescript(
+                    "DROP TABLE IF EXISTS commits;"
+                    "DROP TABLE IF EXISTS tips;"
+                    "DROP TABLE IF EXISTS reach;"
+                )
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _is_ancestor(self, old_tip: str, tip: str) -> bool:
+        """Check ancestry; a missing (garbage-collected) old tip is not one."""
+        try:
+            return self.repo.is_ancestor(old_tip, tip)
+        except GitCommandError:
+            return False
+
+    def _repair(self, ref: str, old_tip: str, tip: str, include_stats: bool) -> None:
+        """Re-index a ref whose history was rewritten."""
+        try:
+            bases = self.repo.git.merge_base(old_tip, tip).split()
+        except GitCommandError:
+            # Unrelated histories or old tip no longer exists
+            bases = []
+
+        if not bases:
+            self.conn.execute("DELETE FROM reach WHERE ref = ?", (ref,))
+            self._walk(ref, tip, include_stats)
+            return
+
+        base = bases[0]
+        dropped = self.repo.git.rev_list(f"{base}..{old_tip}").split()
+        self.conn.executemany(
+            "DELETE FROM reach WHERE ref = ? AND sha = ?",
+            ((ref, sha) for sha in dropped),
+        )
+        self._walk(ref, f"{base}..{tip}", include_stats)
+
+    def _walk(self, ref: str, rev_range: str, include_stats: bool) -> None:
+        """Walk a range with git log and store commits and membership."""
+        walk = self.conn.execute(
+            "SELECT COALESCE(MAX(walk), 0) + 1 FROM commits"
+        ).fetchone()[0]
+        try:
+            for pos, record in enumerate(
+                iter_log_records(self.repo, rev_range, numstat=include_stats)
+            ):
+                self._store(record, walk, pos, include_stats)
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO reach (ref, sha) VALUES (?, ?)",
+                    (ref, record.hash),
+                )
+        except GitCommandError as e:
+            raise InvalidRepoError(f"Invalid ref: {rev_range}") from e
+
+    def _store(self, record: LogRecord, walk: int, pos: int, include_stats: bool) -> None:
+        """Insert a commit; existing rows only gain missing stats."""
+        parsed = parse_commit(record.message, record.trailers)
+        stats = (
+            (record.files_changed, record.insertions, record.deletions)
+            if include_stats else (None, None, None)
+        )
+        self.conn.execute(
+            """
+            INSERT INTO commits (
+                sha, parents, author, email, timestamp, walk, pos, wip,
+                type, scope, description, breaking, body, raw,
+                files_changed, insertions, deletions
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(sha) DO UPDATE SET
+                files_changed = COALESCE(files_changed, excluded.files_changed),
+                insertions = COALESCE(insertions, excluded.insertions),
+                deletions = COALESCE(deletions, excluded.deletions)
+            """,
+            (
+                record.hash,
+                " ".join(record.parents),
+                record.author,
+                record.email,
+                record.timestamp,
+                walk,
+                pos,
+                int(parsed is None),
+                parsed.type if parsed else None,
+                parsed.scope if parsed else None,
+                parsed.description if parsed else None,
+                int(parsed.breaking) if parsed else None,
+                parsed.body if parsed else None,
+                parsed.raw if parsed else None,
+                *stats,
+            ),
+        )
+
+    def _fill_stats(self, ref: str) -> None:
+        """Collect diff stats for indexed commits that were walked without them."""
+        missing = [
+            row[0] for row in self.conn.execute(
+                """
+                SELECT c.sha FROM reach r JOIN commits c ON c.sha = r.sha
+                WHERE r.ref = ? AND c.wip = 0 AND c.files_changed IS NULL
+                """,
+                (ref,),
+            )
+        ]
+        if not missing:
+            return
+        with self.conn:
+            self.conn.executemany(
+                """
+                UPDATE commits SET files_changed = ?, insertions = ?, deletions = ?
+                WHERE sha = ?
+                """,
+                (
+                    (r.files_changed, r.insertions, r.deletions, r.hash)
+                    for r in _iter_stats(self.repo, missing)
+                ),
+            )
+
+
+def _iter_stats(repo: Repo, shas: Iterable[str]):
+    """Read diff stats for specific commits in one git log process."""
+    return iter_log_records(
+        repo, None, numstat=True, extra_args=["--no-walk=unsorted"], stdin_revs=shas
+    )
+
+
+def _row_to_commit(row: tuple, include_stats: bool) -> EnrichedCommit:
+    """Build EnrichedCommit from an index row."""
+    (sha, parents, author, email, timestamp, type_, scope, description, breaking,
+     body, raw, files_changed, insertions, deletions) = row
+    return EnrichedCommit(
+        parsed=ParsedCommit(
+            type=type_,
+            description=description,
+            scope=scope,
+            breaking=bool(breaking),
+            body=body,
+            raw=raw,
+        ),
+        hash=sha,
+        short_hash=sha[:7],
+        author=author,
+        email=email,
+        date=datetime.fromtimestamp(timestamp),
+        files_changed=(files_changed or 0) if include_stats else 0,
+        insertions=(insertions or 0) if include_stats else 0,
+        deletions=(deletions or 0) if include_stats else 0,
+        parents=tuple(parents.split()),
+    )
@@ -0,0 +1,151 @@
+"""Per-release diff statistics from tree-to-tree diffs.
+
+Summing per-commit numstat over a release reads the diff of every
+commit. The lines changed by a release are instead read from one
+``git diff --shortstat`` between its boundaries (previous tag and
+tag). The result is the net change of the release: a change reverted
+within the release does not count.
+
+Results are cached by the resolved SHA pair: the diff between two
+commits never changes, so released ranges are computed once.
+"""
+
+import os
+import re
+from typing import Iterable
+
+from git import GitCommandError, Repo
+
+from ..models.changelog import ChangelogVersion, DiffStats
+from .analysis_cache import get_analysis_cache
+from .analyzer import InvalidRepoError
+from .cat_file import get_cat_file
+
+
+# Tree of an empty directory: base of a range that starts at the root
+EMPTY_TREE_SHA = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+_SHORTSTAT = re.compile(
+    r'(?P<files>\d+) files? changed'
+    r'(?:, (?P<insertions>\d+) insertions?\(\+\))?'
+    r'(?:, (?P<deletions>\d+) deletions?\(-\))?'
+)
+
+
+def parse_shortstat(output: str) -> DiffStats:
+    """
+    Parse ``git diff --shortstat`` output.
+
+    Args:
+        output: e.g. ' 3 files changed, 10 insertions(+), 2 deletions(-)'
+
+    Returns:
+        DiffStats (all zero for an empty diff)
+    """
+    match = _SHORTSTAT.search(output)
+    if match is None:
+        return DiffStats()
+    return DiffStats(
+        files_changed=int(match.group('files')),
+        insertions=int(match.group('insertions') or 0),
+        deletions=int(match.group('deletions') or 0),
+    )
+
+
+def get_diff_stats(
+    repo: Repo,
+    base: str | None,
+    tip: str,
+    use_cache: bool = True,
+) -> DiffStats:
+    """
+    Get the net line changes of a range with one diff.
+
+    The diff runs from the merge-base of base and tip to tip, the same
+    changes the commit range ``base..tip`` introduces. Renames count as
+    delete + add, like the per-commit stats.
+
+    Args:
+        repo: git.Repo instance
+        base: Exclusive start (tag, branch, SHA). None starts at the root
+        tip: End of the range
+        use_cache: Use the in-process analysis cache. Default: True
+
+    Returns:
+        DiffStats
+
+    Raises:
+        InvalidRepoError: If a ref does not resolve to a commit
+    """
+    revs = [f"{ref}^{{commit}}" for ref in (base, tip) if ref is not None]
+    resolved = get_cat_file(repo).resolve(revs)
+    missing = [rev[:-len("^{commit}")] for rev in revs if rev not in resolved]
+    if missing:
+        raise InvalidRepoError(f"Invalid ref: {', '.join(missing)}")
+    tip_sha = resolved[revs[-1]]
+    base_sha = resolved[revs[0]] if base is not None else None
+
+    cache = get_analysis_cache() if use_cache else None
+    key = ("diff_stats", os.path.abspath(repo.common_dir), base_sha, tip_sha)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    if base_sha is None:
+        args = [EMPTY_TREE_SHA, tip_sha]
+    else:
+        args = [f"{base_sha}...{tip_sha}"]
+    try:
+        output = repo.git.diff("--shortstat", "--no-renames", "--no-ext-diff", *args)
+    except GitCommandError as e:
+        raise InvalidRepoError(f"Cannot diff {base or 'root'}..{tip}") from e
+
+    stats = parse_shortstat(output)
+    if cache is not None:
+        cache.put(key, stats)
+    return stats
+
+
+def get_range_stats(repo: Repo, rev_range: str, use_cache: bool = True) -> DiffStats:
+    """
+    Get the net line changes of a revision range.
+
+    Args:
+        repo: git.Repo instance
+        rev_range: 'base..tip' or 'tip' (from the root)
+        use_cache: Use the in-process analysis cache. Default: True
+
+    Returns:
+        DiffStats
+
+    Raises:
+        InvalidRepoError: If a ref does not resolve to a commit
+    """
+    base, sep, tip = rev_range.partition("..")
+    if not sep:
+        return get_diff_stats(repo, None, base, use_cache)
+    return get_diff_stats(repo, base or None, tip or "HEAD", use_cache)
+
+
+def add_version_stats(
+    repo: Repo,
+    versions: Iterable[ChangelogVersion],
+    ranges: dict[str, str],
+) -> None:
+    """
+    Set stats on versions, one diff per release boundary.
+
+    Args:
+        repo: git.Repo instance
+        versions: Versions to annotate
+        ranges: Version name -> revision range (see
+                pipeline.iter_release_ranges)
+
+    Raises:
+        InvalidRepoError: If a boundary does not resolve
+    """
+    for version in versions:
+        rev_range = ranges.get(version.version)
+        if rev_range is not None:
+            version.stats = get_range_stats(repo, rev_range)
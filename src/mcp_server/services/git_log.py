@@ -0,0 +1,275 @@
+"""Streaming git log reader.
+
+Runs a single ``git log`` process and parses its NUL-delimited output
+incrementally, instead of asking GitPython for ``commit.stats`` (one
+``git diff`` subprocess per commit).
+"""
+
+import subprocess
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator, Sequence
+
+from git import Repo
+
+from .cancellation import current_token, track_process
+from .parser_service import TRAILER_KEYS
+
+
+# Every commit record starts with this byte, so it can be told apart
+# from the numstat entries that follow the previous commit.
+RECORD_MARKER = b"\x01"
+
+# Header fields, in order: hash, parents, author name, author email,
+# committer timestamp, trailers, raw message body (kept as UTF-8 bytes;
+# see parser_service.parse_commit).
+# Trailers come pre-split by git: entries separated by 0x1f, key and
+# value by 0x1e, continuation lines unfolded.
+LOG_FORMAT = (
+    "%x01%H%x00%P%x00%an%x00%ae%x00%ct%x00"
+    "%(trailers:unfold,separator=%x1f,key_value_separator=%x1e)%x00%B"
+)
+HEADER_FIELDS = 7
+
+TRAILER_SEPARATOR = b"\x1f"
+TRAILER_KEY_SEPARATOR = b"\x1e"
+
+# Trailer keys registered with git for the log run
+TRAILER_CONFIG = [
+    f"trailer.{key.lower().replace('-', '')}.key={key}" for key in TRAILER_KEYS
+]
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class LogRecord:
+    """Commit as read from ``git log`` output."""
+    hash: str
+    parents: tuple[str, ...]
+    author: str
+    email: str
+    timestamp: int
+    message: bytes  # Raw UTF-8; decoded lazily by parse_commit
+    # (key, value) as split by git; None when the reader did not ask git
+    trailers: tuple[tuple[str, str], ...] | None = None
+    files_changed: int = 0
+    insertions: int = 0
+    deletions: int = 0
+
+
+def build_log_args(
+    rev_range: str | Sequence[str] | None,
+    numstat: bool = True,
+    extra_args: Sequence[str] = (),
+    paths: Sequence[str] = (),
+) -> list[str]:
+    """
+    Build ``git log`` arguments for streaming ingestion.
+
+    Args:
+        rev_range: Revision range (e.g. 'HEAD', 'v1.0.0..v1.1.0') or
+                   revision arguments (e.g. ['v1.1.0', '^v1.0.0']).
+                   None when revisions are passed via --stdin.
+        numstat: Include per-file insertions/deletions
+        extra_args: Additional git log options (e.g. '--no-walk')
+        paths: Only commits touching these paths, with full history
+               (no merge simplification). Stats still cover every file
+               of a matching commit.
+
+    Returns:
+        List of arguments for ``git log``
+    """
+    args = ["-z", f"--format={LOG_FORMAT}"]
+    if numstat:
+        # Same counting rules as commit.stats: merges are diffed against
+        # their first parent and renames count as delete + add
+        args += ["--numstat", "--diff-merges=first-parent", "--no-renames"]
+        if paths:
+            args.append("--full-diff")
+    if paths:
+        # Keep side branches whose changes a merge already has (e.g. a
+        # cherry-picked fix), so every walk of a commit agrees on it
+        args.append("--full-history")
+    args.extend(extra_args)
+    # Revisions are never read as options (e.g. '--output=<file>')
+    args.append("--end-of-options")
+    if isinstance(rev_range, str):
+        args.append(rev_range)
+    elif rev_range is not None:
+        args.extend(rev_range)
+    args.append("--")
+    args.extend(paths)
+    return args
+
+
+def iter_log_records(
+    repo: Repo,
+    rev_range: str | Sequence[str] | None,
+    numstat: bool = True,
+    extra_args: Sequence[str] = (),
+    stdin_revs: Iterable[str] | None = None,
+    paths: Sequence[str] = (),
+) -> Iterator[LogRecord]:
+    """
+    Stream commits from one ``git log`` process.
+
+    Args:
+        repo: git.Repo instance
+        rev_range: Revision range or arguments (see build_log_args)
+        numstat: Include per-file insertions/deletions
+        extra_args: Additional git log options
+        stdin_revs: Revisions to feed via --stdin (instead of/with rev_range)
+        paths: Only commits touching these paths (uses commit-graph
+               Bloom filters when present)
+
+    Yields:
+        LogRecord for every commit in git log order
+
+    Raises:
+        GitCommandError: If git exits with an error (e.g. unknown ref)
+        OperationCancelled: If the tool call is cancelled; git is killed
+    """
+    if stdin_revs is not None:
+        extra_args = [*extra_args, "--stdin"]
+    proc = repo.git(c=TRAILER_CONFIG).log(
+        *build_log_args(rev_range, numstat, extra_args, paths),
+        as_process=True,
+        istream=subprocess.PIPE if stdin_revs is not None else None,
+    )
+    if stdin_revs is not None:
+        # git reads all of stdin before walking, so this cannot deadlock
+        for rev in stdin_revs:
+            proc.stdin.write(rev.encode("ascii") + b"\n")
+        proc.stdin.close()
+
+    token = current_token()
+    completed = False
+    try:
+        with track_process(proc.proc):
+            for record in parse_log_stream(proc.stdout):
+                if token is not None:
+                    token.check()
+                yield record
+            if token is not None:
+                # A killed git ends its output early
+                token.check()
+        completed = True
+    finally:
+        if completed:
+            # Raises GitCommandError with git's stderr on failure
+            proc.wait()
+        else:
+            # Consumer stopped early: don't make git write the rest
+            proc.proc.kill()
+            proc.proc.wait()
+
+
+def parse_log_stream(stream: BinaryIO) -> Iterator[LogRecord]:
+    """
+    Parse ``git log -z`` output produced with LOG_FORMAT.
+
+    Args:
+        stream: Binary stream with git log output
+
+    Yields:
+        LogRecord for every commit in the stream
+    """
+    tokens = _iter_tokens(stream)
+    record: LogRecord | None = None
+
+    for token in tokens:
+        if token.startswith(RECORD_MARKER):
+            if record is not None:
+                yield record
+            header = [token[1:]]
+            for _ in range(HEADER_FIELDS - 1):
+                header.append(next(tokens, b""))
+            record = _make_record(header)
+            continue
+
+        if record is None:
+            continue
+
+        # numstat entry: "<added>\t<deleted>\t<path>"; the first one after
+        # the message carries a leading newline
+        entry = token.lstrip(b"\n")
+        if not entry:
+            continue
+        added, _, rest = entry.partition(b"\t")
+        deleted, _, path = rest.partition(b"\t")
+        if not path:
+            # Rename/copy (if renames are enabled): old and new paths
+            # follow as separate tokens
+            next(tokens, None)
+            next(tokens, None)
+        record.files_changed += 1
+        # Binary files report "-" for both counters
+        if added.isdigit():
+            record.insertions += int(added)
+        if deleted.isdigit():
+            record.deletions += int(deleted)
+
+    if record is not None:
+        yield record
+
+
+def _iter_tokens(stream: BinaryIO) -> Iterator[bytes]:
+    """Split a stream on NUL bytes without reading it whole."""
+    read = getattr(stream, "read1", stream.read)
+    # Pieces of a token that spans chunks (e.g. a multi-megabyte body)
+    pieces: list[bytes] = []
+    while chunk := read(CHUNK_SIZE):
+        start = 0
+        while (end := chunk.find(b"\0", start)) != -1:
+            pieces.append(chunk[start:end])
+            yield b"".join(pieces)
+            pieces = []
+            start = end + 1
+        pieces.append(chunk[start:])
+    if any(pieces):
+        yield b"".join(pieces)
+
+
+def _make_record(header: list[bytes]) -> LogRecord:
+    """Build LogRecord from raw header fields."""
+    sha, parents, author, email, timestamp, trailers, message = header
+    return LogRecord(
+        hash=sha.decode("ascii"),
+        parents=tuple(parents.decode("ascii").split()),
+        author=author.decode("utf-8", errors="replace"),
+        email=email.decode("utf-8", errors="replace"),
+        timestamp=int(timestamp or 0),
+        message=message,
+        trailers=parse_trailers(trailers),
+    )
+
+
+def parse_trailers(field: bytes) -> tuple[tuple[str, str], ...]:
+    """
+    Split the trailers field of LOG_FORMAT into (key, value) pairs.
+
+    Lines of the trailer block that git does not treat as trailers are
+    printed verbatim, without a key separator. Those of the form
+    "Key words: value" are split on the colon, so a "BREAKING CHANGE:"
+    footer inside the block is kept; other lines are dropped.
+
+    Args:
+        field: Raw trailers field
+
+    Returns:
+        Tuple of (key, value), in message order
+    """
+    trailers = []
+    for entry in field.split(TRAILER_SEPARATOR):
+        if not entry.strip():
+            continue
+        key, sep, value = entry.partition(TRAILER_KEY_SEPARATOR)
+        if not sep:
+            key, sep, value = entry.partition(b":")
+            if not sep:
+                continue
+        trailers.append((
+            key.decode("utf-8", errors="replace").strip(),
+            value.decode("utf-8", errors="replace").strip(),
+        ))
+    return tuple(trailers)
@@ -0,0 +1,136 @@
+"""Repository maintenance: commit-graph and multi-pack-index.
+
+Git's commit-graph file stores parents and generation numbers of every
+commit (and optionally changed-path Bloom filters), so reachability
+checks, topological walks and path-limited ``git log`` skip parsing
+commit objects. git uses it automatically once it exists; this module
+detects it and writes or refreshes it for served repositories.
+"""
+
+import glob
+import os
+import struct
+
+from git import Repo
+
+
+GRAPH_SIGNATURE = b"CGPH"
+CHUNK_BLOOM_DATA = b"BDAT"       # Changed-path Bloom filters
+CHUNK_GENERATION_V2 = b"GDA2"    # Corrected commit dates (generation v2)
+CHUNK_FANOUT = b"OIDF"
+
+
+def commit_graph_files(repo: Repo) -> list[str]:
+    """
+    Get commit-graph files of a repository.
+
+    Args:
+        repo: git.Repo instance
+
+    Returns:
+        Paths of the single commit-graph file or of every layer of a
+        split commit-graph chain (oldest first); empty if none exists
+    """
+    info_dir = os.path.join(repo.common_dir, "objects", "info")
+    single = os.path.join(info_dir, "commit-graph")
+    if os.path.isfile(single):
+        return [single]
+
+    chain = os.path.join(info_dir, "commit-graphs", "commit-graph-chain")
+    if not os.path.isfile(chain):
+        return []
+    with open(chain, encoding="ascii") as f:
+        hashes = [line.strip() for line in f if line.strip()]
+    return [
+        os.path.join(info_dir, "commit-graphs", f"graph-{h}.graph") for h in hashes
+    ]
+
+
+def commit_graph_status(repo: Repo) -> dict:
+    """
+    Describe commit-graph and multi-pack-index state.
+
+    Args:
+        repo: git.Repo instance
+
+    Returns:
+        Dict with keys:
+        - commit_graph: bool, a commit-graph exists
+        - layers: number of commit-graph files
+        - commits: commits covered by the commit-graph
+        - bloom_filters: every layer has changed-path Bloom filters
+        - generation_v2: every layer has corrected commit dates
+        - multi_pack_index: bool, a multi-pack-index exists
+    """
+    files = commit_graph_files(repo)
+    chunks = [_read_graph_chunks(path) for path in files]
+    chunks = [c for c in chunks if c is not None]
+
+    pack_dir = os.path.join(repo.common_dir, "objects", "pack")
+    return {
+        "commit_graph": bool(chunks),
+        "layers": len(chunks),
+        "commits": sum(c["commits"] for c in chunks),
+        "bloom_filters": bool(chunks) and all(CHUNK_BLOOM_DATA in c["ids"] for c in chunks),
+        "generation_v2": bool(chunks) and all(CHUNK_GENERATION_V2 in c["ids"] for c in chunks),
+        "multi_pack_index": os.path.isfile(os.path.join(pack_dir, "multi-pack-index")),
+    }
+
+
+def write_commit_graph(
+    repo: Repo,
+    changed_paths: bool = True,
+    multi_pack_index: bool = True,
+) -> dict:
+    """
+    Write or refresh the commit-graph (and multi-pack-index).
+
+    The commit-graph covers all commits reachable from any ref. The
+    multi-pack-index is only written when the repository has packs.
+
+    Args:
+        repo: git.Repo instance
+        changed_paths: Compute changed-path Bloom filters (speeds up
+                       path-limited log)
+        multi_pack_index: Also write a multi-pack-index
+
+    Returns:
+        commit_graph_status() after writing
+
+    Raises:
+        GitCommandError: If git fails to write the files
+    """
+    args = ["write", "--reachable"]
+    if changed_paths:
+        args.append("--changed-paths")
+    repo.git.commit_graph(*args)
+
+    pack_dir = os.path.join(repo.common_dir, "objects", "pack")
+    if multi_pack_index and glob.glob(os.path.join(pack_dir, "*.pack")):
+        repo.git.multi_pack_index("write")
+
+    return commit_graph_status(repo)
+
+
+def _read_graph_chunks(path: str) -> dict | None:
+    """Read chunk ids and commit count from a commit-graph file header."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(8)
+            if len(header) < 8 or header[:4] != GRAPH_SIGNATURE:
+                return None
+            num_chunks = header[6]
+            table = f.read(12 * (num_chunks + 1))
+            ids = {}
+            for i in range(num_chunks):
+                chunk_id, offset = struct.unpack_from(">4sQ", table, 12 * i)
+                ids[chunk_id] = offset
+
+            commits = 0
+            if CHUNK_FANOUT in ids:
+                # Last fanout entry = number of commits in this layer
+                f.seek(ids[CHUNK_FANOUT] + 255 * 4)
+                commits = struct.unpack(">I", f.read(4))[0]
+    except OSError:
+        return None
+    return {"ids": set(ids), "commits": commits}
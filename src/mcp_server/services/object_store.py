@@ -0,0 +1,732 @@
+"""In-process git object reader.
+
+Reads commit and tag objects straight from ``.idx``/``.pack`` files
+(memory-mapped) and loose objects, resolving OFS/REF delta chains in
+Python, so commit metadata can be walked without spawning ``git``.
+
+Only what the analyzer needs is implemented: pack index v2, object
+lookup by full or abbreviated SHA, ref resolution with the common
+revision suffixes (``~N``, ``^N``, ``^{commit}``) and a date-ordered
+commit walk equivalent to ``git log`` without options.
+"""
+
+import glob
+import heapq
+import mmap
+import os
+import re
+import struct
+import zlib
+from typing import Iterator
+
+from git import Repo
+
+from .git_log import LogRecord
+
+
+# Pack object types
+OBJ_COMMIT = 1
+OBJ_TREE = 2
+OBJ_BLOB = 3
+OBJ_TAG = 4
+OBJ_OFS_DELTA = 6
+OBJ_REF_DELTA = 7
+TYPE_NAMES = {OBJ_COMMIT: "commit", OBJ_TREE: "tree", OBJ_BLOB: "blob", OBJ_TAG: "tag"}
+
+IDX_MAGIC = b"\377tOc"
+IDX_HEADER = 8 + 256 * 4  # magic, version, fanout table
+
+# Where a short ref name is looked up, in git's order
+REF_RULES = ("{}", "refs/{}", "refs/tags/{}", "refs/heads/{}", "refs/remotes/{}", "refs/remotes/{}/HEAD")
+
+# Commits walked once only excluded ones are queued, as git's SLOP:
+# covers commit dates older than their parents'
+WALK_SLOP = 5
+
+_HEX = re.compile(r"^[0-9a-f]{4,40}$")
+_SUFFIX = re.compile(r"~(\d*)|\^\{(commit|)\}|\^(\d*)")
+
+
+class ObjectStoreError(Exception):
+    """Raised for corrupt or unsupported object data or revision syntax."""
+    pass
+
+
+class PackIndex:
+    """Memory-mapped pack index (version 2)."""
+
+    def __init__(self, path: str):
+        """
+        Open an index file.
+
+        Args:
+            path: Path to a .idx file
+
+        Raises:
+            ObjectStoreError: If the file is not a v2 pack index
+        """
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.mm[:4] != IDX_MAGIC or struct.unpack_from(">I", self.mm, 4)[0] != 2:
+            self.mm.close()
+            raise ObjectStoreError(f"Unsupported pack index: {path}")
+        self.fanout = struct.unpack_from(">256I", self.mm, 8)
+        self.count = self.fanout[255]
+        self._offsets = IDX_HEADER + self.count * 24  # after SHAs and CRCs
+        self._large = self._offsets + self.count * 4
+
+    def sha(self, i: int) -> bytes:
+        """Binary SHA of the i-th entry."""
+        start = IDX_HEADER + 20 * i
+        return self.mm[start:start + 20]
+
+    def find(self, binsha: bytes) -> int | None:
+        """
+        Get the pack offset of an object.
+
+        Args:
+            binsha: 20-byte SHA
+
+        Returns:
+            Offset in the pack, or None if the object is not in it
+        """
+        i = self._lower_bound(binsha)
+        if i < self.count and self.sha(i) == binsha:
+            return self._offset(i)
+        return None
+
+    def match_prefix(self, prefix: bytes, hex_prefix: str) -> list[bytes]:
+        """Binary SHAs whose hex form starts with hex_prefix (at most 2)."""
+        matches = []
+        i = self._lower_bound(prefix)
+        while i < self.count and len(matches) < 2:
+            sha = self.sha(i)
+            if not sha.hex().startswith(hex_prefix):
+                break
+            matches.append(sha)
+            i += 1
+        return matches
+
+    def close(self) -> None:
+        self.mm.close()
+
+    def _lower_bound(self, binsha: bytes) -> int:
+        first = binsha[0]
+        lo = self.fanout[first - 1] if first else 0
+        hi = self.fanout[first]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.sha(mid) < binsha:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _offset(self, i: int) -> int:
+        offset = struct.unpack_from(">I", self.mm, self._offsets + 4 * i)[0]
+        if offset & 0x80000000:
+            # Index into the 64-bit offset table
+            offset = struct.unpack_from(">Q", self.mm, self._large + 8 * (offset & 0x7FFFFFFF))[0]
+        return offset
+
+
+class Pack:
+    """Memory-mapped packfile with its index."""
+
+    def __init__(self, idx_path: str):
+        """
+        Open a pack and its index.
+
+        Args:
+            idx_path: Path to the .idx file (the .pack is next to it)
+        """
+        self.index = PackIndex(idx_path)
+        with open(idx_path[:-4] + ".pack", "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Slices of a memoryview share the mapping: zlib reads the
+        # compressed data in place
+        self.view = memoryview(self.mm)
+
+    def read(self, offset: int, store: "ObjectStore") -> tuple[int, bytes]:
+        """
+        Read and fully resolve the object at an offset.
+
+        Args:
+            offset: Object offset in the pack
+            store: Store used to find REF_DELTA bases in other packs
+
+        Returns:
+            (object type, content)
+        """
+        deltas = []
+        while True:
+            type_, size, pos = self._header(offset)
+            if type_ == OBJ_OFS_DELTA:
+                base_offset, pos = self._ofs_base(offset, pos)
+                deltas.append(self._inflate(pos, size))
+                offset = base_offset
+            elif type_ == OBJ_REF_DELTA:
+                base_sha = bytes(self.view[pos:pos + 20])
+                deltas.append(self._inflate(pos + 20, size))
+                base = store.read_raw(base_sha)
+                if base is None:
+                    raise ObjectStoreError(f"Missing delta base {base_sha.hex()}")
+                type_, data = base
+                break
+            else:
+                data = self._inflate(pos, size)
+                break
+
+        for delta in reversed(deltas):
+            data = apply_delta(data, delta)
+        return type_, data
+
+    def close(self) -> None:
+        self.view.release()
+        self.mm.close()
+        self.index.close()
+
+    def _header(self, offset: int) -> tuple[int, int, int]:
+        """Object type, inflated size and position of the data."""
+        mm = self.mm
+        c = mm[offset]
+        type_ = (c >> 4) & 7
+        size = c & 0x0F
+        shift = 4
+        pos = offset + 1
+        while c & 0x80:
+            c = mm[pos]
+            pos += 1
+            size |= (c & 0x7F) << shift
+            shift += 7
+        return type_, size, pos
+
+    def _ofs_base(self, offset: int, pos: int) -> tuple[int, int]:
+        """Decode the negative base offset of an OFS_DELTA."""
+        mm = self.mm
+        c = mm[pos]
+        pos += 1
+        distance = c & 0x7F
+        while c & 0x80:
+            c = mm[pos]
+            pos += 1
+            distance = ((distance + 1) << 7) | (c & 0x7F)
+        return offset - distance, pos
+
+    def _inflate(self, pos: int, size: int) -> bytes:
+        # zlib's compressBound(): bounding the input keeps zlib from
+        # copying the rest of the pack into unconsumed_tail
+        bound = size + (size >> 12) + (size >> 14) + (size >> 25) + 13
+        data = zlib.decompressobj().decompress(self.view[pos:pos + bound], size)
+        if len(data) != size:
+            raise ObjectStoreError(f"Corrupt object at offset {pos}")
+        return data
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """
+    Apply a git delta to a base object.
+
+    Args:
+        base: Base object content
+        delta: Delta instructions
+
+    Returns:
+        Target object content
+    """
+    pos = 0
+
+    def varint() -> int:
+        nonlocal pos
+        value = shift = 0
+        while True:
+            c = delta[pos]
+            pos += 1
+            value |= (c & 0x7F) << shift
+            shift += 7
+            if not c & 0x80:
+                return value
+
+    if varint() != len(base):
+        raise ObjectStoreError("Delta base size mismatch")
+    target_size = varint()
+
+    out = bytearray()
+    end = len(delta)
+    while pos < end:
+        op = delta[pos]
+        pos += 1
+        if op & 0x80:
+            # Copy from base: offset and size bytes present per bit
+            offset = size = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (0x10 << i):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset:offset + (size or 0x10000)]
+        elif op:
+            # Insert literal bytes
+            out += delta[pos:pos + op]
+            pos += op
+        else:
+            raise ObjectStoreError("Invalid delta opcode 0")
+
+    if len(out) != target_size:
+        raise ObjectStoreError("Delta result size mismatch")
+    return bytes(out)
+
+
+class ObjectStore:
+    """Object lookup over packs, loose objects and alternates."""
+
+    def __init__(self, objects_dir: str, _seen: set[str] | None = None):
+        """
+        Open an object directory.
+
+        Args:
+            objects_dir: Path to .git/objects
+        """
+        self.objects_dir = objects_dir
+        self.packs: list[Pack] = []
+        self._pack_paths: set[str] = set()
+        self._load_packs()
+
+        # Alternates (objects borrowed from other repositories)
+        seen = _seen if _seen is not None else set()
+        seen.add(os.path.realpath(objects_dir))
+        self.alternates: list[ObjectStore] = []
+        alternates_file = os.path.join(objects_dir, "info", "alternates")
+        if os.path.isfile(alternates_file):
+            with open(alternates_file, encoding="utf-8") as f:
+                for line in f:
+                    path = line.strip()
+                    if not path or path.startswith("#"):
+                        continue
+                    path = os.path.join(objects_dir, path)
+                    if os.path.realpath(path) not in seen and os.path.isdir(path):
+                        self.alternates.append(ObjectStore(path, seen))
+
+    def read(self, sha: str) -> tuple[str, bytes] | None:
+        """
+        Read an object by hex SHA.
+
+        Args:
+            sha: 40-character hex SHA
+
+        Returns:
+            (type name, content) or None if the object does not exist
+        """
+        raw = self.read_raw(bytes.fromhex(sha))
+        if raw is None:
+            return None
+        return TYPE_NAMES[raw[0]], raw[1]
+
+    def read_raw(self, binsha: bytes) -> tuple[int, bytes] | None:
+        """Read an object by binary SHA as (type number, content)."""
+        found = self._read_local(binsha)
+        if found is None and self._load_packs():
+            # Packs appeared since open (gc, fetch): retry like git does
+            found = self._read_local(binsha)
+        if found is not None:
+            return found
+        for alternate in self.alternates:
+            found = alternate.read_raw(binsha)
+            if found is not None:
+                return found
+        return None
+
+    def expand(self, hex_prefix: str) -> str | None:
+        """
+        Expand an abbreviated SHA.
+
+        Args:
+            hex_prefix: 4 to 40 lowercase hex characters
+
+        Returns:
+            Full hex SHA, or None if unknown or ambiguous
+        """
+        if len(hex_prefix) == 40:
+            return hex_prefix if self.read_raw(bytes.fromhex(hex_prefix)) else None
+        matches = set(self._match_prefix(hex_prefix))
+        return matches.pop() if len(matches) == 1 else None
+
+    def close(self) -> None:
+        """Unmap all packs."""
+        for pack in self.packs:
+            pack.close()
+        self.packs = []
+        for alternate in self.alternates:
+            alternate.close()
+
+    def _read_local(self, binsha: bytes) -> tuple[int, bytes] | None:
+        for pack in self.packs:
+            offset = pack.index.find(binsha)
+            if offset is not None:
+                return pack.read(offset, self)
+        return self._read_loose(binsha.hex())
+
+    def _read_loose(self, sha: str) -> tuple[int, bytes] | None:
+        path = os.path.join(self.objects_dir, sha[:2], sha[2:])
+        try:
+            with open(path, "rb") as f:
+                raw = zlib.decompress(f.read())
+        except FileNotFoundError:
+            return None
+        header, _, data = raw.partition(b"\0")
+        type_name = header.split(b" ")[0].decode("ascii")
+        for number, name in TYPE_NAMES.items():
+            if name == type_name:
+                return number, data
+        raise ObjectStoreError(f"Unknown object type {type_name!r} for {sha}")
+
+    def _load_packs(self) -> bool:
+        """Open packs not opened yet; returns True if any were added."""
+        added = False
+        for idx_path in sorted(glob.glob(os.path.join(self.objects_dir, "pack", "*.idx"))):
+            if idx_path in self._pack_paths or not os.path.exists(idx_path[:-4] + ".pack"):
+                continue
+            self.packs.append(Pack(idx_path))
+            self._pack_paths.add(idx_path)
+            added = True
+        return added
+
+    def _match_prefix(self, hex_prefix: str) -> Iterator[str]:
+        padded = bytes.fromhex((hex_prefix + "0")[: len(hex_prefix) + len(hex_prefix) % 2])
+        for pack in self.packs:
+            for sha in pack.index.match_prefix(padded, hex_prefix):
+                yield sha.hex()
+        loose_dir = os.path.join(self.objects_dir, hex_prefix[:2])
+        if os.path.isdir(loose_dir):
+            for name in os.listdir(loose_dir):
+                if (hex_prefix[:2] + name).startswith(hex_prefix):
+                    yield hex_prefix[:2] + name
+        for alternate in self.alternates:
+            yield from alternate._match_prefix(hex_prefix)
+
+
+class RepoObjects:
+    """Refs and objects of one repository, read without spawning git."""
+
+    def __init__(self, repo: Repo):
+        """
+        Open a repository.
+
+        Args:
+            repo: git.Repo instance (only its paths are used)
+        """
+        self.git_dir = repo.git_dir
+        self.common_dir = repo.common_dir
+        self.store = ObjectStore(os.path.join(self.common_dir, "objects"))
+        self._packed_refs: dict[str, str] | None = None
+
+    def __enter__(self) -> "RepoObjects":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap all packs."""
+        self.store.close()
+
+    def resolve(self, rev: str) -> str | None:
+        """
+        Resolve a revision to a commit SHA.
+
+        Supports full and abbreviated SHAs, ref names (looked up like
+        git: refs/, refs/tags/, refs/heads/, refs/remotes/) and the
+        suffixes ~N, ^N, ^{commit} and ^{}.
+
+        Args:
+            rev: Revision (e.g. 'HEAD', 'v1.0.0^{commit}', 'main~2')
+
+        Returns:
+            Commit SHA, or None if it does not resolve
+
+        Raises:
+            ObjectStoreError: If the revision uses unsupported syntax
+        """
+        match = re.match(r"^([^~^]+)((?:~\d*|\^\{(?:commit|)\}|\^\d*)*)$", rev)
+        if not match or "@{" in rev or rev.startswith(":"):
+            raise ObjectStoreError(f"Unsupported revision syntax: {rev}")
+        base, suffixes = match.groups()
+
+        sha = self._resolve_name(base)
+        if sha is None:
+            return None
+        sha = self._peel(sha)
+
+        for step in _SUFFIX.finditer(suffixes):
+            if sha is None:
+                return None
+            ancestors, peel, parent = step.groups()
+            if ancestors is not None:
+                for _ in range(int(ancestors or 1)):
+                    parents = self._parents(sha)
+                    sha = parents[0] if parents else None
+                    if sha is None:
+                        return None
+            elif peel is not None:
+                continue  # Already peeled to a commit
+            else:
+                n = int(parent) if parent else 1
+                if n:
+                    parents = self._parents(sha)
+                    sha = parents[n - 1] if len(parents) >= n else None
+        return sha
+
+    def read_commit(self, sha: str) -> LogRecord | None:
+        """
+        Read and parse a commit object.
+
+        Args:
+            sha: Commit SHA
+
+        Returns:
+            LogRecord without stats, or None if it is not a commit
+        """
+        obj = self.store.read(sha)
+        if obj is None or obj[0] != "commit":
+            return None
+        return parse_commit_object(sha, obj[1])
+
+    def walk(self, include: list[str], exclude: list[str] = ()) -> Iterator[LogRecord]:
+        """
+        Walk commits like ``git log include ^exclude``.
+
+        Commits are emitted newest committer date first; equal dates
+        keep discovery order, as in git's default walk.
+
+        Excluded commits are walked in the same date-ordered queue and
+        mark their ancestors uninteresting as they go, so only history
+        newer than the exclusion boundary is read. As in git, the walk
+        stops a few commits after everything queued is uninteresting,
+        and commits are emitted once it stops (a later exclusion may
+        still reach an earlier commit when dates are skewed).
+
+        Args:
+            include: Tip commit SHAs
+            exclude: Commit SHAs whose ancestors are left out
+
+        Yields:
+            LogRecord for every reachable, non-excluded commit
+        """
+        seen: set[str] = set()
+        queued: set[str] = set()
+        uninteresting: set[str] = set()
+        parents: dict[str, tuple[str, ...]] = {}  # Of popped commits
+        queue: list[tuple[int, int, str, LogRecord]] = []
+        counter = 0
+        interesting = 0  # Queued commits not marked uninteresting
+
+        def push(sha: str) -> None:
+            nonlocal counter, interesting
+            seen.add(sha)
+            record = self.read_commit(sha)
+            if record is None:
+                return  # Shallow clone boundary
+            heapq.heappush(queue, (-record.timestamp, counter, sha, record))
+            counter += 1
+            queued.add(sha)
+            if sha not in uninteresting:
+                interesting += 1
+
+        def mark(sha: str) -> None:
+            nonlocal interesting
+            stack = [sha]
+            while stack:
+                sha = stack.pop()
+                if sha in uninteresting:
+                    continue
+                uninteresting.add(sha)
+                if sha in queued:
+                    interesting -= 1
+                # Ancestors already walked; queued ones pass it on when popped
+                stack.extend(parents.get(sha, ()))
+
+        for sha in exclude:
+            if sha not in seen:
+                uninteresting.add(sha)
+                push(sha)
+        for sha in include:
+            if sha not in seen:
+                push(sha)
+
+        if not exclude:
+            # Nothing can be excluded later: stream as the walk goes
+            while queue:
+                _, _, sha, record = heapq.heappop(queue)
+                yield record
+                for parent in record.parents:
+                    if parent not in seen:
+                        push(parent)
+            return
+
+        walked: list[LogRecord] = []
+        slop = WALK_SLOP
+        while queue:
+            _, _, sha, record = heapq.heappop(queue)
+            queued.discard(sha)
+            parents[sha] = record.parents
+            if sha in uninteresting:
+                for parent in record.parents:
+                    mark(parent)
+            else:
+                interesting -= 1
+                walked.append(record)
+            for parent in record.parents:
+                if parent not in seen:
+                    push(parent)
+            if interesting:
+                slop = WALK_SLOP
+            else:
+                slop -= 1
+                if slop == 0:
+                    break
+
+        for record in walked:
+            if record.hash not in uninteresting:
+                yield record
+
+    def _resolve_name(self, name: str) -> str | None:
+        """Resolve a ref name or SHA to an object SHA."""
+        for rule in REF_RULES:
+            sha = self._read_ref(rule.format(name))
+            if sha is not None:
+                return sha
+        if _HEX.match(name):
+            return self.store.expand(name)
+        return None
+
+    def _read_ref(self, ref: str, depth: int = 0) -> str | None:
+        """Read a loose or packed ref, following symbolic refs."""
+        if depth > 5:
+            return None
+        for base in (self.git_dir, self.common_dir):
+            path = os.path.join(base, ref)
+            if os.path.isfile(path):
+                with open(path, encoding="utf-8") as f:
+                    content = f.read().strip()
+                if content.startswith("ref: "):
+                    return self._read_ref(content[5:], depth + 1)
+                return content if len(content) == 40 else None
+        return self._load_packed_refs().get(ref)
+
+    def _load_packed_refs(self) -> dict[str, str]:
+        if self._packed_refs is None:
+            self._packed_refs = {}
+            path = os.path.join(self.common_dir, "packed-refs")
+            if os.path.isfile(path):
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.startswith(("#", "^")):
+                            continue
+                        sha, _, name = line.strip().partition(" ")
+                        self._packed_refs[name] = sha
+        return self._packed_refs
+
+    def _peel(self, sha: str) -> str | None:
+        """Dereference tags until a commit is reached."""
+        for _ in range(10):
+            obj = self.store.read(sha)
+            if obj is None:
+                return None
+            type_name, data = obj
+            if type_name == "commit":
+                return sha
+            if type_name != "tag":
+                return None
+            sha = data[7:47].decode("ascii")  # "object <sha>\n"
+        return None
+
+    def _parents(self, sha: str) -> tuple[str, ...]:
+        record = self.read_commit(sha)
+        return record.parents if record else ()
+
+
+def parse_commit_object(sha: str, data: bytes) -> LogRecord:
+    """
+    Parse raw commit object content.
+
+    Args:
+        sha: Commit SHA
+        data: Object content (headers, blank line, message)
+
+    Returns:
+        LogRecord with parents, author, committer timestamp and message
+    """
+    headers, _, message = data.partition(b"\n\n")
+    parents = []
+    author = email = b""
+    timestamp = 0
+    encoding = "utf-8"
+    for line in headers.split(b"\n"):
+        if line.startswith(b" "):
+            continue  # Continuation of a multi-line header (gpgsig)
+        key, _, value = line.partition(b" ")
+        if key == b"parent":
+            parents.append(value.decode("ascii"))
+        elif key == b"author":
+            ident, _, _ = value.rpartition(b" ")     # drop timezone
+            ident, _, _ = ident.rpartition(b" ")     # drop timestamp
+            name, _, rest = ident.partition(b" <")
+            author, email = name, rest.rstrip(b">")
+        elif key == b"committer":
+            timestamp = int(value.rsplit(b" ", 2)[1])
+        elif key == b"encoding":
+            encoding = value.decode("ascii", errors="replace")
+
+    def decode(raw: bytes) -> str:
+        try:
+            return raw.decode(encoding, errors="replace")
+        except LookupError:
+            return raw.decode("utf-8", errors="replace")
+
+    return LogRecord(
+        hash=sha,
+        parents=tuple(parents),
+        author=decode(author),
+        email=decode(email),
+        timestamp=timestamp,
+        # Re-encoded only for legacy encodings, like git log does
+        message=message if encoding.lower() in ("utf-8", "utf8") else decode(message).encode("utf-8"),
+    )
+
+
+def iter_object_records(repo: Repo, rev_range: str) -> Iterator[LogRecord]:
+    """
+    Walk a revision range in-process.
+
+    Args:
+        repo: git.Repo instance
+        rev_range: 'to' or 'from..to'
+
+    Yields:
+        LogRecord (without stats) in git log order
+
+    Raises:
+        ValueError: If a revision does not resolve
+        ObjectStoreError: If the range uses unsupported syntax or objects
+                          cannot be read
+    """
+    from_rev, sep, to_rev = rev_range.partition("..")
+    if not sep:
+        from_rev, to_rev = None, rev_range
+    if to_rev.startswith("."):
+        raise ObjectStoreError(f"Unsupported revision range: {rev_range}")
+
+    with RepoObjects(repo) as objects:
+        tip = objects.resolve(to_rev or "HEAD")
+        if tip is None:
+            raise ValueError(f"Unknown revision: {to_rev}")
+        exclude = []
+        if from_rev:
+            base = objects.resolve(from_rev)
+            if base is None:
+                raise ValueError(f"Unknown revision: {from_rev}")
+            exclude.append(base)
+        yield from objects.walk([tip], exclude)
@@ -2,56 +2,204 @@
 
 Parses commit messages in Conventional Commits format.
 Non-conventional commits are also supported (type='non-conventional').
+
+Messages may be str or raw UTF-8 bytes (bytes, bytearray, memoryview as
+read from git). Only the header is decoded eagerly; the body is searched
+for breaking-change footers in place and decoded on first access.
+
+Trailers (Co-authored-by, Refs, ...) are normally split by git itself
+(see git_log.LOG_FORMAT) and passed in; for other sources they are
+parsed from the last paragraph of the body on first access.
 """
 
 import re
-from dataclasses import dataclass
 
 
 # Constants
-COMMIT_TYPES = {
+# Conventional Commits types recognised in headers; ordered, as the
+# header pattern and commit_filter's grep are built from it
+COMMIT_TYPES = (
     "feat", "fix", "perf", "refactor", "docs", "test", "style", "chore", "build", "ci", "revert"
-}
+)
 
 NON_CONVENTIONAL_TYPE = "non-conventional"
 
 WIP_PATTERNS = ["WIP:", "wip:", "Draft:", "DO NOT MERGE"]
 
 
-@dataclass
+Message = str | bytes | bytearray | memoryview
+
+
 class ParsedCommit:
-    """Parsed commit structure."""
-    type: str
-    description: str
-    scope: str | None = None
-    breaking: bool = False
-    body: str | None = None
-    raw: str = ""
+    """
+    Parsed commit structure.
+    
+    body and raw are either given or decoded lazily from the original
+    message, which is kept by reference (never copied). trailers are
+    either given (pre-split by git) or parsed from the body on first
+    access.
+    """
+    __slots__ = (
+        "type", "description", "scope", "breaking",
+        "_body", "_raw", "_source", "_body_start", "_trailers",
+    )
+    
+    def __init__(
+        self,
+        type: str,
+        description: str,
+        scope: str | None = None,
+        breaking: bool = False,
+        body: str | None = None,
+        raw: str = "",
+        trailers: tuple[tuple[str, str], ...] | None = None,
+    ):
+        self.type = type
+        self.description = description
+        self.scope = scope
+        self.breaking = breaking
+        self._body = body
+        self._raw = raw
+        self._source: Message | None = None
+        self._body_start = 0
+        self._trailers = trailers
+    
+    @classmethod
+    def _lazy(
+        cls,
+        type: str,
+        description: str,
+        scope: str | None,
+        breaking: bool,
+        source: Message,
+        body_start: int,
+        trailers: tuple[tuple[str, str], ...] | None = None,
+    ) -> "ParsedCommit":
+        """Create with body/raw decoded from source on first access."""
+        parsed = cls(type, description, scope, breaking, trailers=trailers)
+        parsed._body = parsed._raw = None
+        parsed._source = source
+        parsed._body_start = body_start
+        return parsed
+    
+    @property
+    def body(self) -> str | None:
+        """Message body (after the header), stripped; None if empty."""
+        if self._body is None and self._source is not None:
+            body = _decode(self._source[self._body_start:]).strip()
+            self._body = body or ""
+        return self._body or None
+    
+    @property
+    def raw(self) -> str:
+        """Full message, stripped."""
+        if self._raw is None:
+            self._raw = _decode(self._source).strip()
+        return self._raw
+    
+    @property
+    def trailers(self) -> tuple[tuple[str, str], ...]:
+        """Trailers as (key, value) pairs, in message order."""
+        if self._trailers is None:
+            self._trailers = parse_trailers(self.body or "")
+        return self._trailers
+    
+    def trailer(self, key: str) -> list[str]:
+        """
+        Get all values of a trailer.
+        
+        Args:
+            key: Trailer key, case-insensitive (e.g. 'co-authored-by')
+            
+        Returns:
+            Values in message order; empty if the trailer is absent
+        """
+        key = key.lower()
+        return [value for k, value in self.trailers if k.lower() == key]
+    
+    def _key(self) -> tuple:
+        return (self.type, self.description, self.scope, self.breaking, self.body, self.raw)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ParsedCommit):
+            return NotImplemented
+        return self._key() == other._key()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (
+            f"ParsedCommit(type={self.type!r}, description={self.description!r}, "
+            f"scope={self.scope!r}, breaking={self.breaking!r})"
+        )
 
 
 # Regex patterns
 MAIN_PATTERN = re.compile(
-    r'^(?P<type>feat|fix|perf|refactor|docs|test|style|chore|build|ci|revert)'
+    rf'^(?P<type>{"|".join(COMMIT_TYPES)})'
     r'(\((?P<scope>[\w\-]+)\))?'
     r'(?P<breaking>!)?:\s*'
     r'(?P<description>.+)$'
 )
 
-BREAKING_PATTERN = re.compile(
-    r'^(?:BREAKING\s+CHANGE|BREAKING):\s*(?P<description>.+)$',
-    re.MULTILINE
+# Subjects git and hosting services generate for merge commits
+MERGE_SUBJECT_PATTERN = re.compile(
+    r"^(Merge (pull request|branch|branches|remote-tracking branch|tag)\b|Merged in )"
 )
 
+# Breaking-change footer ("BREAKING CHANGE:", "BREAKING-CHANGE:" or
+# "BREAKING:" at a line start), matched in place on str or UTF-8 bytes.
+# The description must start with a non-space so unstripped trailing
+# whitespace matches like the stripped body did.
+_BREAKING_FOOTER = r'BREAKING(?:\s+CHANGE|-CHANGE)?:\s*\S'
+_BREAKING_AT = {
+    str: re.compile(_BREAKING_FOOTER),
+    bytes: re.compile(_BREAKING_FOOTER.encode()),
+}
+# Literal prefix: found with a fast substring scan
+_BREAKING_WORD = {str: re.compile('BREAKING'), bytes: re.compile(b'BREAKING')}
+_NEWLINE = {str: '\n', bytes: 10}
 
-def parse_commit(message: str) -> ParsedCommit | None:
+# Leading whitespace, then the header line
+_HEADER = {str: re.compile(r'\s*([^\n]*)'), bytes: re.compile(rb'\s*([^\n]*)')}
+_NON_SPACE = {str: re.compile(r'\S'), bytes: re.compile(rb'\S')}
+
+# Trailer line by git's rules: a token of letters, digits and '-',
+# optional blanks, then the separator
+TRAILER_PATTERN = re.compile(r'^([A-Za-z0-9-]+)[ \t]*:\s*(.*)$')
+# Lines git writes itself; they mark a block as trailers like a
+# configured key does
+GIT_TRAILER_PREFIXES = ("Signed-off-by: ", "(cherry picked from commit ")
+BREAKING_TRAILER_KEYS = {"breaking change", "breaking-change"}
+# Trailer keys registered with git for the log run (git_log.TRAILER_CONFIG).
+# git accepts a trailer block that also holds non-trailer lines (a
+# "BREAKING CHANGE:" footer) only if it contains a configured or
+# git-generated trailer.
+TRAILER_KEYS = ("Co-authored-by", "Reviewed-by", "Refs", "BREAKING-CHANGE")
+_CONFIGURED_KEYS = {key.lower() for key in TRAILER_KEYS}
+
+
+def parse_commit(
+    message: Message,
+    trailers: tuple[tuple[str, str], ...] | None = None,
+) -> ParsedCommit | None:
     """
     Parse a commit message in Conventional Commits format.
     
     Non-conventional commits are also parsed with type='non-conventional'.
     WIP commits and empty messages return None (intentionally skipped).
     
+    Only the header is decoded. The body is scanned in place for a
+    BREAKING CHANGE footer and decoded only if ParsedCommit.body or
+    .raw is read, so multi-megabyte bodies are neither decoded nor
+    copied. A breaking trailer among the given trailers settles
+    breaking without the scan.
+    
     Args:
-        message: Raw commit message (full with body)
+        message: Raw commit message (full with body), str or UTF-8
+                 bytes/bytearray/memoryview
+        trailers: Trailers already split by git (LogRecord.trailers).
+                  None: parsed from the body on first access
         
     Returns:
         ParsedCommit or None if WIP or empty
@@ -60,7 +208,7 @@ def parse_commit(message: str) -> ParsedCommit | None:
         >>> parse_commit("feat(api): add auth")
         ParsedCommit(type='feat', scope='api', description='add auth', breaking=False)
         
-        >>> parse_commit("feat!: remove API")
+        >>> parse_commit(b"feat!: remove API")
         ParsedCommit(type='feat', scope=None, description='remove API', breaking=True)
         
         >>> parse_commit("fixed stuff")
@@ -69,58 +217,199 @@ def parse_commit(message: str) -> ParsedCommit | None:
         >>> parse_commit("WIP: working on it")
         None
     """
-    if _is_wip(message):
-        return None
+    kind = str if isinstance(message, str) else bytes
     
-    # Split header and body
-    lines = message.strip().split('\n', 1)
-    header = lines[0].strip()
-    body = lines[1].strip() if len(lines) > 1 else ""
+    # Header: first non-blank line; the body starts after it
+    match = _HEADER[kind].match(message)
+    header = _decode(match.group(1)).strip()
+    body_start = match.end()
     
-    # Empty message
-    if not header:
+    # Empty message or WIP
+    if not header or _is_wip(header):
         return None
     
     # Apply Conventional Commits regex
     match = MAIN_PATTERN.match(header)
     if match:
         # Conventional commit
-        breaking = match.group('breaking') == '!' or _extract_breaking_change(body)
+        breaking = (
+            match.group('breaking') == '!'
+            or (trailers is not None and _has_breaking_trailer(trailers))
+            or _has_breaking_footer(message, body_start)
+        )
         
-        return ParsedCommit(
+        return ParsedCommit._lazy(
             type=match.group('type'),
             description=match.group('description'),
             scope=match.group('scope'),
             breaking=breaking,
-            body=body if body else None,
-            raw=message.strip()
+            source=message,
+            body_start=body_start,
+            trailers=trailers,
         )
     
     # Non-conventional commit
-    return ParsedCommit(
+    return ParsedCommit._lazy(
         type=NON_CONVENTIONAL_TYPE,
         description=header,
         scope=None,
         breaking=False,
-        body=body if body else None,
-        raw=message.strip()
+        source=message,
+        body_start=body_start,
+        trailers=trailers,
     )
 
 
-def _is_wip(message: str) -> bool:
+def parse_trailers(body: str) -> tuple[tuple[str, str], ...]:
+    """
+    Parse trailers from the last paragraph of a message body.
+    
+    Used when git did not split them (object store, GitPython, commit
+    index), so it follows git's rules for TRAILER_KEYS:
+    the paragraph is a trailer block if it holds only trailers, or if a
+    quarter of its lines are trailers and one of them is a configured
+    or git-generated key. Indented lines continue the previous trailer.
+    Other lines of the block are kept only in "Key words: value" form
+    (e.g. a "BREAKING CHANGE:" footer), like git_log.parse_trailers.
+    
+    Args:
+        body: Message body without the header
+        
+    Returns:
+        Tuple of (key, value), in message order
+        
+    Example:
+        >>> parse_trailers("Details.\n\nRefs: #12\nCo-authored-by: A <a@x>")
+        (('Refs', '#12'), ('Co-authored-by', 'A <a@x>'))
+    """
+    lines = body.strip().splitlines()
+    start = len(lines)
+    trailer_lines = other_lines = continuations = 0
+    recognized = False
+    for i in range(len(lines) - 1, -1, -1):
+        line = lines[i]
+        if not line.strip():
+            break
+        start = i
+        match = TRAILER_PATTERN.match(line)
+        if line.startswith(GIT_TRAILER_PREFIXES):
+            trailer_lines += 1
+            continuations = 0
+            recognized = True
+        elif match:
+            trailer_lines += 1
+            continuations = 0
+            recognized = recognized or match.group(1).lower() in _CONFIGURED_KEYS
+        elif line[:1].isspace():
+            continuations += 1
+        else:
+            other_lines += 1 + continuations
+            continuations = 0
+    other_lines += continuations
+    if not (trailer_lines and not other_lines) and not (
+        recognized and trailer_lines * 3 >= other_lines
+    ):
+        return ()
+    
+    trailers: list[tuple[str, str]] = []
+    continues = False
+    for line in lines[start:]:
+        if line[:1].isspace() and continues:
+            key, value = trailers[-1]
+            trailers[-1] = (key, f"{value} {line.strip()}".strip())
+            continue
+        match = TRAILER_PATTERN.match(line)
+        if match:
+            trailers.append((match.group(1), match.group(2).strip()))
+        else:
+            key, sep, value = line.partition(":")
+            if sep:
+                trailers.append((key.strip(), value.strip()))
+        continues = match is not None
+    return tuple(trailers)
+
+
+def is_merge_subject(message: Message) -> bool:
+    """Check if the header is a generated merge subject ('Merge pull request #1 ...')."""
+    kind = str if isinstance(message, str) else bytes
+    header = _decode(_HEADER[kind].match(message).group(1))
+    return bool(MERGE_SUBJECT_PATTERN.match(header))
+
+
+def parse_merge_unit(message: Message, side_message: Message | None = None) -> ParsedCommit | None:
+    """
+    Parse a merge commit as one changelog unit.
+    
+    A custom merge message ('feat: add login (#12)') is parsed as is.
+    For generated subjects, the first candidate that is a conventional
+    commit wins: the merge body (GitHub and GitLab put the PR title
+    there), then the message of the merged branch tip. Otherwise the
+    first candidate is used as a non-conventional commit.
+    
+    Args:
+        message: Merge commit message
+        side_message: Message of the merged branch tip (second parent)
+        
+    Returns:
+        ParsedCommit or None if the chosen message is WIP or empty
+        
+    Example:
+        >>> parse_merge_unit("Merge pull request #7 from a/b\n\nfix: crash")
+        ParsedCommit(type='fix', description='crash', ...)
+    """
+    if not is_merge_subject(message):
+        return parse_commit(message)
+    
+    # Merge messages are short: decode them whole
+    message = _decode(message)
+    if side_message is not None:
+        side_message = _decode(side_message)
+    body = message.strip().split('\n', 1)[1].strip() if '\n' in message.strip() else ""
+    candidates = [c for c in (body, side_message) if c and c.strip()]
+    for candidate in candidates:
+        parsed = parse_commit(candidate)
+        if parsed is not None and parsed.type != NON_CONVENTIONAL_TYPE:
+            return parsed
+    return parse_commit(candidates[0] if candidates else message)
+
+
+def _is_wip(header: str) -> bool:
     """
     Check if message is WIP.
     
     Only checks the beginning of the header, not the entire message.
     This prevents false positives like "feat: add WIP tracking" being treated as WIP.
     """
-    header = message.split('\n')[0].strip().lower()
+    header = header.lower()
     return any(
         header.startswith(pattern.lower())
         for pattern in ["WIP:", "wip:", "draft:", "do not merge"]
     )
 
 
-def _extract_breaking_change(body: str) -> bool:
-    """Extract BREAKING CHANGE from body."""
-    return bool(BREAKING_PATTERN.search(body))
+def _has_breaking_footer(message: Message, body_start: int) -> bool:
+    """Search the body for a BREAKING CHANGE footer without decoding it."""
+    kind = str if isinstance(message, str) else bytes
+    # Skip blank lines/indentation after the header, as body.strip() did
+    first = _NON_SPACE[kind].search(message, body_start)
+    if first is None:
+        return False
+    newline = _NEWLINE[kind]
+    for match in _BREAKING_WORD[kind].finditer(message, first.start()):
+        pos = match.start()
+        # Footers start a line (or the stripped body)
+        if (pos == first.start() or message[pos - 1] == newline) and _BREAKING_AT[kind].match(message, pos):
+            return True
+    return False
+
+
+def _has_breaking_trailer(trailers: tuple[tuple[str, str], ...]) -> bool:
+    """Check for a non-empty BREAKING CHANGE / BREAKING-CHANGE trailer."""
+    return any(key.lower() in BREAKING_TRAILER_KEYS and value for key, value in trailers)
+
+
+def _decode(text: Message) -> str:
+    """Decode UTF-8 bytes (invalid sequences replaced); str passes through."""
+    if isinstance(text, str):
+        return text
+    return str(text, "utf-8", errors="replace")
@@ -0,0 +1,143 @@
+"""Patch-id based detection of cherry-picked commits.
+
+A cherry-pick has a new SHA but the same diff as the original commit.
+``git patch-id --stable`` hashes a diff while ignoring line numbers and
+whitespace, so equal patch-ids mark the same change. Patch-ids of a
+whole range are computed in one ``git log -p | git patch-id`` pipeline
+and cached by commit SHA (a commit's diff never changes).
+"""
+
+import os
+import subprocess
+from collections import Counter
+from typing import Iterable, Iterator
+
+from git import Repo
+
+from .analysis_cache import get_analysis_cache
+from .cancellation import check_cancelled, track_process
+
+
+def compute_patch_ids(repo: Repo, shas: Iterable[str]) -> dict[str, str]:
+    """
+    Compute patch-ids in one streaming pass.
+
+    ``git log -p`` writes the diffs of all requested commits straight
+    into ``git patch-id --stable`` through an OS pipe; only the
+    resulting (patch-id, sha) lines are read back.
+
+    Args:
+        repo: git.Repo instance
+        shas: Commit SHAs
+
+    Returns:
+        Dict sha -> patch-id. Commits without a diff (merges, empty
+        commits) are absent.
+
+    Raises:
+        GitCommandError: If git fails (e.g. unknown commit)
+        OperationCancelled: If the tool call is cancelled; git is killed
+    """
+    shas = list(shas)
+    if not shas:
+        # Without revisions git log would default to HEAD
+        return {}
+    log = repo.git.log(
+        "-p", "--no-walk=unsorted", "--stdin", "--format=commit %H",
+        "--no-color", "--no-ext-diff",
+        as_process=True, istream=subprocess.PIPE,
+    )
+    patch_id = repo.git.patch_id("--stable", as_process=True, istream=log.stdout)
+    # patch-id owns the read end now
+    log.stdout.close()
+
+    # git log reads all of stdin before writing, so this cannot deadlock
+    for sha in shas:
+        log.stdin.write(sha.encode("ascii") + b"\n")
+    log.stdin.close()
+
+    result = {}
+    with track_process(log.proc), track_process(patch_id.proc):
+        for line in patch_id.stdout:
+            check_cancelled()
+            pid, _, sha = line.decode("ascii").strip().partition(" ")
+            if sha:
+                result[sha] = pid
+    # Killed on cancellation: stop before git's exit status is read
+    check_cancelled()
+    patch_id.wait()
+    log.wait()
+    return result
+
+
+def get_patch_ids(repo: Repo, shas: Iterable[str], use_cache: bool = True) -> dict[str, str]:
+    """
+    Get patch-ids of commits, computing only uncached ones.
+
+    Args:
+        repo: git.Repo instance
+        shas: Commit SHAs
+        use_cache: Use the in-process analysis cache. Default: True
+
+    Returns:
+        Dict sha -> patch-id for the requested commits that have a diff
+    """
+    shas = list(dict.fromkeys(shas))
+    cache = get_analysis_cache() if use_cache else None
+    key = ("patch_ids", os.path.abspath(repo.common_dir))
+    known: dict[str, str | None] = (cache.get(key) if cache is not None else None) or {}
+
+    missing = [sha for sha in shas if sha not in known]
+    if missing:
+        computed = compute_patch_ids(repo, missing)
+        # Remember commits without a diff too, so they are not re-diffed
+        known = {**known, **{sha: computed.get(sha) for sha in missing}}
+        if cache is not None:
+            cache.put(key, known)
+
+    return {sha: known[sha] for sha in shas if known.get(sha) is not None}
+
+
+class DuplicateFilter:
+    """
+    Drop all but the last-seen commit of every patch-id.
+
+    Changelogs are produced newest release first, so the commit that
+    survives is the one in the oldest release that shipped the change.
+    """
+
+    def __init__(self, patch_ids: dict[str, str], shas: Iterable[str] | None = None):
+        """
+        Initialize filter.
+
+        Args:
+            patch_ids: sha -> patch-id
+            shas: Commits that will be passed through. Default: every
+                  commit in patch_ids
+        """
+        self.patch_ids = patch_ids
+        if shas is None:
+            shas = patch_ids
+        self._remaining = Counter(patch_ids[sha] for sha in shas if sha in patch_ids)
+
+    def keep(self, sha: str) -> bool:
+        """
+        Decide whether a commit is shown.
+
+        Args:
+            sha: Commit SHA
+
+        Returns:
+            False if a commit with the same patch comes later
+        """
+        pid = self.patch_ids.get(sha)
+        if pid is None or self._remaining[pid] <= 0:
+            return True
+        self._remaining[pid] -= 1
+        return self._remaining[pid] == 0
+
+    def filter(self, commits: Iterable) -> Iterator:
+        """Yield the commits (anything with .hash) that are kept."""
+        for commit in commits:
+            if self.keep(commit.hash):
+                yield commit
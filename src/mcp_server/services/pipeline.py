@@ -0,0 +1,502 @@
+"""Streaming changelog pipeline.
+
+Commits flow from ``git log`` through parse_commit and version grouping
+into template rendering as generators, so memory stays bounded by the
+largest single release instead of growing with the whole history.
+
+Each release is read with its own walk, newest release first. A commit
+belongs to the first release whose tag reaches it, as in ancestry-based
+grouping: a release walks its tag minus every older release tag, so a
+maintenance tag on a side branch keeps its commits whether or not the
+branch was merged back.
+"""
+
+import os
+from dataclasses import dataclass, replace
+from typing import IO, Callable, Iterable, Iterator, Sequence
+
+from git import GitCommandError, Repo
+
+from ..models.changelog import ChangelogVersion
+from .analyzer import (
+    EnrichedCommit,
+    InvalidRepoError,
+    get_tags,
+    iter_enriched_commits,
+)
+from .cancellation import check_cancelled
+from .commit_filter import CommitFilter, limit
+from .diff_stats import get_range_stats
+from .patch_ids import DuplicateFilter, get_patch_ids
+from .repo_pool import pooled_repo
+from .spill import SpillBudget
+from .tag_filter import TagFilter
+from .template_service import TemplateService
+from .versioning import order_tags, select_version_range
+
+
+OUTPUT_DIR_ENV = "CHANGELOG_OUTPUT_DIR"
+
+
+@dataclass
+class PipelineProgress:
+    """Counters updated while a changelog is generated."""
+    commits: int = 0          # Commits walked (WIP excluded)
+    versions: int = 0         # Release ranges grouped
+    bytes: int = 0            # UTF-8 bytes rendered
+    total_versions: int = 0   # Release ranges to group
+    spills: int = 0           # Chunks written to disk under a memory budget
+    done: bool = False        # Rendering finished
+
+    def describe(self) -> str:
+        """Human-readable progress message."""
+        return (
+            f"{self.commits} commits walked, "
+            f"{self.versions}/{self.total_versions} versions grouped, "
+            f"{self.bytes} bytes rendered"
+        )
+
+
+ProgressCallback = Callable[[PipelineProgress], None]
+PartialCallback = Callable[[str], None]
+
+
+def resolve_output_path(path: str) -> str:
+    """
+    Resolve a changelog output file inside the configured output directory.
+
+    Clients of the server may only write below CHANGELOG_OUTPUT_DIR;
+    paths that leave it (absolute, '..', symlinks) are rejected.
+
+    Args:
+        path: File path, relative to the output directory
+
+    Returns:
+        Absolute path of the file
+
+    Raises:
+        ValueError: If no output directory is configured or path leaves it
+    """
+    root = os.getenv(OUTPUT_DIR_ENV)
+    if not root:
+        raise ValueError(f"output_path is disabled: set {OUTPUT_DIR_ENV} to allow it")
+    root = os.path.realpath(root)
+    target = os.path.realpath(os.path.join(root, path))
+    if target == root or os.path.commonpath([root, target]) != root:
+        raise ValueError(f"output_path must be a file inside {OUTPUT_DIR_ENV}, got '{path}'")
+    return target
+
+
+def iter_release_ranges(
+    tags: list[dict],
+    from_ref: str | None = None,
+    include_unreleased: bool = True,
+) -> Iterator[tuple[str, str | None, str]]:
+    """
+    Tag-to-tag range of every release, newest first.
+
+    These are the boundaries diff stats compare; commits are read with
+    iter_release_walks.
+
+    Args:
+        tags: Release tags to emit (from get_tags or select_version_range)
+        from_ref: Exclusive start of the oldest release. Default: root
+        include_unreleased: Emit 'newest tag..HEAD' as Unreleased
+
+    Yields:
+        (version name, date or None, revision range)
+    """
+    ordered = order_tags(tags)
+
+    if include_unreleased:
+        if ordered:
+            yield "Unreleased", None, f"{ordered[-1]['hash']}..HEAD"
+        else:
+            yield "Unreleased", None, f"{from_ref}..HEAD" if from_ref else "HEAD"
+
+    for i in range(len(ordered) - 1, -1, -1):
+        tag = ordered[i]
+        date = tag['date'].strftime('%Y-%m-%d')
+        if i > 0:
+            start = ordered[i - 1]['hash']
+        else:
+            start = from_ref
+        rev_range = f"{start}..{tag['hash']}" if start else tag['hash']
+        yield tag['name'], date, rev_range
+
+
+def iter_release_walks(
+    repo: Repo,
+    tags: list[dict],
+    from_ref: str | None = None,
+    to_ref: str | None = None,
+    include_unreleased: bool = True,
+    first_parent: bool = False,
+) -> Iterator[tuple[str, str | None, list[str]]]:
+    """
+    Revisions to walk for every release, newest first.
+
+    Matches template_service._label_commits_by_ancestry over the history
+    from_ref..to_ref: every release excludes the older release tags, and
+    tags outside that history (e.g. on an unmerged maintenance branch,
+    or off the mainline with first_parent) are left out, like the
+    in-memory path does.
+
+    Only the older releases no other older release contains are
+    excluded: the previous tag on a linear history, plus the tags of
+    maintenance branches not merged back yet. Each walk stays a few
+    revisions long however many releases there are.
+
+    Args:
+        repo: git.Repo instance
+        tags: Release tags to emit (from get_tags or select_version_range)
+        from_ref: Exclusive start of the history. Default: root
+        to_ref: End of the history. Default: HEAD
+        include_unreleased: Emit commits no release reaches as Unreleased
+        first_parent: Only tags on the mainline
+
+    Yields:
+        (version name, date or None, git log revision arguments)
+
+    Raises:
+        InvalidRepoError: If from_ref or to_ref does not resolve
+    """
+    top = to_ref or "HEAD"
+    exclude = [f"^{from_ref}"] if from_ref else []
+    ordered = order_tags(tags)
+    graph = _tag_graph(repo, ordered, [top, *exclude], first_parent)
+
+    # Tagged commits that contain every older release: each is reached
+    # by no other one, so they are exactly what a newer release excludes
+    heads: list[str] = []
+    covered: set[str] = set()  # Commits of the graph the older releases reach
+    walks = []
+    for tag in ordered:
+        sha = tag['hash']
+        if sha not in graph:
+            continue
+        walks.append((tag, [f"^{head}" for head in heads]))
+        if sha in covered:
+            # Contained in an older release: adds nothing
+            continue
+        # Commits already covered are reached from a head, so the walk
+        # stops there; the heads it meets are contained in this release
+        covered.add(sha)
+        stack = list(graph[sha])
+        while stack:
+            parent = stack.pop()
+            if parent in covered:
+                if parent in heads:
+                    heads.remove(parent)
+                continue
+            covered.add(parent)
+            stack.extend(graph.get(parent, ()))
+        heads.append(sha)
+
+    if include_unreleased:
+        yield "Unreleased", None, [top, *exclude, *(f"^{head}" for head in heads)]
+
+    for tag, older in reversed(walks):
+        date = tag['date'].strftime('%Y-%m-%d')
+        yield tag['name'], date, [tag['hash'], *exclude, *older]
+
+
+def get_release_commits(
+    repo: Repo,
+    tags: list[dict],
+    version: str,
+    first_parent: bool = False,
+    commit_filter: CommitFilter | None = None,
+    paths: Sequence[str] = (),
+) -> list[EnrichedCommit]:
+    """
+    Read the commits of one release, grouped as in the changelog.
+
+    The release walks its tag minus the older releases in the history
+    of HEAD (see iter_release_walks), so a fix shipped in a maintenance
+    release merged back later is not repeated in the next release.
+    A release outside that history excludes the older releases it
+    contains.
+
+    Args:
+        repo: git.Repo instance
+        tags: Release tags (from get_tags)
+        version: Tag name, or 'Unreleased' for commits after every release
+        first_parent: Walk only the mainline, one unit per merge
+        commit_filter: Only matching commits (see commit_filter)
+        paths: Only commits touching these paths
+
+    Returns:
+        List of EnrichedCommit, newest first
+
+    Raises:
+        InvalidRepoError: If the history cannot be walked
+        ValueError: If version is not one of tags
+    """
+    revs = None
+    for name, _, walk in iter_release_walks(repo, tags, first_parent=first_parent):
+        if name == version:
+            revs = walk
+            break
+    if revs is None:
+        ordered = order_tags(tags)
+        position = [t['name'] for t in ordered].index(version)
+        _, _, revs = next(iter_release_walks(
+            repo, ordered[:position + 1], to_ref=ordered[position]['hash'],
+            include_unreleased=False, first_parent=first_parent,
+        ))
+    commits = list(iter_enriched_commits(
+        repo, revs, include_stats=False, paths=paths, first_parent=first_parent,
+        commit_filter=commit_filter,
+    ))
+    # Same order as analyzer.get_commits_between
+    commits.sort(key=lambda c: c.date, reverse=True)
+    return commits
+
+
+def _tag_graph(
+    repo: Repo,
+    tags: list[dict],
+    revs: list[str],
+    first_parent: bool = False,
+) -> dict[str, tuple[str, ...]]:
+    """
+    Ancestry between the release tags reachable from revs.
+
+    git keeps only the tagged commits (and merges joining tagged lines)
+    and rewrites parents to the nearest kept ancestors, so the graph has
+    about one node per tag however long the history is. Only the given
+    tags decorate commits.
+
+    Returns:
+        sha -> parent shas of the kept commits
+
+    Raises:
+        InvalidRepoError: If a revision does not resolve
+    """
+    if not tags:
+        return {}
+    args = [
+        "--simplify-by-decoration", "--full-history", "--simplify-merges",
+        "--parents", "--format=%H %P",
+        *(f"--decorate-refs=refs/tags/{t['name']}" for t in tags),
+    ]
+    if first_parent:
+        args.append("--first-parent")
+    try:
+        output = repo.git.log(*args, "--end-of-options", *revs, "--")
+    except GitCommandError as e:
+        raise InvalidRepoError(f"Invalid ref: {' '.join(revs)}") from e
+    graph = {}
+    for line in output.splitlines():
+        sha, *parents = line.split()
+        graph[sha] = tuple(parents)
+    return graph
+
+
+def iter_changelog_versions(
+    repo: Repo,
+    from_version: str | None = None,
+    to_version: str | None = None,
+    include_unreleased: bool = True,
+    progress: PipelineProgress | None = None,
+    dedupe: bool = False,
+    first_parent: bool = False,
+    tag_filter: TagFilter | None = None,
+    diff_stats: bool = False,
+    commit_filter: CommitFilter | None = None,
+    memory_budget: int | None = None,
+    paths: Sequence[str] = (),
+) -> Iterator[ChangelogVersion]:
+    """
+    Stream changelog versions, newest first.
+
+    Only one release is held in memory at a time; releases without
+    commits are skipped.
+
+    Args:
+        repo: git.Repo instance
+        from_version: Lowest version to include. Default: None (all)
+        to_version: Highest version to include. Default: None (up to HEAD)
+        include_unreleased: Include commits after the newest release
+        progress: Counters to update (commits, versions, total_versions)
+        dedupe: Show cherry-picked duplicates once, in the oldest
+                release. A header-only pass collects the commits that
+                will be shown; their patch-ids are computed in one go.
+        first_parent: Walk only the mainline, one unit per merge
+        tag_filter: Release tags that bound versions (see get_tags)
+        diff_stats: Set version.stats from one diff per release
+        commit_filter: Only matching commits (see commit_filter);
+                       max_commits counts across all releases
+        memory_budget: Bytes each release may hold in memory; beyond
+                       that its commits are sorted and grouped on disk
+                       (see spill). Default: None (no limit)
+        paths: Only commits touching these paths
+
+    Yields:
+        ChangelogVersion
+
+    Raises:
+        InvalidRepoError: If a range cannot be walked
+    """
+    ts = TemplateService()
+    tags = get_tags(repo, tag_filter=tag_filter)
+    from_ref, to_ref, selected = select_version_range(tags, from_version, to_version)
+    if to_version is not None:
+        # Unreleased changes are never included with an upper bound
+        include_unreleased = False
+
+    if progress is None:
+        progress = PipelineProgress()
+    walks = list(iter_release_walks(
+        repo, selected, from_ref, to_ref, include_unreleased, first_parent
+    ))
+    progress.total_versions = len(walks)
+    # Diff stats stay tag-to-tag, like the in-memory path
+    boundaries = {
+        name: rev_range
+        for name, _, rev_range in iter_release_ranges(selected, from_ref, include_unreleased)
+    }
+
+    # The commit limit spans releases: newest commits first. Like the
+    # in-memory path, it counts commits before duplicates are dropped.
+    max_commits = commit_filter.max_commits if commit_filter is not None else None
+    if commit_filter is not None:
+        commit_filter = replace(commit_filter, max_commits=None)
+
+    def iter_walks(
+        counter: PipelineProgress,
+    ) -> Iterator[tuple[str, str | None, Iterator[EnrichedCommit]]]:
+        remaining = max_commits
+        for name, date, revs in walks:
+            if remaining == 0:
+                return
+            check_cancelled()
+            commits = iter_enriched_commits(
+                repo, revs, include_stats=False, paths=paths, first_parent=first_parent,
+                commit_filter=commit_filter,
+            )
+            if remaining is not None:
+                commits = limit(commits, remaining)
+            walked = counter.commits
+            yield name, date, _counted(commits, counter)
+            if remaining is not None:
+                remaining -= counter.commits - walked
+
+    duplicates = None
+    if dedupe and walks:
+        # Headers first: a copy that the filters or the limit leave out
+        # must not hide a newer one, so only shown commits are counted
+        shas = [
+            commit.hash
+            for _, _, commits in iter_walks(PipelineProgress())
+            for commit in commits
+        ]
+        try:
+            duplicates = DuplicateFilter(get_patch_ids(repo, shas), shas)
+        except GitCommandError as e:
+            raise InvalidRepoError(f"Cannot compute patch-ids: {e}") from e
+
+    for name, date, commits in iter_walks(progress):
+        if duplicates is not None:
+            commits = duplicates.filter(commits)
+        budget = SpillBudget(memory_budget) if memory_budget is not None else None
+        version = ts.create_version(commits, name, date, budget)
+        progress.versions += 1
+        if budget is not None:
+            progress.spills += budget.spills
+        if version.commits:
+            if diff_stats:
+                version.stats = get_range_stats(repo, boundaries[name])
+            yield version
+
+
+def _counted(
+    commits: Iterable[EnrichedCommit],
+    progress: PipelineProgress,
+) -> Iterator[EnrichedCommit]:
+    """Pass commits through, counting them."""
+    for commit in commits:
+        progress.commits += 1
+        yield commit
+
+
+def stream_changelog(
+    repo_path: str,
+    output: IO[str],
+    output_format: str = "changelog.md.j2",
+    from_version: str | None = None,
+    to_version: str | None = None,
+    include_unreleased: bool = True,
+    on_progress: ProgressCallback | None = None,
+    on_partial: PartialCallback | None = None,
+    dedupe: bool = False,
+    first_parent: bool = False,
+    tag_filter: TagFilter | None = None,
+    diff_stats: bool = False,
+    commit_filter: CommitFilter | None = None,
+    memory_budget: int | None = None,
+    paths: Sequence[str] = (),
+) -> int:
+    """
+    Render a changelog straight into a text stream.
+
+    Callbacks fire each time rendering moves on to the next release
+    and once at the end. Templates that look one release ahead
+    (loop.last) deliver a release's text one step later.
+
+    Args:
+        repo_path: Path to git repository
+        output: Writable text stream (file, socket, sys.stdout)
+        output_format: Template file name
+        from_version: Lowest version to include
+        to_version: Highest version to include
+        include_unreleased: Include unreleased changes
+        on_progress: Called with current PipelineProgress
+        on_partial: Called with the text rendered since the last call
+        dedupe: Show cherry-picked duplicates once
+        first_parent: Walk only the mainline, one unit per merge
+        tag_filter: Release tags that bound versions (see get_tags)
+        diff_stats: Set version.stats from one diff per release
+        commit_filter: Only matching commits (see commit_filter)
+        memory_budget: Bytes each release may hold before spilling to
+                       disk (see spill)
+        paths: Only commits touching these paths
+
+    Returns:
+        Number of characters written
+
+    Raises:
+        InvalidRepoError: If path is not a valid repo or a range is invalid
+    """
+    progress = PipelineProgress()
+    pending: list[str] = []
+
+    def flush() -> None:
+        if on_partial is not None and pending:
+            text = "".join(pending)
+            pending.clear()
+            on_partial(text)
+        if on_progress is not None:
+            on_progress(progress)
+
+    def versions_with_flush() -> Iterator[ChangelogVersion]:
+        for version in iter_changelog_versions(
+            repo, from_version, to_version, include_unreleased, progress,
+            dedupe, first_parent, tag_filter, diff_stats, commit_filter,
+            memory_budget, paths,
+        ):
+            # Everything before this release has been rendered
+            flush()
+            yield version
+
+    with pooled_repo(repo_path) as repo:
+        written = 0
+        for chunk in TemplateService().stream_changelog(versions_with_flush(), output_format):
+            written += output.write(chunk)
+            progress.bytes += len(chunk.encode("utf-8"))
+            if on_partial is not None:
+                pending.append(chunk)
+        progress.done = True
+        flush()
+        return written
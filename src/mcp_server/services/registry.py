@@ -0,0 +1,296 @@
+"""Registry of named bare mirrors.
+
+A changelog server hosting many repositories keeps each one as a bare
+mirror (no working tree to check out or stat) and lets clients refer
+to it by name. The registry maps names to mirror paths, refreshes each
+mirror incrementally from its upstream with ``git fetch`` and keeps
+warm handles for registered mirrors in the repository pool.
+
+Registry file (path in REPO_REGISTRY), JSON:
+
+    {
+        "backend": {"mirror": "/srv/mirrors/backend.git",
+                    "upstream": "/src/backend"},
+        "frontend": "/srv/mirrors/frontend.git"
+    }
+
+A mirror without upstream is served as is.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from git import GitCommandError, Repo
+
+from .analyzer import InvalidRepoError, is_bare_repo
+from .cat_file import get_cat_file
+from .repo_pool import RepoPool, get_repo_pool
+
+
+REGISTRY_ENV = "REPO_REGISTRY"
+REFRESH_INTERVAL_ENV = "REPO_REGISTRY_REFRESH_INTERVAL"
+
+# Refs copied from upstream; --prune drops the ones deleted there
+FETCH_REFSPECS = ("+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*")
+
+
+@dataclass
+class RegistryEntry:
+    """One registered mirror."""
+    name: str
+    mirror: str
+    upstream: str | None = None
+    refreshed: float | None = None  # time.time() of the last successful fetch
+    error: str | None = None        # Last refresh error
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def describe(self) -> dict:
+        """Get a JSON-serialisable summary."""
+        return {
+            "name": self.name,
+            "mirror": self.mirror,
+            "upstream": self.upstream,
+            "refreshed": self.refreshed,
+            "error": self.error,
+        }
+
+
+class RepoRegistry:
+    """Logical repository names mapped to bare mirrors."""
+
+    def __init__(self, entries: Iterable[RegistryEntry] = (), pool: RepoPool | None = None):
+        """
+        Initialize registry.
+
+        Args:
+            entries: Registered mirrors
+            pool: Pool that keeps mirror handles. Default: shared pool
+        """
+        self.entries = {e.name: e for e in entries}
+        self.pool = pool or get_repo_pool()
+        self._stop = threading.Event()
+        self._refresher: threading.Thread | None = None
+
+    @classmethod
+    def load(cls, path: str, pool: RepoPool | None = None) -> "RepoRegistry":
+        """
+        Load a registry file.
+
+        Args:
+            path: JSON file mapping names to a mirror path or to
+                  {"mirror": ..., "upstream": ...}
+            pool: Pool that keeps mirror handles. Default: shared pool
+
+        Returns:
+            RepoRegistry
+
+        Raises:
+            ValueError: If the file is not a valid registry
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Cannot read repository registry {path}: {e}") from e
+        if not isinstance(data, dict):
+            raise ValueError(f"Repository registry {path} must be a JSON object")
+
+        base = os.path.dirname(os.path.abspath(path))
+        entries = []
+        for name, spec in data.items():
+            if isinstance(spec, str):
+                spec = {"mirror": spec}
+            if not isinstance(spec, dict) or not spec.get("mirror"):
+                raise ValueError(f"Registry entry '{name}' needs a mirror path")
+            upstream = spec.get("upstream")
+            entries.append(RegistryEntry(
+                name=name,
+                # Relative paths are relative to the registry file
+                mirror=os.path.join(base, spec["mirror"]),
+                upstream=os.path.join(base, upstream) if upstream else None,
+            ))
+        return cls(entries, pool)
+
+    def resolve(self, name: str) -> str | None:
+        """
+        Get the mirror path of a registered name.
+
+        Args:
+            name: Repository name
+
+        Returns:
+            Mirror path, or None if the name is not registered
+        """
+        entry = self.entries.get(name)
+        return entry.mirror if entry is not None else None
+
+    def refresh(self, name: str) -> int:
+        """
+        Update a mirror from its upstream.
+
+        The mirror is created (``git init --bare``) on first refresh;
+        afterwards ``git fetch --prune`` transfers only new objects.
+        HEAD follows the upstream HEAD so Unreleased sections match.
+
+        Args:
+            name: Repository name
+
+        Returns:
+            Number of refs created, moved or deleted
+
+        Raises:
+            KeyError: If the name is not registered
+            InvalidRepoError: If the fetch fails
+        """
+        entry = self.entries[name]
+        if entry.upstream is None:
+            return 0
+
+        with entry.lock:
+            try:
+                if not is_bare_repo(entry.mirror):
+                    Repo.init(entry.mirror, bare=True).close()
+                with self.pool.checkout(entry.mirror) as repo:
+                    before = _ref_snapshot(repo)
+                    _fetch(repo, entry.upstream)
+                    after = _ref_snapshot(repo)
+            except (GitCommandError, OSError) as e:
+                entry.error = str(e)
+                raise InvalidRepoError(f"Cannot refresh {name} from {entry.upstream}: {e}") from e
+
+            entry.refreshed = time.time()
+            entry.error = None
+
+        changed = sum(before.get(ref) != sha for ref, sha in after.items())
+        return changed + len(before.keys() - after.keys())
+
+    def refresh_all(self, names: list[str] | None = None) -> dict[str, str]:
+        """
+        Refresh several mirrors.
+
+        Args:
+            names: Repository names. Default: all registered
+
+        Returns:
+            Dict name -> status message
+        """
+        results = {}
+        for name in self.entries if names is None else names:
+            if name not in self.entries:
+                results[name] = "Error: Unknown repository"
+                continue
+            try:
+                updated = self.refresh(name)
+            except InvalidRepoError as e:
+                results[name] = f"Error: {str(e)}"
+                continue
+            results[name] = f"{updated} refs updated" if updated else "up to date"
+        return results
+
+    def warm(self) -> int:
+        """
+        Open handles for every existing mirror and pin them in the pool.
+
+        Each handle also starts its ``git cat-file`` worker, so the first
+        tool call does not pay for process start-up.
+
+        Returns:
+            Number of mirrors warmed
+        """
+        warmed = 0
+        for entry in self.entries.values():
+            if not is_bare_repo(entry.mirror):
+                continue
+            self.pool.pin(entry.mirror)
+            with self.pool.checkout(entry.mirror) as repo:
+                get_cat_file(repo).resolve(["HEAD"])
+            warmed += 1
+        return warmed
+
+    def start_refresher(self, interval: float) -> None:
+        """
+        Refresh all mirrors in a background thread.
+
+        Args:
+            interval: Seconds between refresh rounds
+        """
+        if self._refresher is not None:
+            return
+
+        def run() -> None:
+            while not self._stop.wait(interval):
+                self.refresh_all()
+
+        self._refresher = threading.Thread(target=run, name="registry-refresh", daemon=True)
+        self._refresher.start()
+
+    def stop_refresher(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
+        self._stop.clear()
+
+    def describe(self) -> list[dict]:
+        """
+        Get summaries of all registered mirrors.
+
+        Returns:
+            List of {name, mirror, upstream, refreshed, error}
+        """
+        return [entry.describe() for entry in self.entries.values()]
+
+
+def _fetch(repo: Repo, upstream: str) -> None:
+    """Fetch branches and tags and point HEAD where upstream's HEAD points."""
+    head = repo.git.ls_remote("--symref", upstream, "HEAD")
+    symref = next(
+        (line.split()[1] for line in head.splitlines() if line.startswith("ref: ")),
+        None,
+    )
+    if symref is not None:
+        repo.git.fetch("--prune", "--no-tags", upstream, *FETCH_REFSPECS)
+        repo.git.symbolic_ref("HEAD", symref)
+    elif head:
+        # Detached upstream HEAD: fetch it too and detach the mirror
+        repo.git.fetch("--prune", "--no-tags", upstream, *FETCH_REFSPECS, "HEAD")
+        repo.git.update_ref("--no-deref", "HEAD", head.split()[0])
+    else:
+        # Empty upstream
+        repo.git.fetch("--prune", "--no-tags", upstream, *FETCH_REFSPECS)
+
+
+def _ref_snapshot(repo: Repo) -> dict[str, str]:
+    """Map every ref to the object it points to."""
+    output = repo.git.for_each_ref("--format=%(refname) %(objectname)")
+    return dict(line.split(" ", 1) for line in output.splitlines())
+
+
+_registry: RepoRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> RepoRegistry:
+    """
+    Get the process-wide registry.
+
+    Loaded on first use from the file named by REPO_REGISTRY; empty when
+    the variable is unset.
+
+    Returns:
+        Shared RepoRegistry instance
+
+    Raises:
+        ValueError: If the registry file is invalid
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            path = os.getenv(REGISTRY_ENV)
+            _registry = RepoRegistry.load(path) if path else RepoRegistry()
+        return _registry
@@ -0,0 +1,241 @@
+"""Pool of reusable ``git.Repo`` handles.
+
+Every ``git.Repo`` can own long-lived ``git cat-file`` processes and
+object caches. Opening one per tool call and never closing it leaks
+processes and file descriptors under sustained load. The pool hands out
+one handle per caller (GitPython handles are not thread-safe), keeps
+returned handles for reuse, closes handles idle for too long and never
+keeps more than a fixed number open. Handles of pinned paths (registry
+mirrors, see services.registry) survive the idle timeout and are
+evicted last.
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator
+
+from git import Repo
+
+
+MAX_HANDLES_ENV = "REPO_POOL_MAX_HANDLES"
+IDLE_TIMEOUT_ENV = "REPO_POOL_IDLE_TIMEOUT"
+DEFAULT_MAX_HANDLES = 16
+DEFAULT_IDLE_TIMEOUT = 300.0  # Seconds
+
+
+class RepoPool:
+    """Thread-safe pool of Repo handles keyed by normalised path."""
+
+    def __init__(
+        self,
+        max_handles: int = DEFAULT_MAX_HANDLES,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            max_handles: Maximum open handles, idle and checked out.
+                         Checkouts beyond it get a handle that is
+                         closed on return.
+            idle_timeout: Close handles unused for this many seconds
+        """
+        self.max_handles = max_handles
+        self.idle_timeout = idle_timeout
+        # id(repo) -> (path, repo, returned at), least recently used first
+        self._idle: OrderedDict[int, tuple[str, Repo, float]] = OrderedDict()
+        self._checked_out = 0
+        self._pinned: set[str] = set()
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+        self.closed = 0
+
+    @contextmanager
+    def checkout(self, repo_path: str) -> Iterator[Repo]:
+        """
+        Borrow a handle for the calling thread.
+
+        Args:
+            repo_path: Path to git repository
+
+        Yields:
+            git.Repo, owned by the caller until the block exits
+
+        Raises:
+            InvalidRepoError: If path is invalid or not a git repository
+        """
+        from .analyzer import get_repo
+
+        path = os.path.abspath(os.path.normpath(repo_path))
+        with self._lock:
+            self._prune_locked(time.monotonic())
+            repo = self._take_locked(path)
+            self._checked_out += 1
+
+        if repo is not None and not os.path.isdir(repo.git_dir):
+            # Repository removed or moved since the handle was pooled
+            self._close(repo)
+            repo = None
+        if repo is None:
+            try:
+                repo = get_repo(path)
+            except BaseException:
+                with self._lock:
+                    self._checked_out -= 1
+                raise
+            with self._lock:
+                self.opened += 1
+        else:
+            with self._lock:
+                self.reused += 1
+
+        try:
+            yield repo
+        finally:
+            with self._lock:
+                self._checked_out -= 1
+                keep = len(self._idle) + self._checked_out < self.max_handles
+                if keep:
+                    self._idle[id(repo)] = (path, repo, time.monotonic())
+            if not keep:
+                self._close(repo)
+
+    def pin(self, repo_path: str) -> None:
+        """
+        Keep idle handles of a path open past the idle timeout.
+
+        Args:
+            repo_path: Path to git repository
+        """
+        with self._lock:
+            self._pinned.add(os.path.abspath(os.path.normpath(repo_path)))
+
+    def prune(self) -> int:
+        """
+        Close handles idle longer than idle_timeout.
+
+        Returns:
+            Number of handles closed
+        """
+        with self._lock:
+            return self._prune_locked(time.monotonic())
+
+    def close_all(self) -> None:
+        """Close every idle handle (checked-out handles close on return)."""
+        with self._lock:
+            handles = [repo for _, repo, _ in self._idle.values()]
+            self._idle.clear()
+        for repo in handles:
+            self._close(repo)
+
+    def stats(self) -> dict:
+        """
+        Get pool counters.
+
+        Returns:
+            Dict with idle, checked_out, pinned, opened, reused, closed
+        """
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "checked_out": self._checked_out,
+                "pinned": len(self._pinned),
+                "max_handles": self.max_handles,
+                "opened": self.opened,
+                "reused": self.reused,
+                "closed": self.closed,
+            }
+
+    def _take_locked(self, path: str) -> Repo | None:
+        """Pop the most recently returned idle handle for path, making room otherwise."""
+        for key in reversed(self._idle):
+            if self._idle[key][0] == path:
+                return self._idle.pop(key)[1]
+
+        # A new handle will be opened: evict the least recently used
+        # idle handle if the pool is full, unpinned ones first
+        if self._idle and len(self._idle) + self._checked_out >= self.max_handles:
+            victim = next(
+                (key for key, (p, _, _) in self._idle.items() if p not in self._pinned),
+                next(iter(self._idle)),
+            )
+            self._close_locked(self._idle.pop(victim)[1])
+        return None
+
+    def _prune_locked(self, now: float) -> int:
+        expired = [
+            key for key, (path, _, returned) in self._idle.items()
+            if now - returned > self.idle_timeout and path not in self._pinned
+        ]
+        for key in expired:
+            self._close_locked(self._idle.pop(key)[1])
+        return len(expired)
+
+    def _close(self, repo: Repo) -> None:
+        with self._lock:
+            self._close_locked(repo)
+
+    def _close_locked(self, repo: Repo) -> None:
+        # Repo.close() only stops git processes; it does not block
+        repo.close()
+        self.closed += 1
+
+
+_pool: RepoPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_repo_pool() -> RepoPool:
+    """
+    Get the process-wide repository pool.
+
+    Limits are read from REPO_POOL_MAX_HANDLES and
+    REPO_POOL_IDLE_TIMEOUT on first use.
+
+    Returns:
+        Shared RepoPool instance
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = RepoPool(
+                int(os.getenv(MAX_HANDLES_ENV, DEFAULT_MAX_HANDLES)),
+                float(os.getenv(IDLE_TIMEOUT_ENV, DEFAULT_IDLE_TIMEOUT)),
+            )
+        return _pool
+
+
+def pooled_repo(repo_path: str):
+    """
+    Borrow a handle from the shared pool.
+
+    Names registered in the repository registry resolve to their
+    mirror path.
+
+    Usage:
+        with pooled_repo(path) as repo:
+            ...
+
+    Args:
+        repo_path: Path to git repository or registered repository name
+
+    Returns:
+        Context manager yielding git.Repo
+    """
+    from .registry import get_registry
+
+    mirror = get_registry().resolve(repo_path)
+    return get_repo_pool().checkout(mirror or repo_path)
+
+
+def _close_pool() -> None:
+    if _pool is not None:
+        _pool.close_all()
+
+
+atexit.register(_close_pool)
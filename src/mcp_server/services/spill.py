@@ -0,0 +1,289 @@
+"""Memory-budgeted sorting and grouping.
+
+A release with millions of commits does not fit in a small container
+as Python objects. Under a memory budget, items are kept pickled and
+moved to temporary files once the budget is used up: the sort writes
+sorted runs and merges them, and version lists (commits, commits by
+type, breaking changes) are read back from disk while the template
+renders them.
+
+Budget (tool parameter ``memory_budget`` or the CHANGELOG_MEMORY_BUDGET
+environment variable): bytes, or a number with a K, M or G suffix
+(e.g. '512M'). Temporary files go to TMPDIR.
+"""
+
+import heapq
+import os
+import pickle
+import re
+import tempfile
+import threading
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator
+
+
+MEMORY_BUDGET_ENV = "CHANGELOG_MEMORY_BUDGET"
+
+# Interpreter overhead of one held item (bytes object, list slot, tuple)
+ITEM_OVERHEAD = 100
+
+# Items per chunk written to disk; a merge holds one chunk per run
+CHUNK_ITEMS = 1024
+
+_SIZE = re.compile(r'^\s*(\d+)\s*([KMG]?)B?\s*$', re.IGNORECASE)
+_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(spec: str | int) -> int:
+    """
+    Parse a byte size.
+
+    Args:
+        spec: Bytes, or a number with a K, M or G suffix ('512M')
+
+    Returns:
+        Size in bytes
+
+    Raises:
+        ValueError: If the size is malformed or zero
+    """
+    if isinstance(spec, int):
+        size = spec
+    else:
+        match = _SIZE.match(spec)
+        if match is None:
+            raise ValueError(f"Invalid memory budget '{spec}': expected e.g. 65536, 64K or 512M")
+        size = int(match.group(1)) * _UNITS[match.group(2).upper()]
+    if size <= 0:
+        raise ValueError(f"Memory budget must be positive, got {spec}")
+    return size
+
+
+def default_memory_budget() -> int | None:
+    """
+    Get the budget configured by the CHANGELOG_MEMORY_BUDGET environment variable.
+
+    Returns:
+        Budget in bytes, or None (unlimited) when the variable is unset
+
+    Raises:
+        ValueError: If the variable is malformed
+    """
+    spec = os.getenv(MEMORY_BUDGET_ENV)
+    return parse_size(spec) if spec else None
+
+
+class SpillBudget:
+    """Byte budget shared by the sorters and lists of one release."""
+
+    def __init__(self, limit: int):
+        """
+        Initialize budget.
+
+        Args:
+            limit: Bytes of pickled items held in memory before spilling
+        """
+        self.limit = limit
+        self.used = 0
+        self.spills = 0  # Chunks of items written to disk
+        self._holders: list = []
+
+    def register(self, holder) -> None:
+        """Track a holder whose items can be spilled."""
+        self._holders.append(holder)
+
+    def charge(self, size: int) -> None:
+        """Account for a held item; spill every holder once over budget."""
+        self.used += size
+        if self.used > self.limit:
+            for holder in self._holders:
+                holder.spill()
+
+    def release(self, size: int) -> None:
+        """Account for items written to disk or dropped."""
+        self.used -= size
+
+
+class _SpillFile:
+    """Temporary file of pickled chunks, read back by offset."""
+
+    def __init__(self):
+        # Unlinked on creation: the space is freed when the file is closed
+        # or garbage-collected
+        self.file = tempfile.TemporaryFile()
+        self.lock = threading.Lock()
+
+    def write(self, blobs: list[bytes]) -> list[tuple[int, int]]:
+        """Append pickled items in chunks; returns (offset, length) of each."""
+        chunks = []
+        with self.lock:
+            self.file.seek(0, os.SEEK_END)
+            for start in range(0, len(blobs), CHUNK_ITEMS):
+                data = pickle.dumps(blobs[start:start + CHUNK_ITEMS], pickle.HIGHEST_PROTOCOL)
+                chunks.append((self.file.tell(), len(data)))
+                self.file.write(data)
+        return chunks
+
+    def read(self, chunks: list[tuple[int, int]]) -> Iterator[Any]:
+        """Yield items of the given chunks, one chunk in memory at a time."""
+        for offset, length in chunks:
+            with self.lock:
+                self.file.seek(offset)
+                data = self.file.read(length)
+            for blob in pickle.loads(data):
+                yield pickle.loads(blob)
+
+
+def _dump(item: Any) -> bytes:
+    return pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+
+
+class SpilledList:
+    """
+    Append-only list kept pickled and moved to disk over budget.
+
+    Supports len(), truth testing and repeated iteration, which is all
+    the changelog templates need.
+    """
+
+    def __init__(self, budget: SpillBudget):
+        self.budget = budget
+        self._blobs: list[bytes] = []  # Newest items, still in memory
+        self._held = 0
+        self._file: _SpillFile | None = None
+        self._chunks: list[tuple[int, int]] = []
+        self._len = 0
+        budget.register(self)
+
+    def append(self, item: Any) -> None:
+        """Add an item at the end."""
+        blob = _dump(item)
+        self._blobs.append(blob)
+        self._len += 1
+        size = len(blob) + ITEM_OVERHEAD
+        self._held += size
+        self.budget.charge(size)
+
+    def spill(self) -> None:
+        """Move the items held in memory to disk."""
+        if not self._blobs:
+            return
+        if self._file is None:
+            self._file = _SpillFile()
+        self._chunks.extend(self._file.write(self._blobs))
+        self.budget.spills += 1
+        self.budget.release(self._held)
+        self._blobs = []
+        self._held = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        held = len(self._blobs)
+        if self._file is not None:
+            yield from self._file.read(list(self._chunks))
+        for blob in self._blobs[:held]:
+            yield pickle.loads(blob)
+
+    def __repr__(self) -> str:
+        return f"SpilledList(len={self._len}, spilled_chunks={len(self._chunks)})"
+
+
+class ExternalSorter:
+    """Stable sort of an unbounded stream within a memory budget."""
+
+    def __init__(
+        self,
+        key: Callable[[Any], Any],
+        budget: SpillBudget,
+        reverse: bool = False,
+    ):
+        """
+        Initialize sorter.
+
+        Args:
+            key: Sort key of an item
+            budget: Shared memory budget
+            reverse: Sort descending (ties keep input order, like sorted())
+        """
+        self.key = key
+        self.reverse = reverse
+        self.budget = budget
+        self._run: list[tuple[Any, bytes]] = []
+        self._held = 0
+        self._file: _SpillFile | None = None
+        self._runs: list[list[tuple[int, int]]] = []
+        self._merging = False
+        budget.register(self)
+
+    def add(self, item: Any) -> None:
+        """Add an item to sort."""
+        key = self.key(item)
+        blob = _dump((key, item))
+        self._run.append((key, blob))
+        size = len(blob) + ITEM_OVERHEAD
+        self._held += size
+        self.budget.charge(size)
+
+    def spill(self) -> None:
+        """Write the held items to disk as one sorted run."""
+        if self._merging or not self._run:
+            return
+        if self._file is None:
+            self._file = _SpillFile()
+        self._run.sort(key=itemgetter(0), reverse=self.reverse)
+        self._runs.append(self._file.write([blob for _, blob in self._run]))
+        self.budget.spills += 1
+        self.budget.release(self._held)
+        self._run = []
+        self._held = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        """Merge the sorted runs; can be iterated once."""
+        self._merging = True
+        self._run.sort(key=itemgetter(0), reverse=self.reverse)
+        # Earlier runs win ties, which keeps the sort stable
+        runs = [self._file.read(chunks) for chunks in self._runs] if self._file else []
+        runs.append(self._drain())
+        try:
+            for _, item in heapq.merge(*runs, key=itemgetter(0), reverse=self.reverse):
+                yield item
+        finally:
+            self.budget.release(self._held)
+            self._run = []
+            self._held = 0
+
+    def _drain(self) -> Iterator[tuple[Any, Any]]:
+        """Yield the in-memory run, freeing each item as it goes."""
+        run = self._run
+        for i, (_, blob) in enumerate(run):
+            run[i] = None
+            size = len(blob) + ITEM_OVERHEAD
+            self._held -= size
+            self.budget.release(size)
+            yield pickle.loads(blob)
+
+
+def sort_spilled(
+    items: Iterable[Any],
+    key: Callable[[Any], Any],
+    budget: SpillBudget,
+    reverse: bool = False,
+) -> Iterator[Any]:
+    """
+    Sort items like sorted(), spilling sorted runs to disk over budget.
+
+    Args:
+        items: Items to sort (consumed before the first item is yielded)
+        key: Sort key of an item
+        budget: Shared memory budget
+        reverse: Sort descending
+
+    Yields:
+        Items in sorted order
+    """
+    sorter = ExternalSorter(key, budget, reverse)
+    for item in items:
+        sorter.add(item)
+    yield from sorter
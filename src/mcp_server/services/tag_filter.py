@@ -0,0 +1,144 @@
+"""Release tag selection.
+
+Not every tag is a release: nightly builds, release candidates and
+per-package tags would each become a version boundary. A TagFilter
+selects release tags by name while refs are enumerated, so excluded
+tags are never peeled or dated.
+
+Filter spec (tool parameter ``release_tags`` or the RELEASE_TAGS
+environment variable), comma-separated:
+
+    v*                 include tags matching a glob
+    !*-rc*             exclude tags matching a glob
+    re:v\\d+\\.\\d+\\.\\d+  tag names must fully match a regex; the regex
+                       runs to the end of the spec (commas included)
+
+Globs follow git ref patterns: ``*`` and ``?`` do not match ``/``,
+``**`` does.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+RELEASE_TAGS_ENV = "RELEASE_TAGS"
+REGEX_PREFIX = "re:"
+
+
+@dataclass(frozen=True)
+class TagFilter:
+    """Include/exclude rules for release tag names."""
+    include: tuple[str, ...] = ()  # Globs; empty includes every tag
+    exclude: tuple[str, ...] = ()  # Globs
+    regex: str | None = None       # Must match the whole name
+
+    @classmethod
+    def parse(cls, spec: str | None) -> "TagFilter":
+        """
+        Parse a filter spec.
+
+        Args:
+            spec: Comma-separated globs, '!glob' excludes and an optional
+                  trailing 're:<regex>'. None or '' selects every tag.
+
+        Returns:
+            TagFilter
+
+        Raises:
+            ValueError: If the regex does not compile
+
+        Example:
+            >>> TagFilter.parse("v*,!*-rc*")
+            TagFilter(include=('v*',), exclude=('*-rc*',), regex=None)
+        """
+        include: list[str] = []
+        exclude: list[str] = []
+        regex = None
+        rest = (spec or "").strip()
+        while rest:
+            if rest.startswith(REGEX_PREFIX):
+                regex = rest[len(REGEX_PREFIX):]
+                try:
+                    re.compile(regex)
+                except re.error as e:
+                    raise ValueError(f"Invalid release tag regex '{regex}': {e}") from e
+                break
+            item, _, rest = rest.partition(",")
+            item, rest = item.strip(), rest.strip()
+            if item.startswith("!"):
+                exclude.append(item[1:].strip())
+            elif item:
+                include.append(item)
+        return cls(tuple(include), tuple(exclude), regex)
+
+    @property
+    def needs_names(self) -> bool:
+        """Whether names must be listed and filtered before peeling."""
+        return bool(self.exclude) or self.regex is not None
+
+    def ref_patterns(self) -> list[str]:
+        """
+        Get the ``git for-each-ref`` patterns for the include globs.
+
+        Returns:
+            Ref patterns under refs/tags
+        """
+        if not self.include:
+            return ["refs/tags"]
+        return [f"refs/tags/{glob}" for glob in self.include]
+
+    def matches(self, name: str) -> bool:
+        """
+        Check a tag name against the filter.
+
+        Args:
+            name: Tag name without refs/tags/
+
+        Returns:
+            True if the tag is a release tag
+        """
+        if self.include and not any(_glob_match(g, name) for g in self.include):
+            return False
+        if any(_glob_match(g, name) for g in self.exclude):
+            return False
+        return self.regex is None or re.fullmatch(self.regex, name) is not None
+
+
+def default_tag_filter() -> TagFilter:
+    """
+    Get the filter configured by the RELEASE_TAGS environment variable.
+
+    Returns:
+        TagFilter (selects every tag when the variable is unset)
+    """
+    return TagFilter.parse(os.getenv(RELEASE_TAGS_ENV))
+
+
+def _glob_match(glob: str, name: str) -> bool:
+    return _compile_glob(glob).fullmatch(name) is not None
+
+
+_GLOB_TOKENS = re.compile(r'\*\*|\*|\?|\[[^\]]*\]|[^*?\[]+|\[')
+
+
+@lru_cache(maxsize=256)
+def _compile_glob(glob: str) -> re.Pattern:
+    """Translate a git ref glob into a compiled regex."""
+    parts = []
+    for token in _GLOB_TOKENS.findall(glob):
+        if token == "**":
+            parts.append(".*")
+        elif token == "*":
+            parts.append("[^/]*")
+        elif token == "?":
+            parts.append("[^/]")
+        elif token.startswith("[") and len(token) > 2:
+            body = token[1:-1]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+        else:
+            parts.append(re.escape(token))
+    return re.compile("".join(parts))
@@ -1,11 +1,26 @@
 """Template Service for changelog generation."""
 
 from datetime import datetime
+from functools import partial
+from operator import attrgetter
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List
 
 from ..models.changelog import ChangelogVersion
+from .spill import SpillBudget, SpilledList, sort_spilled
+
+
+# analyze_repo sections each template needs (see analyzer.ANALYSIS_FIELDS).
+# Templates render ChangelogCommit headers only, so none need diff stats.
+# Multi-version changelogs need the commit graph to assign commits to tags.
+DEFAULT_TEMPLATE_FIELDS = frozenset({"commits", "tags", "graph"})
+TEMPLATE_FIELDS = {
+    "changelog.md.j2": DEFAULT_TEMPLATE_FIELDS,
+    "changelog.json.j2": DEFAULT_TEMPLATE_FIELDS,
+    "keepachangelog.md.j2": DEFAULT_TEMPLATE_FIELDS,
+    "release_notes.md.j2": frozenset({"commits", "tags"}),
+}
 
 
 class TemplateService:
@@ -35,6 +50,19 @@ class TemplateService:
         # Add global functions
         self.env.globals['now'] = lambda: datetime.now().isoformat()
     
+    @staticmethod
+    def required_fields(template_name: str) -> frozenset[str]:
+        """
+        Get analyze_repo fields needed to render a template.
+        
+        Args:
+            template_name: Template file name
+            
+        Returns:
+            Set of analyze_repo field names
+        """
+        return TEMPLATE_FIELDS.get(template_name, DEFAULT_TEMPLATE_FIELDS)
+    
     def render_changelog(
         self,
         versions: List[ChangelogVersion],
@@ -53,15 +81,40 @@ class TemplateService:
         template = self.env.get_template(template_name)
         return template.render(versions=versions)
     
+    def stream_changelog(
+        self,
+        versions: Iterable[ChangelogVersion],
+        template_name: str = "changelog.md.j2"
+    ) -> Iterator[str]:
+        """
+        Render changelog incrementally.
+        
+        Versions may be a generator: each one is consumed as the
+        template reaches it, and output is yielded chunk by chunk.
+        
+        Args:
+            versions: Iterable of ChangelogVersion (newest first)
+            template_name: Template file name
+            
+        Yields:
+            Rendered text chunks
+        """
+        template = self.env.get_template(template_name)
+        return template.generate(versions=versions)
+    
     def group_commits_by_version(
         self,
         commits: List,  # List[EnrichedCommit] from analyzer
-        tags: List[dict]
+        tags: List[dict],
+        graph: dict[str, tuple[str, ...]] | None = None,
+        patch_ids: dict[str, str] | None = None
     ) -> List[ChangelogVersion]:
         """
-        Group commits by version tags using dates.
+        Group commits by version tags.
         
-        Algorithm:
+        With a commit graph, each commit goes to the first release that
+        contains it (see _label_commits_by_ancestry). Without one, tags
+        are matched by date:
         1. Sort tags by date (newest first)
         2. Iterate commits (newest first)
         3. Commits AFTER newest tag = Unreleased
@@ -71,14 +124,84 @@ class TemplateService:
         Args:
             commits: List of EnrichedCommit from analyzer (newest first)
             tags: List of tag dicts from analyzer (name, date, hash)
+            graph: sha -> parent shas of walked history (analyze_repo
+                   field 'graph'). Default: None (group by date)
+            patch_ids: sha -> patch-id (see patch_ids.get_patch_ids).
+                       When given, cherry-picked duplicates are shown
+                       once, in the oldest release. Default: None
             
         Returns:
             List of ChangelogVersion, sorted newest first (Unreleased, v1.2.0, v1.1.0, ...)
         """
-        from ..models.changelog import ChangelogCommit
-        
         if not tags:
-            return self._create_unreleased_version(commits)
+            versions = self._create_unreleased_version(commits)
+        elif graph is not None:
+            versions = self._group_by_ancestry(commits, tags, graph)
+        else:
+            versions = self._group_by_date(commits, tags)
+        
+        if patch_ids:
+            versions = self._drop_duplicate_patches(versions, patch_ids)
+        return versions
+    
+    def _drop_duplicate_patches(
+        self,
+        versions: List[ChangelogVersion],
+        patch_ids: dict[str, str]
+    ) -> List[ChangelogVersion]:
+        """Keep one commit per patch-id; drop versions left empty."""
+        from .patch_ids import DuplicateFilter
+        
+        duplicates = DuplicateFilter(
+            patch_ids, [c.hash for v in versions for c in v.commits]
+        )
+        result: List[ChangelogVersion] = []
+        for version in versions:
+            kept = ChangelogVersion(version=version.version, date=version.date)
+            for commit in duplicates.filter(version.commits):
+                kept.add_commit(commit)
+            if kept.commits:
+                result.append(kept)
+        return result
+    
+    def _group_by_ancestry(
+        self,
+        commits: List,
+        tags: List[dict],
+        graph: dict[str, tuple[str, ...]]
+    ) -> List[ChangelogVersion]:
+        """Group commits by the first release whose tag reaches them."""
+        from .versioning import order_tags
+        
+        ordered = order_tags(tags)
+        labels = _label_commits_by_ancestry(ordered, graph)
+        
+        buckets: dict[str, List] = {}
+        unreleased: List = []
+        for commit in commits:
+            name = labels.get(commit.hash)
+            if name is None:
+                unreleased.append(commit)
+            else:
+                buckets.setdefault(name, []).append(commit)
+        
+        versions: List[ChangelogVersion] = []
+        if unreleased:
+            versions.append(self.create_version(unreleased, "Unreleased", None))
+        for tag in reversed(ordered):
+            if tag['name'] in buckets:
+                versions.append(self.create_version(
+                    buckets[tag['name']], tag['name'], _format_tag_date(tag['date'])
+                ))
+        return versions
+    
+    def _group_by_date(
+        self,
+        commits: List,
+        tags: List[dict]
+    ) -> List[ChangelogVersion]:
+        """Group commits by comparing commit dates with tag dates."""
+        from ..models.changelog import ChangelogCommit
         
         # Sort tags newest first
         sorted_tags = sorted(tags, key=lambda t: t['date'], reverse=True)
@@ -97,7 +220,7 @@ class TemplateService:
                 if commit.date <= tag_date:
                     # Save accumulated commits as Unreleased (only for first tag)
                     if current_commits and tag_index == 0:
-                        versions.append(self._create_version_from_commits(
+                        versions.append(self.create_version(
                             current_commits, "Unreleased", None
                         ))
                         current_commits = []
@@ -105,7 +228,7 @@ class TemplateService:
                     # Create version for this tag
                     version = ChangelogVersion(
                         version=current_tag['name'],
-                        date=tag_date.strftime('%Y-%m-%d') if hasattr(tag_date, 'strftime') else str(tag_date)
+                        date=_format_tag_date(tag_date)
                     )
                     versions.append(version)
                     tag_index += 1
@@ -128,35 +251,30 @@ class TemplateService:
             else:
                 current_commits.append(commit)
         
-        # Handle remaining commits (before oldest tag)
-        if current_commits and versions:
-            for commit in current_commits:
-                versions[-1].add_commit(ChangelogCommit(
-                    hash=commit.hash,
-                    short_hash=commit.short_hash,
-                    type=commit.parsed.type,
-                    scope=commit.parsed.scope,
-                    description=commit.parsed.description,
-                    breaking=commit.parsed.breaking,
-                    author=commit.author,
-                    date=commit.date
-                ))
+        # Commits newer than every tag are unreleased
+        if current_commits:
+            versions.insert(0, self.create_version(current_commits, "Unreleased", None))
         
         return versions
     
-    def _create_version_from_commits(
+    def create_version(
         self,
-        commits: List,
+        commits: Iterable,
         version_name: str | None = None,
-        date: str | None = None
+        date: str | None = None,
+        budget: SpillBudget | None = None
     ) -> ChangelogVersion:
         """
         Create ChangelogVersion from list of commits.
         
         Args:
-            commits: List of EnrichedCommit
+            commits: Iterable of EnrichedCommit (consumed once)
             version_name: Version name
             date: Version date
+            budget: Memory budget (see spill). When set, commits are
+                    sorted newest first with sorted runs spilled to
+                    disk, and the version's lists are SpilledList.
+                    Default: None (plain lists, input order)
             
         Returns:
             ChangelogVersion with all commits added
@@ -168,8 +286,8 @@ class TemplateService:
             date=date
         )
         
-        for commit in commits:
-            version.add_commit(ChangelogCommit(
+        changelog_commits = (
+            ChangelogCommit(
                 hash=commit.hash,
                 short_hash=commit.short_hash,
                 type=commit.parsed.type,
@@ -178,7 +296,22 @@ class TemplateService:
                 breaking=commit.parsed.breaking,
                 author=commit.author,
                 date=commit.date
-            ))
+            )
+            for commit in commits
+        )
+        
+        if budget is not None:
+            new_list = partial(SpilledList, budget)
+            version.commits = new_list()
+            version.breaking_changes = new_list()
+            version.new_list = new_list
+            # Same order as analyzer.get_commits_between
+            changelog_commits = sort_spilled(
+                changelog_commits, attrgetter('date'), budget, reverse=True
+            )
+        
+        for commit in changelog_commits:
+            version.add_commit(commit)
         
         return version
 
@@ -215,3 +348,39 @@ class TemplateService:
             unreleased.add_commit(changelog_commit)
         
         return [unreleased]
+
+
+def _format_tag_date(tag_date) -> str:
+    """Format a tag date as YYYY-MM-DD."""
+    return tag_date.strftime('%Y-%m-%d') if hasattr(tag_date, 'strftime') else str(tag_date)
+
+
+def _label_commits_by_ancestry(
+    ordered_tags: List[dict],
+    graph: dict[str, tuple[str, ...]]
+) -> dict[str, str]:
+    """
+    Label each commit with the first release that contains it.
+    
+    Walks back from each tag, oldest release first, and stops at commits
+    already labeled by an earlier release or outside the walked graph.
+    Every commit is visited once: O(commits + parent edges + tags).
+    
+    Args:
+        ordered_tags: Tags ordered oldest release first (see order_tags)
+        graph: sha -> parent shas
+        
+    Returns:
+        Dict sha -> tag name. Commits not reachable from any tag are absent.
+    """
+    labels: dict[str, str] = {}
+    for tag in ordered_tags:
+        name = tag['name']
+        stack = [tag['hash']]
+        while stack:
+            sha = stack.pop()
+            if sha in labels or sha not in graph:
+                continue
+            labels[sha] = name
+            stack.extend(graph[sha])
+    return labels
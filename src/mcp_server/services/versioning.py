@@ -0,0 +1,155 @@
+"""Semantic version helpers for release tags.
+
+Orders tags by semver precedence (so v1.10.0 > v1.9.0) and translates
+version bounds into git revision ranges.
+"""
+
+import re
+from functools import total_ordering
+
+
+SEMVER_PATTERN = re.compile(
+    r'^(?P<prefix>[^\d]*?)'
+    r'(?P<major>\d+)(?:\.(?P<minor>\d+))?(?:\.(?P<patch>\d+))?'
+    r'(?:-(?P<prerelease>[0-9A-Za-z.\-]+))?'
+    r'(?:\+[0-9A-Za-z.\-]+)?$'
+)
+
+
+@total_ordering
+class _PrereleaseId:
+    """Prerelease identifier with semver precedence (numeric < alphanumeric)."""
+
+    def __init__(self, value: str):
+        self.is_numeric = value.isdigit()
+        self.value = int(value) if self.is_numeric else value
+
+    def __eq__(self, other) -> bool:
+        return (self.is_numeric, self.value) == (other.is_numeric, other.value)
+
+    def __lt__(self, other) -> bool:
+        if self.is_numeric != other.is_numeric:
+            return self.is_numeric
+        return self.value < other.value
+
+
+def parse_version(name: str) -> tuple | None:
+    """
+    Parse a tag name as a semantic version.
+
+    Accepts an optional non-numeric prefix ('v', 'release-') and missing
+    minor/patch components ('v2' == 'v2.0.0').
+
+    Args:
+        name: Tag name (e.g. 'v1.2.3-rc.1')
+
+    Returns:
+        Sort key tuple, or None if the name is not a version
+
+    Example:
+        >>> parse_version("v1.10.0") > parse_version("v1.9.0")
+        True
+        >>> parse_version("v1.0.0-rc.1") < parse_version("v1.0.0")
+        True
+    """
+    match = SEMVER_PATTERN.match(name)
+    if not match:
+        return None
+
+    core = (
+        int(match.group('major')),
+        int(match.group('minor') or 0),
+        int(match.group('patch') or 0),
+    )
+    prerelease = match.group('prerelease')
+    if prerelease is None:
+        # A release sorts after all of its prereleases
+        return core + ((1,),)
+    return core + ((0, *(_PrereleaseId(p) for p in prerelease.split('.'))),)
+
+
+def order_tags(tags: list[dict]) -> list[dict]:
+    """
+    Order release tags oldest to newest.
+
+    Uses semver precedence when every tag is a version; otherwise keeps
+    the date order from get_tags.
+
+    Args:
+        tags: Tag list from get_tags (oldest first by date)
+
+    Returns:
+        New list of tags, oldest release first
+    """
+    keys = [parse_version(t["name"]) for t in tags]
+    if any(k is None for k in keys):
+        return list(tags)
+    # Stable sort: equal versions (v1.0 and v1.0.0) keep date order
+    order = sorted(range(len(tags)), key=lambda i: keys[i])
+    return [tags[i] for i in order]
+
+
+def select_version_range(
+    tags: list[dict],
+    from_version: str | None = None,
+    to_version: str | None = None,
+) -> tuple[str | None, str | None, list[dict]]:
+    """
+    Translate version bounds into a git revision range.
+
+    Versions between from_version and to_version (inclusive) are kept.
+    The range starts after the release preceding from_version and ends
+    at the newest kept release.
+
+    Args:
+        tags: Tag list from get_tags
+        from_version: Lowest version to include. Default: None (all)
+        to_version: Highest version to include. Default: None (up to HEAD)
+
+    Returns:
+        (from_ref, to_ref, selected_tags): from_ref is None to start at
+        the root, to_ref is None to end at HEAD; selected_tags are
+        ordered oldest first. If no release is <= to_version, to_ref is
+        None and selected_tags is empty.
+    """
+    ordered = order_tags(tags)
+    positions = {t["name"]: i for i, t in enumerate(ordered)}
+
+    start = 0
+    if from_version is not None:
+        start = _bound_index(ordered, positions, from_version, upper=False)
+
+    end = len(ordered)
+    if to_version is not None:
+        end = _bound_index(ordered, positions, to_version, upper=True)
+
+    selected = ordered[start:end]
+    from_ref = ordered[start - 1]["name"] if start > 0 else None
+    to_ref = selected[-1]["name"] if to_version is not None and selected else None
+    return from_ref, to_ref, selected
+
+
+def _bound_index(
+    ordered: list[dict],
+    positions: dict[str, int],
+    version: str,
+    upper: bool,
+) -> int:
+    """
+    Slice index for a version bound.
+
+    Lower bounds give the index of the first tag >= version; upper
+    bounds give one past the last tag <= version.
+    """
+    key = parse_version(version)
+    keys = [parse_version(t["name"]) for t in ordered]
+
+    if key is None or any(k is None for k in keys):
+        # Non-semver: bound must be an existing tag name
+        if version not in positions:
+            return len(ordered) if not upper else 0
+        return positions[version] + (1 if upper else 0)
+
+    if upper:
+        return sum(1 for k in keys if k <= key)
+    return sum(1 for k in keys if k < key)
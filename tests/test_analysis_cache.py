@@ -0,0 +1,167 @@
+"""Tests for in-process analysis cache."""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+from git import Repo
+
+from mcp_server.services import analyzer
+from mcp_server.services.analysis_cache import (
+    AnalysisCache,
+    estimate_size,
+    get_analysis_cache,
+    repo_fingerprint,
+)
+from mcp_server.services.analyzer import analyze_repo
+
+
+@pytest.fixture
+def temp_repo():
+    """Repository with two commits."""
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    for i, message in enumerate(["feat: first", "fix: second"]):
+        path = os.path.join(tmpdir, f"file{i}.txt")
+        with open(path, "w") as f:
+            f.write(message)
+        repo.index.add([path])
+        repo.index.commit(message)
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+class TestAnalysisCache:
+    """Test AnalysisCache eviction and counters."""
+
+    def test_hit_and_miss(self):
+        """Счётчики попаданий и промахов."""
+        cache = AnalysisCache(max_bytes=1000)
+
+        assert cache.get("a") is None
+        cache.put("a", "value", size=10)
+        assert cache.get("a") == "value"
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+        assert stats["bytes"] == 10
+
+    def test_evicts_by_size_in_lru_order(self):
+        """Вытеснение по бюджету памяти, а не по числу записей."""
+        cache = AnalysisCache(max_bytes=100)
+        cache.put("a", 1, size=40)
+        cache.put("b", 2, size=40)
+        cache.get("a")  # "b" becomes least recently used
+        cache.put("c", 3, size=40)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] == 80
+
+    def test_oversized_value_not_stored(self):
+        """Значение больше бюджета не кэшируется."""
+        cache = AnalysisCache(max_bytes=10)
+
+        assert cache.put("a", "value", size=11) is False
+        assert cache.stats()["entries"] == 0
+
+    def test_replace_updates_size(self):
+        """Повторная запись по ключу пересчитывает размер."""
+        cache = AnalysisCache(max_bytes=100)
+        cache.put("a", 1, size=60)
+        cache.put("a", 2, size=20)
+
+        assert cache.stats()["bytes"] == 20
+        assert cache.get("a") == 2
+
+    def test_estimate_size_grows_with_content(self):
+        """Оценка размера учитывает вложенные объекты."""
+        small = {"commits": ["x" * 10]}
+        large = {"commits": ["x" * 10_000]}
+
+        assert estimate_size(large) > estimate_size(small) + 9_000
+
+    def test_estimate_size_counts_lazy_message(self):
+        """Размер разобранного коммита включает исходное сообщение."""
+        from mcp_server.services.parser_service import parse_commit
+
+        parsed = parse_commit(b"feat: x\n\n" + b"y" * 100_000)
+
+        assert estimate_size(parsed) > 100_000
+
+
+class TestRepoFingerprint:
+    """Test repo_fingerprint."""
+
+    def test_stable_without_changes(self, temp_repo):
+        """Отпечаток не меняется без изменений."""
+        assert repo_fingerprint(temp_repo) == repo_fingerprint(temp_repo)
+
+    def test_changes_on_commit(self, temp_repo):
+        """Новый коммит меняет отпечаток."""
+        before = repo_fingerprint(temp_repo)
+        temp_repo.git.commit("--allow-empty", "-m", "chore: more")
+
+        assert repo_fingerprint(temp_repo) != before
+
+    def test_changes_on_tag(self, temp_repo):
+        """Новый тег меняет отпечаток."""
+        before = repo_fingerprint(temp_repo)
+        temp_repo.create_tag("v1.0.0")
+
+        assert repo_fingerprint(temp_repo) != before
+
+
+class TestAnalyzeRepoCache:
+    """Test analyze_repo integration with the cache."""
+
+    def test_repeat_call_served_from_cache(self, temp_repo, monkeypatch):
+        """Повторный вызов не читает историю заново."""
+        calls = []
+        original = analyzer.get_commits_between
+        monkeypatch.setattr(
+            analyzer, "get_commits_between",
+            lambda *a, **kw: calls.append(1) or original(*a, **kw),
+        )
+
+        first = analyze_repo(temp_repo.working_dir)
+        second = analyze_repo(temp_repo.working_dir)
+
+        assert len(calls) == 1
+        assert first["commits"] == second["commits"]
+
+    def test_new_commit_invalidates(self, temp_repo):
+        """Изменение репозитория приводит к новому анализу."""
+        first = analyze_repo(temp_repo.working_dir)
+        temp_repo.git.commit("--allow-empty", "-m", "docs: more")
+        second = analyze_repo(temp_repo.working_dir)
+
+        assert len(second["commits"]) == len(first["commits"]) + 1
+
+    def test_params_are_part_of_key(self, temp_repo):
+        """Разные параметры не смешиваются в кэше."""
+        full = analyze_repo(temp_repo.working_dir)
+        headers = analyze_repo(temp_repo.working_dir, fields={"commits"})
+
+        assert "tags" in full
+        assert "tags" not in headers
+
+    def test_use_cache_false(self, temp_repo):
+        """use_cache=False обходит кэш."""
+        cache = get_analysis_cache()
+        before = cache.stats()
+        analyze_repo(temp_repo.working_dir, use_cache=False)
+
+        after = cache.stats()
+        assert after["hits"] == before["hits"]
+        assert after["misses"] == before["misses"]
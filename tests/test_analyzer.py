@@ -16,6 +16,7 @@ from mcp_server.services.analyzer import (
     get_commits_between,
     get_repo,
     get_tags,
+    resolve_commits,
 )
 
 
@@ -99,6 +100,42 @@ def temp_repo():
     shutil.rmtree(tmpdir)
 
 
+@pytest.fixture
+def pr_repo():
+    """Mainline with two merged PRs, each with several branch commits."""
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    main = repo.active_branch.name
+
+    def commit(name, message):
+        path = os.path.join(tmpdir, name)
+        with open(path, "a") as f:
+            f.write(message + "\n")
+        repo.index.add([path])
+        repo.index.commit(message)
+
+    commit("README.md", "docs: initial README")
+    prs = [
+        ("login", "Merge pull request #1 from user/login\n\nfeat(auth): add login",
+         ["add form", "add validation", "fix typo"]),
+        ("cache", "Merge branch 'cache'", ["wip", "perf: cache results"]),
+    ]
+    for branch, message, branch_commits in prs:
+        repo.git.checkout("-b", branch, main)
+        for text in branch_commits:
+            commit(f"{branch}.py", text)
+        repo.git.checkout(main)
+        commit("CHANGES.md", f"chore: prepare {branch}")
+        repo.git.merge(branch, "--no-ff", "-m", message)
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
 @pytest.fixture
 def empty_dir():
     """Create an empty directory (not a git repo)."""
@@ -179,6 +216,58 @@ class TestGetCommitsBetween:
             assert isinstance(commit.deletions, int)
 
 
+class TestResolveCommits:
+    """Test resolve_commits."""
+
+    def test_resolves_to_commits(self, temp_repo):
+        """Теги и выражения разрешаются в SHA коммитов."""
+        repo = temp_repo["repo"]
+
+        shas = resolve_commits(repo, ["v1.0.0", "HEAD~1"])
+
+        assert shas == [repo.commit("v1.0.0").hexsha, repo.commit("HEAD~1").hexsha]
+
+    def test_invalid_refs(self, temp_repo):
+        """Опции и несуществующие refs — InvalidRepoError."""
+        with pytest.raises(InvalidRepoError, match="Invalid ref: --all, nope"):
+            resolve_commits(temp_repo["repo"], ["--all", "HEAD", "nope"])
+        with pytest.raises(InvalidRepoError):
+            resolve_commits(temp_repo["repo"], ["HEAD\n--all"])
+
+
+class TestFirstParent:
+    """Test first-parent (merge unit) walking."""
+
+    def test_merges_are_units(self, pr_repo):
+        """Коммиты веток не читаются, merge — одна запись с заголовком PR."""
+        commits = get_commits_between(pr_repo, first_parent=True)
+
+        described = [(c.parsed.type, c.parsed.description) for c in commits]
+        assert described == [
+            ("perf", "cache results"),
+            ("chore", "prepare cache"),
+            ("feat", "add login"),
+            ("chore", "prepare login"),
+            ("docs", "initial README"),
+        ]
+
+    def test_merge_stats_cover_branch(self, pr_repo):
+        """Статистика merge — весь диф влитой ветки."""
+        commits = get_commits_between(pr_repo, first_parent=True)
+        login = next(c for c in commits if c.parsed.description == "add login")
+
+        assert login.files_changed == 1
+        assert login.insertions == 3
+
+    def test_analyze_repo_cache_key(self, pr_repo):
+        """first_parent входит в ключ кэша analyze_repo."""
+        full = analyze_repo(pr_repo.working_dir, fields={"commits"})
+        mainline = analyze_repo(pr_repo.working_dir, fields={"commits"}, first_parent=True)
+
+        assert len(mainline["commits"]) == 5
+        assert len(full["commits"]) > len(mainline["commits"])
+
+
 class TestGetTags:
     """Test get_tags function."""
 
@@ -226,6 +315,36 @@ class TestGetTags:
             repo.close()
             shutil.rmtree(tmpdir)
 
+    def test_get_tags_cached_until_refs_change(self, temp_repo):
+        """Список тегов кэшируется и сбрасывается при новом теге."""
+        repo = temp_repo["repo"]
+        first = get_tags(repo)
+        assert get_tags(repo) == first
+
+        repo.create_tag("v2.0.0")
+
+        assert len(get_tags(repo)) == len(first) + 1
+
+    def test_get_tags_packed_refs(self, temp_repo):
+        """Упакованные теги читаются так же, как loose."""
+        repo = temp_repo["repo"]
+        loose = get_tags(repo, use_cache=False)
+        repo.git.pack_refs("--all")
+
+        assert get_tags(repo) == loose
+
+    def test_get_tags_peels_to_commit(self, temp_repo):
+        """Теги на теги разыменовываются, теги на деревья пропускаются."""
+        repo = temp_repo["repo"]
+        repo.git.tag("-a", "-m", "Nested", "v1.1.0-nested", "v1.1.0")
+        repo.git.tag("tree-tag", "HEAD^{tree}")
+
+        tags = {t["name"]: t for t in get_tags(repo)}
+
+        assert tags["v1.1.0-nested"]["hash"] == tags["v1.1.0"]["hash"]
+        assert tags["v1.1.0"]["hash"] == repo.tags["v1.1.0"].commit.hexsha
+        assert "tree-tag" not in tags
+
 
 class TestAggregateStats:
     """Test aggregate_stats function."""
@@ -313,6 +432,56 @@ class TestAnalyzeRepo:
             analyze_repo(empty_dir)
 
 
+class TestAnalyzeRepoFields:
+    """Test field projection in analyze_repo."""
+
+    def test_fields_projection(self, temp_repo):
+        """Возвращаются только запрошенные секции."""
+        result = analyze_repo(temp_repo["path"], fields={"commits", "tags"})
+
+        assert "commits" in result
+        assert "tags" in result
+        assert "summary" not in result
+        assert "stats" not in result
+
+    def test_header_only_commits(self, temp_repo):
+        """Без stats коммиты не содержат статистики по файлам."""
+        result = analyze_repo(temp_repo["path"], fields={"commits"})
+
+        assert "tags" not in result
+        assert len(result["commits"]) == 5
+        assert all(c.files_changed == 0 for c in result["commits"])
+        assert all(c.insertions == 0 for c in result["commits"])
+
+    def test_include_stats_override(self, temp_repo):
+        """include_stats=True считает статистику без секции stats."""
+        result = analyze_repo(temp_repo["path"], fields={"commits"}, include_stats=True)
+
+        assert sum(c.files_changed for c in result["commits"]) > 0
+
+    def test_header_only_same_commits(self, temp_repo):
+        """Проекция не меняет набор и порядок коммитов."""
+        full = analyze_repo(temp_repo["path"])
+        headers = analyze_repo(temp_repo["path"], fields={"commits", "summary"})
+
+        assert [c.hash for c in headers["commits"]] == [c.hash for c in full["commits"]]
+        assert headers["summary"] == full["summary"]
+
+    def test_unknown_field(self, temp_repo):
+        """Неизвестное поле вызывает ошибку."""
+        with pytest.raises(ValueError):
+            analyze_repo(temp_repo["path"], fields={"diffs"})
+
+    def test_graph_includes_wip(self, temp_repo):
+        """Граф содержит все пройденные коммиты, включая WIP."""
+        result = analyze_repo(temp_repo["path"], fields={"graph"})
+        hashes = [c["hash"] for c in temp_repo["commits"]]
+
+        assert set(result["graph"]) == set(hashes)
+        assert result["graph"][hashes[0]] == ()
+        assert result["graph"][hashes[-1]] == (hashes[-2],)
+
+
 class TestEdgeCases:
     """Test edge cases and boundary conditions."""
 
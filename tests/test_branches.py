@@ -0,0 +1,131 @@
+"""Tests for shared-walk multi-branch changelogs."""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+from git import Repo
+
+from mcp_server.server import generate_branch_changelogs, generate_changelog
+from mcp_server.services import branches as branches_module
+from mcp_server.services.analyzer import InvalidRepoError
+from mcp_server.services.branches import walk_branches
+
+
+@pytest.fixture
+def temp_repo():
+    """
+    main with two maintenance branches.
+
+        c1 -- c2 (v2.0.0) -- c3 (v3.0.0) -- c4              main
+                \\             \\
+                 +-- f1 (v2.0.1) +-- f2 (v3.0.1)            release/2.x, release/3.x
+    """
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    repo.git.checkout("-b", "main")
+
+    day = iter(range(1, 30))
+
+    def commit(name, message):
+        path = os.path.join(tmpdir, name)
+        with open(path, "a") as f:
+            f.write(message + "\n")
+        repo.index.add([path])
+        date = f"2024-01-{next(day):02d}T10:00:00"
+        repo.index.commit(message, commit_date=date, author_date=date)
+
+    commit("README.md", "docs: initial README")
+    commit("main.py", "feat: add main")
+    repo.create_tag("v2.0.0")
+    commit("main.py", "feat!: new API")
+    repo.create_tag("v3.0.0")
+
+    repo.git.checkout("-b", "release/2.x", "v2.0.0")
+    commit("fix2.py", "fix: backport crash fix")
+    repo.create_tag("v2.0.1")
+
+    repo.git.checkout("-b", "release/3.x", "v3.0.0")
+    commit("fix3.py", "fix: handle empty input")
+    repo.create_tag("v3.0.1")
+
+    repo.git.checkout("main")
+    commit("main.py", "feat: add plugins")
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+BRANCHES = ["main", "release/2.x", "release/3.x"]
+
+
+class TestWalkBranches:
+    """Test walk_branches."""
+
+    def test_membership_bits(self, temp_repo):
+        """Каждый коммит помечен ветками, которые его содержат."""
+        walk = walk_branches(temp_repo, BRANCHES)
+        by_message = {c.parsed.description: walk.membership[c.hash] for c in walk.commits}
+
+        assert by_message == {
+            "initial README": 0b111,
+            "add main": 0b111,
+            "new API": 0b101,
+            "add plugins": 0b001,
+            "backport crash fix": 0b010,
+            "handle empty input": 0b100,
+        }
+
+    def test_single_git_log(self, temp_repo, monkeypatch):
+        """Все ветки читаются одним git log."""
+        calls = []
+        original = branches_module.iter_log_records
+        monkeypatch.setattr(
+            branches_module, "iter_log_records",
+            lambda *args, **kwargs: calls.append(args) or original(*args, **kwargs),
+        )
+
+        walk = walk_branches(temp_repo, BRANCHES)
+
+        assert len(calls) == 1
+        assert len(walk.commits) == 6
+
+    def test_invalid_branch(self, temp_repo):
+        """Несуществующая ветка — InvalidRepoError."""
+        with pytest.raises(InvalidRepoError, match="nope"):
+            walk_branches(temp_repo, ["main", "nope"])
+
+
+class TestGenerateBranchChangelogs:
+    """Test generate_branch_changelogs tool."""
+
+    def test_same_as_per_branch(self, temp_repo):
+        """Результат совпадает с generate_changelog на каждой ветке."""
+        repo_path = temp_repo.working_dir
+
+        result = generate_branch_changelogs(repo_path, BRANCHES)
+
+        assert list(result) == BRANCHES
+        for branch in BRANCHES:
+            temp_repo.git.checkout(branch)
+            assert result[branch] == generate_changelog(repo_path)
+
+    def test_branch_contents(self, temp_repo):
+        """В ветке только её релизы и коммиты."""
+        result = generate_branch_changelogs(temp_repo.working_dir, BRANCHES)
+
+        assert "backport crash fix" in result["release/2.x"]
+        assert "v3.0.0" not in result["release/2.x"]
+        assert "backport crash fix" not in result["main"]
+        assert "## v3.0.1" in result["release/3.x"]
+
+    def test_error(self, temp_repo):
+        """Ошибка возвращается под ключом error."""
+        result = generate_branch_changelogs(temp_repo.working_dir, ["nope"])
+
+        assert result["error"].startswith("Error:")
@@ -0,0 +1,228 @@
+"""Tests for tool call cancellation and deadlines."""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+import pytest
+from git import Git, Repo
+
+import mcp_server.services.ai as ai_module
+from mcp_server.server import (
+    generate_branch_changelogs,
+    generate_changelog,
+    generate_release_notes,
+)
+from mcp_server.services.cancellation import (
+    TOOL_TIMEOUT_ENV,
+    CancelToken,
+    DeadlineExceeded,
+    OperationCancelled,
+    cancel_scope,
+    check_cancelled,
+    current_token,
+)
+from mcp_server.services.git_log import iter_log_records
+
+
+@pytest.fixture
+def temp_repo():
+    """Two releases and unreleased work."""
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+
+    def commit(message):
+        path = os.path.join(tmpdir, "main.py")
+        with open(path, "a") as f:
+            f.write(message + "\n")
+        repo.index.add([path])
+        repo.index.commit(message)
+
+    commit("feat: initial")
+    repo.create_tag("v1.0.0")
+    commit("fix: crash")
+    repo.create_tag("v1.1.0")
+    commit("feat: unreleased work")
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+def spy_log_processes(monkeypatch):
+    """Record the git log processes started by iter_log_records."""
+    procs = []
+
+    def log(self, *args, **kwargs):
+        proc = self._call_process("log", *args, **kwargs)
+        if kwargs.get("as_process"):
+            procs.append(proc.proc)
+        return proc
+
+    monkeypatch.setattr(Git, "log", log, raising=False)
+    return procs
+
+
+class TestCancelToken:
+    """Test CancelToken."""
+
+    def test_deadline(self):
+        """После дедлайна check() бросает DeadlineExceeded."""
+        token = CancelToken(timeout=0.05)
+        token.check()
+        time.sleep(0.1)
+
+        with pytest.raises(DeadlineExceeded, match="Timed out after 0.05s"):
+            token.check()
+        assert token.remaining() == 0
+
+    def test_cancel_kills_tracked_process(self):
+        """Отмена убивает зарегистрированный процесс."""
+        token = CancelToken()
+        proc = subprocess.Popen(["sleep", "30"])
+        with token.track(proc):
+            token.cancel()
+            assert proc.wait(timeout=5) != 0
+
+        with pytest.raises(OperationCancelled):
+            token.check()
+
+    def test_poll(self):
+        """Отмена клиентом обнаруживается через poll."""
+        cancelled = []
+        token = CancelToken(poll=lambda: bool(cancelled))
+        assert not token.cancelled
+
+        cancelled.append(True)
+        time.sleep(0.15)
+
+        assert token.cancelled
+
+    def test_call_abandoned(self):
+        """Блокирующий вызов бросается при отмене."""
+        token = CancelToken(timeout=0.1)
+        release = threading.Event()
+
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            token.call(release.wait, 30)
+
+        assert time.monotonic() - start < 5
+        release.set()
+
+    def test_call_result(self):
+        """Результат и исключения вызова пробрасываются."""
+        token = CancelToken()
+
+        assert token.call(lambda: 42) == 42
+        with pytest.raises(ZeroDivisionError):
+            token.call(lambda: 1 / 0)
+
+    def test_scope(self):
+        """Токен доступен только внутри cancel_scope."""
+        token = CancelToken()
+        with cancel_scope(token):
+            assert current_token() is token
+            token.cancel()
+            with pytest.raises(OperationCancelled):
+                check_cancelled()
+
+        assert current_token() is None
+        check_cancelled()
+
+
+class TestGitCancellation:
+    """Test that cancellation stops git."""
+
+    def test_log_killed(self, temp_repo, monkeypatch):
+        """Отмена посреди обхода убивает git log."""
+        procs = spy_log_processes(monkeypatch)
+        token = CancelToken()
+
+        with cancel_scope(token):
+            records = iter_log_records(temp_repo, "HEAD")
+            next(records)
+            token.cancel()
+            with pytest.raises(OperationCancelled):
+                next(records)
+
+        assert procs[0].poll() is not None
+
+    def test_no_token(self, temp_repo):
+        """Без токена обход работает как раньше."""
+        assert len(list(iter_log_records(temp_repo, "HEAD"))) == 3
+
+
+class TestToolDeadlines:
+    """Test timeout results of the tools."""
+
+    def test_changelog_timeout(self, temp_repo):
+        """Превышение дедлайна возвращает понятную ошибку."""
+        result = generate_changelog(temp_repo.working_dir, timeout=0.000001)
+
+        assert result == "Error: Timed out after 1e-06s"
+
+    def test_partial_output(self, temp_repo, monkeypatch):
+        """С return_partial возвращаются уже готовые релизы."""
+        from mcp_server.services import pipeline
+
+        original = pipeline.iter_enriched_commits
+        calls = []
+
+        def slow_after_first(*args, **kwargs):
+            calls.append(args)
+            if len(calls) > 1:
+                current_token().cancel(DeadlineExceeded("Timed out after 5s"))
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(pipeline, "iter_enriched_commits", slow_after_first)
+
+        result = generate_changelog(temp_repo.working_dir, stream=True, return_partial=True)
+
+        assert result.startswith("Error: Timed out after 5s. Partial output:")
+        assert "unreleased work" in result
+        assert "crash" not in result
+
+    def test_environment_default(self, temp_repo, monkeypatch):
+        """Дедлайн по умолчанию берётся из TOOL_TIMEOUT."""
+        monkeypatch.setenv(TOOL_TIMEOUT_ENV, "0.000001")
+
+        assert generate_changelog(temp_repo.working_dir).startswith("Error: Timed out")
+
+        monkeypatch.setenv(TOOL_TIMEOUT_ENV, "soon")
+        assert "TOOL_TIMEOUT" in generate_changelog(temp_repo.working_dir)
+
+    def test_invalid_timeout(self, temp_repo):
+        """Неположительный timeout — ошибка."""
+        assert generate_changelog(temp_repo.working_dir, timeout=0).startswith("Error:")
+
+    def test_branch_changelogs_timeout(self, temp_repo):
+        """Ошибка дедлайна для нескольких веток — в ключе error."""
+        branch = temp_repo.active_branch.name
+
+        result = generate_branch_changelogs(temp_repo.working_dir, [branch], timeout=0.000001)
+
+        assert result == {"error": "Error: Timed out after 1e-06s"}
+
+    def test_ai_request_abandoned(self, temp_repo, monkeypatch):
+        """Зависший запрос к AI прерывается по дедлайну, шаблонные заметки — частичный результат."""
+        class HangingClient:
+            def generate_release_notes(self, **kwargs):
+                return current_token().call(time.sleep, 30)
+
+        monkeypatch.setattr(ai_module, "get_ai_client", lambda: HangingClient())
+
+        start = time.monotonic()
+        result = generate_release_notes(
+            temp_repo.working_dir, "v1.1.0", timeout=1, return_partial=True
+        )
+
+        assert time.monotonic() - start < 5
+        assert result.startswith("Error: Timed out after 1s. Partial output:")
+        assert "crash" in result
@@ -0,0 +1,146 @@
+"""Tests for persistent cat-file object service."""
+
+import os
+import shutil
+import signal
+import tempfile
+
+import pytest
+from git import Repo
+
+from mcp_server.services.analyzer import get_tags
+from mcp_server.services.cat_file import (
+    MODE_BATCH_CHECK,
+    CatFile,
+    CatFileWorker,
+    get_cat_file,
+)
+
+
+@pytest.fixture
+def temp_repo():
+    """Repository with two commits, an annotated and a lightweight tag."""
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    for i, message in enumerate(["feat: first", "fix: second"]):
+        path = os.path.join(tmpdir, f"file{i}.txt")
+        with open(path, "w") as f:
+            f.write(message)
+        repo.index.add([path])
+        repo.index.commit(message)
+        repo.create_tag(f"v1.{i}.0", message=f"Version 1.{i}.0" if i == 0 else None)
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+@pytest.fixture
+def cat_file(temp_repo):
+    """CatFile service closed after the test."""
+    service = CatFile(temp_repo)
+    yield service
+    service.close()
+
+
+class TestCatFile:
+    """Test CatFile reads."""
+
+    def test_read_commit(self, temp_repo, cat_file):
+        """Чтение коммита возвращает заголовок и содержимое."""
+        head = temp_repo.head.commit
+
+        [(info, content)] = cat_file.read(["HEAD"])
+
+        assert info.sha == head.hexsha
+        assert info.type == "commit"
+        assert info.size == len(content)
+        assert b"fix: second" in content
+
+    def test_batch_keeps_order_and_missing(self, temp_repo, cat_file):
+        """Пакетный запрос сохраняет порядок, отсутствующие объекты — None."""
+        result = cat_file.info(["v1.0.0", "nonexistent", "HEAD"])
+
+        assert result[0].type == "tag"
+        assert result[1] is None
+        assert result[2].sha == temp_repo.head.commit.hexsha
+
+    def test_resolve_peels_tags(self, temp_repo, cat_file):
+        """Аннотированный тег разыменовывается до коммита."""
+        resolved = cat_file.resolve(["v1.0.0^{commit}", "nope^{commit}"])
+
+        assert resolved == {"v1.0.0^{commit}": temp_repo.tags["v1.0.0"].commit.hexsha}
+
+    def test_many_objects_one_round_trip(self, temp_repo, cat_file):
+        """Большой пакет не блокируется на переполненных каналах."""
+        revs = ["HEAD", "HEAD~1"] * 2000
+
+        result = cat_file.read(revs)
+
+        assert len(result) == 4000
+        assert all(r is not None for r in result)
+
+    def test_sees_new_refs(self, temp_repo, cat_file):
+        """Работающий процесс видит теги, созданные после запуска."""
+        cat_file.info(["HEAD"])
+        temp_repo.create_tag("v2.0.0")
+
+        assert cat_file.resolve(["v2.0.0"]) != {}
+
+    def test_invalid_name(self, cat_file):
+        """Имя с переводом строки отклоняется."""
+        with pytest.raises(ValueError):
+            cat_file.read(["HEAD\nHEAD"])
+
+
+class TestCatFileWorker:
+    """Test worker lifecycle."""
+
+    def test_restart_after_death(self, temp_repo):
+        """Упавший процесс перезапускается, запрос повторяется."""
+        worker = CatFileWorker(temp_repo, MODE_BATCH_CHECK)
+        worker.request(["HEAD"])
+        worker._proc.proc.kill()
+        worker._proc.proc.wait()
+
+        [(info, _)] = worker.request(["HEAD"])
+
+        assert info.sha == temp_repo.head.commit.hexsha
+        worker.close()
+
+    def test_timeout(self, temp_repo):
+        """Нет ответа в срок — TimeoutError, процесс останавливается."""
+        worker = CatFileWorker(temp_repo, MODE_BATCH_CHECK, timeout=0.2)
+        worker.request(["HEAD"])
+        # A stopped (SIGSTOP) git never answers
+        worker._proc.proc.send_signal(signal.SIGSTOP)
+
+        with pytest.raises(TimeoutError):
+            worker.request(["HEAD"])
+        assert worker._proc is None
+
+        # The next request starts a fresh worker
+        assert worker.request(["HEAD"])[0] is not None
+        worker.close()
+
+
+class TestHelpers:
+    """Test module helpers."""
+
+    def test_pool_shared_per_repo(self, temp_repo):
+        """Один сервис на репозиторий."""
+        other = Repo(temp_repo.git_dir)
+
+        assert get_cat_file(temp_repo) is get_cat_file(other)
+        other.close()
+
+    def test_get_tags_dates(self, temp_repo):
+        """get_tags берёт дату аннотированного тега и коммита для лёгкого."""
+        tags = {t["name"]: t for t in get_tags(temp_repo)}
+
+        assert tags["v1.0.0"]["hash"] == temp_repo.tags["v1.0.0"].commit.hexsha
+        assert tags["v1.0.0"]["date"].timestamp() == temp_repo.tags["v1.0.0"].tag.tagged_date
+        assert tags["v1.1.0"]["date"].timestamp() == temp_repo.head.commit.committed_date
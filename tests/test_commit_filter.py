@@ -0,0 +1,229 @@
+"""Tests for commit filters pushed down into git log."""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+from git import Repo
+
+from mcp_server.server import generate_changelog, generate_release_notes
+from mcp_server.services import analyzer as analyzer_module
+from mcp_server.services.analyzer import analyze_repo
+from mcp_server.services.commit_filter import CommitFilter, limit
+
+
+@pytest.fixture
+def temp_repo():
+    """
+    Two authors, one breaking footer, a WIP commit and two releases.
+
+        2023: feat(api) alice, fix bob            -> v1.0.0
+        2024: feat! bob, fix + BREAKING alice,
+              WIP alice, docs bob                 -> v2.0.0
+        2024: feat alice                          -> Unreleased
+    """
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+
+    def commit(message, author, date):
+        path = os.path.join(tmpdir, "main.py")
+        with open(path, "a") as f:
+            f.write(message + "\n")
+        repo.index.add([path])
+        with repo.config_writer() as config:
+            config.set_value("user", "name", author)
+            config.set_value("user", "email", f"{author}@example.com")
+        repo.index.commit(message, commit_date=date, author_date=date)
+
+    commit("feat(api): add auth", "alice", "2023-03-01T10:00:00")
+    commit("fix: crash on start", "bob", "2023-04-01T10:00:00")
+    repo.create_tag("v1.0.0")
+    commit("feat!: new config format", "bob", "2024-02-01T10:00:00")
+    commit("fix: drop legacy flag\n\nBREAKING CHANGE: --legacy removed", "alice", "2024-03-01T10:00:00")
+    commit("WIP: fix: half done", "alice", "2024-03-02T10:00:00")
+    commit("docs: feat: mention in body\n\nfeat: not a header", "bob", "2024-03-03T10:00:00")
+    repo.create_tag("v2.0.0")
+    commit("feat: plugins", "alice", "2024-05-01T10:00:00")
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+def descriptions(result):
+    return sorted(c.parsed.description for c in result["commits"])
+
+
+class TestCommitFilter:
+    """Test CommitFilter construction and compilation."""
+
+    def test_build_validates(self):
+        """Неизвестный тип и отрицательный лимит — ValueError."""
+        with pytest.raises(ValueError, match="featt"):
+            CommitFilter.build(commit_types=["featt"])
+        with pytest.raises(ValueError, match="max_commits"):
+            CommitFilter.build(max_commits=-1)
+
+    def test_inactive_by_default(self):
+        """Пустой фильтр ничего не отбрасывает и не даёт аргументов."""
+        assert not CommitFilter.build().active
+        assert CommitFilter().log_args() == []
+
+    def test_log_args(self):
+        """Фильтр компилируется в опции git log."""
+        spec = CommitFilter.build(
+            commit_types=["feat", "fix"], authors=["a.b"], breaking_only=True,
+            since="1 year ago", until="2024-01-01",
+        )
+
+        assert spec.log_args() == [
+            "--extended-regexp",
+            "--all-match",
+            "--grep=^(feat|fix)(\\([^)]*\\))?!?:",
+            "--grep=^((feat|fix|perf|refactor|docs|test|style|chore|build|ci|revert)"
+            "(\\([^)]*\\))?!:|BREAKING([ -]CHANGE)?:)",
+            "--author=a\\.b",
+            "--since=1 year ago",
+            "--until=2024-01-01",
+        ]
+
+    def test_first_parent_keeps_message_filters_in_python(self):
+        """С first_parent шаблоны сообщений не передаются git."""
+        spec = CommitFilter.build(commit_types=["feat"], since="2024-01-01")
+
+        assert spec.log_args(first_parent=True) == ["--since=2024-01-01"]
+
+    def test_limit_closes_source(self):
+        """После лимита источник закрывается."""
+        closed = []
+
+        def source():
+            try:
+                yield from range(10)
+            finally:
+                closed.append(True)
+
+        assert list(limit(source(), 3)) == [0, 1, 2]
+        assert closed == [True]
+        assert list(limit(range(5), 2, lambda x: x % 2)) == [1, 3]
+
+
+class TestAnalyzeRepoFiltered:
+    """Test analyze_repo with commit filters."""
+
+    def test_types(self, temp_repo):
+        """Только указанные типы; строки тела и WIP не считаются."""
+        result = analyze_repo(
+            temp_repo.working_dir, commit_filter=CommitFilter.build(commit_types=["fix"])
+        )
+
+        assert descriptions(result) == ["crash on start", "drop legacy flag"]
+
+    def test_breaking_only(self, temp_repo):
+        """Breaking changes по '!' и по футеру."""
+        result = analyze_repo(
+            temp_repo.working_dir, commit_filter=CommitFilter.build(breaking_only=True)
+        )
+
+        assert descriptions(result) == ["drop legacy flag", "new config format"]
+
+    def test_breaking_only_hyphen_trailer(self, temp_repo):
+        """Трейлер BREAKING-CHANGE не отсекается git grep."""
+        temp_repo.git.commit(
+            "--allow-empty", "-m", "refactor: new storage\n\nBREAKING-CHANGE: data migrated"
+        )
+
+        result = analyze_repo(
+            temp_repo.working_dir, commit_filter=CommitFilter.build(breaking_only=True)
+        )
+
+        assert descriptions(result) == ["drop legacy flag", "new config format", "new storage"]
+
+    def test_authors_and_dates(self, temp_repo):
+        """Фильтр по автору и периоду."""
+        spec = CommitFilter.build(
+            authors=["bob@example.com"], since="2024-01-01", until="2024-12-31"
+        )
+
+        result = analyze_repo(temp_repo.working_dir, commit_filter=spec)
+
+        assert descriptions(result) == ["feat: mention in body", "new config format"]
+
+    def test_max_commits(self, temp_repo):
+        """Лимит оставляет самые новые коммиты."""
+        result = analyze_repo(
+            temp_repo.working_dir,
+            commit_filter=CommitFilter.build(commit_types=["feat"], max_commits=2),
+        )
+
+        assert descriptions(result) == ["new config format", "plugins"]
+
+    def test_git_drops_non_matching(self, temp_repo, monkeypatch):
+        """В Python разбираются только кандидаты, отобранные git."""
+        parsed = []
+        original = analyzer_module.parse_commit
+        monkeypatch.setattr(
+            analyzer_module, "parse_commit",
+            lambda message, *args: parsed.append(bytes(message)) or original(message, *args),
+        )
+
+        analyze_repo(
+            temp_repo.working_dir, use_cache=False,
+            commit_filter=CommitFilter.build(breaking_only=True, since="2024-01-01"),
+        )
+
+        assert len(parsed) == 2
+
+    def test_graph_covers_range(self, temp_repo):
+        """Граф содержит все коммиты диапазона, а не только отобранные."""
+        result = analyze_repo(
+            temp_repo.working_dir, fields={"commits", "graph"},
+            commit_filter=CommitFilter.build(commit_types=["fix"]),
+        )
+
+        assert len(result["commits"]) == 2
+        assert len(result["graph"]) == 7
+
+    def test_cache_keyed_by_filter(self, temp_repo):
+        """Разные фильтры не делят запись кэша."""
+        path = temp_repo.working_dir
+
+        feats = analyze_repo(path, commit_filter=CommitFilter.build(commit_types=["feat"]))
+        fixes = analyze_repo(path, commit_filter=CommitFilter.build(commit_types=["fix"]))
+
+        assert descriptions(feats) != descriptions(fixes)
+
+
+class TestToolsFiltered:
+    """Test commit filters in tools."""
+
+    def test_changelog_grouped_by_release(self, temp_repo):
+        """Отобранные коммиты попадают в свои релизы."""
+        changelog = generate_changelog(temp_repo.working_dir, breaking_only=True)
+
+        assert "new config format" in changelog
+        assert "plugins" not in changelog
+        assert changelog.index("## v2.0.0") < changelog.index("drop legacy flag")
+        assert "v1.0.0" not in changelog
+
+    def test_stream_matches(self, temp_repo):
+        """Потоковый режим учитывает фильтр и общий лимит так же."""
+        path = temp_repo.working_dir
+        options = dict(commit_types=["feat", "fix"], max_commits=3)
+
+        assert generate_changelog(path, stream=True, **options) == generate_changelog(path, **options)
+
+    def test_release_notes(self, temp_repo):
+        """Release notes по одному автору."""
+        notes = generate_release_notes(
+            temp_repo.working_dir, "v2.0.0", use_ai=False, authors=["alice"]
+        )
+
+        assert "drop legacy flag" in notes
+        assert "new config format" not in notes
+
+    def test_invalid_filter(self, temp_repo):
+        """Неверный фильтр — текст ошибки."""
+        assert generate_changelog(temp_repo.working_dir, commit_types=["nope"]).startswith("Error:")
@@ -0,0 +1,175 @@
+"""Tests for persistent commit index."""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+from git import Repo
+
+from mcp_server.services import commit_index
+from mcp_server.services.analyzer import (
+    BACKEND_INDEX,
+    BACKEND_LOG,
+    InvalidRepoError,
+    analyze_repo,
+    get_commits_between,
+)
+from mcp_server.services.commit_index import CommitIndex
+
+
+def _commit(repo: Repo, name: str, message: str) -> str:
+    """Write a file and commit it."""
+    path = os.path.join(repo.working_dir, name)
+    with open(path, "a") as f:
+        f.write(message + "\n")
+    repo.index.add([path])
+    return repo.index.commit(message).hexsha
+
+
+@pytest.fixture
+def temp_repo():
+    """Repository with a few commits and a tag."""
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(os.path.join(tmpdir, "repo"))
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+
+    _commit(repo, "a.txt", "feat: first")
+    _commit(repo, "b.txt", "fix: second")
+    repo.create_tag("v1.0.0", message="Version 1.0.0")
+    _commit(repo, "a.txt", "WIP: draft")
+    _commit(repo, "c.txt", "docs: third")
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+@pytest.fixture
+def index_dir():
+    """Temporary index directory."""
+    tmpdir = tempfile.mkdtemp()
+    yield tmpdir
+    shutil.rmtree(tmpdir)
+
+
+@pytest.fixture
+def walked(monkeypatch):
+    """Record revision ranges walked by the index."""
+    ranges = []
+    original = commit_index.iter_log_records
+
+    def recording(repo, rev_range, *args, **kwargs):
+        ranges.append(rev_range)
+        return original(repo, rev_range, *args, **kwargs)
+
+    monkeypatch.setattr(commit_index, "iter_log_records", recording)
+    return ranges
+
+
+class TestCommitIndex:
+    """Test CommitIndex."""
+
+    def test_matches_log_backend(self, temp_repo, index_dir):
+        """Индекс возвращает те же коммиты, что и git log."""
+        with CommitIndex(temp_repo, index_dir) as index:
+            indexed = index.get_commits("HEAD")
+
+        assert indexed == get_commits_between(temp_repo, backend=BACKEND_LOG)
+
+    def test_repeat_request_does_not_walk(self, temp_repo, index_dir, walked):
+        """Повторный запрос без новых коммитов не запускает git log."""
+        with CommitIndex(temp_repo, index_dir) as index:
+            index.get_commits("HEAD", include_stats=False)
+        with CommitIndex(temp_repo, index_dir) as index:
+            commits = index.get_commits("HEAD", include_stats=False)
+
+        assert len(walked) == 1
+        assert len(commits) == 3
+
+    def test_older_schema_rebuilt(self, temp_repo, index_dir, walked):
+        """Индекс старой версии схемы строится заново."""
+        with CommitIndex(temp_repo, index_dir) as index:
+            index.get_commits("HEAD", include_stats=False)
+            index.conn.execute(f"PRAGMA user_version = {commit_index.SCHEMA_VERSION - 1}")
+        with CommitIndex(temp_repo, index_dir) as index:
+            commits = index.get_commits("HEAD", include_stats=False)
+
+        assert len(walked) == 2
+        assert len(commits) == 3
+
+    def test_incremental_walk(self, temp_repo, index_dir, walked):
+        """Новые коммиты читаются диапазоном last_tip..HEAD."""
+        with CommitIndex(temp_repo, index_dir) as index:
+            old_tip = index.update("HEAD")
+        new_sha = _commit(temp_repo, "d.txt", "feat: fourth")
+
+        with CommitIndex(temp_repo, index_dir) as index:
+            commits = index.get_commits("HEAD", include_stats=False)
+
+        assert walked[-1] == f"{old_tip}..{new_sha}"
+        assert commits[0].hash == new_sha
+        assert len(commits) == 4
+
+    def test_force_push_repaired(self, temp_repo, index_dir, walked):
+        """Переписанная история обнаруживается и исправляется."""
+        with CommitIndex(temp_repo, index_dir) as index:
+            index.update("HEAD")
+        dropped = temp_repo.head.commit.hexsha
+        temp_repo.git.reset("--hard", "HEAD~1")
+        new_sha = _commit(temp_repo, "e.txt", "fix: rewritten")
+
+        with CommitIndex(temp_repo, index_dir) as index:
+            commits = index.get_commits("HEAD")
+
+        hashes = [c.hash for c in commits]
+        assert dropped not in hashes
+        assert new_sha in hashes
+        assert commits == get_commits_between(temp_repo, backend=BACKEND_LOG)
+
+    def test_stats_filled_on_demand(self, temp_repo, index_dir):
+        """Статистика дочитывается для коммитов, проиндексированных без неё."""
+        with CommitIndex(temp_repo, index_dir) as index:
+            headers = index.get_commits("HEAD", include_stats=False)
+            full = index.get_commits("HEAD", include_stats=True)
+
+        assert all(c.files_changed == 0 for c in headers)
+        assert all(c.files_changed == 1 for c in full)
+
+    def test_refs_indexed_separately(self, temp_repo, index_dir):
+        """Теги и ветки индексируются независимо."""
+        with CommitIndex(temp_repo, index_dir) as index:
+            tagged = index.get_commits("v1.0.0", include_stats=False)
+            head = index.get_commits("HEAD", include_stats=False)
+
+        assert len(tagged) == 2
+        assert len(head) == 3
+
+    def test_invalid_ref(self, temp_repo, index_dir):
+        """Невалидный ref вызывает InvalidRepoError."""
+        with CommitIndex(temp_repo, index_dir) as index:
+            with pytest.raises(InvalidRepoError):
+                index.get_commits("nonexistent")
+
+
+class TestIndexBackend:
+    """Test index backend in analyzer."""
+
+    def test_env_enables_index(self, temp_repo, index_dir, monkeypatch):
+        """CHANGELOG_INDEX_DIR включает индекс по умолчанию."""
+        monkeypatch.setenv("CHANGELOG_INDEX_DIR", index_dir)
+
+        result = analyze_repo(temp_repo.working_dir)
+
+        assert result["summary"]["total_commits"] == 3
+        assert any(name.endswith(".sqlite") for name in os.listdir(index_dir))
+
+    def test_range_falls_back_to_log(self, temp_repo, index_dir, monkeypatch):
+        """Диапазоны читаются через git log."""
+        monkeypatch.setenv("CHANGELOG_INDEX_DIR", index_dir)
+
+        commits = get_commits_between(temp_repo, "v1.0.0", "HEAD", backend=BACKEND_INDEX)
+
+        assert [c.parsed.type for c in commits] == ["docs"]
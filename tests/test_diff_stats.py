@@ -0,0 +1,164 @@
+"""Tests for tag-to-tag diff statistics."""
+
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+from git import Repo
+
+from mcp_server.models.changelog import DiffStats
+from mcp_server.server import generate_changelog, generate_release_notes
+from mcp_server.services import diff_stats as diff_stats_module
+from mcp_server.services.analyzer import InvalidRepoError
+from mcp_server.services.diff_stats import get_diff_stats, get_range_stats, parse_shortstat
+
+
+@pytest.fixture
+def temp_repo():
+    """
+    Two releases and unreleased work.
+
+    v1.0.0: README (2 lines)
+    v1.1.0: +3 lines in main.py, one line added and reverted
+    HEAD:   README rewritten (1 line changed)
+    """
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+
+    def commit(name, content, message):
+        path = os.path.join(tmpdir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        repo.index.add([path])
+        repo.index.commit(message)
+
+    commit("README.md", "# Test\nintro\n", "docs: initial README")
+    repo.create_tag("v1.0.0")
+    commit("main.py", "a\nb\n", "feat: add main")
+    commit("main.py", "a\nb\ntemp\n", "feat: temporary")
+    commit("main.py", "a\nb\n", "revert: temporary")
+    commit("main.py", "a\nb\nc\n", "feat: add c")
+    repo.create_tag("v1.1.0")
+    commit("README.md", "# Test\noutro\n", "docs: rewrite intro")
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+class TestParseShortstat:
+    """Test parse_shortstat."""
+
+    def test_full(self):
+        """Файлы, добавления и удаления."""
+        output = " 3 files changed, 10 insertions(+), 2 deletions(-)"
+
+        assert parse_shortstat(output) == DiffStats(3, 10, 2)
+
+    def test_singular_and_partial(self):
+        """Единственное число и отсутствующие части."""
+        assert parse_shortstat(" 1 file changed, 1 deletion(-)") == DiffStats(1, 0, 1)
+        assert parse_shortstat(" 1 file changed, 1 insertion(+)") == DiffStats(1, 1, 0)
+
+    def test_empty(self):
+        """Пустой diff — нули."""
+        assert parse_shortstat("") == DiffStats()
+
+
+class TestGetDiffStats:
+    """Test get_diff_stats."""
+
+    def test_release_is_net_change(self, temp_repo):
+        """Статистика релиза — итоговое изменение, откаты не считаются."""
+        assert get_diff_stats(temp_repo, "v1.0.0", "v1.1.0") == DiffStats(1, 3, 0)
+
+    def test_from_root(self, temp_repo):
+        """Без начала диапазона — от корня истории."""
+        assert get_diff_stats(temp_repo, None, "v1.0.0") == DiffStats(1, 2, 0)
+
+    def test_range(self, temp_repo):
+        """Диапазон в форме base..tip, пустой tip — HEAD."""
+        assert get_range_stats(temp_repo, "v1.1.0..HEAD") == DiffStats(1, 1, 1)
+        assert get_range_stats(temp_repo, "v1.1.0..") == DiffStats(1, 1, 1)
+        assert get_range_stats(temp_repo, "v1.0.0") == DiffStats(1, 2, 0)
+
+    def test_merge_base_semantics(self, temp_repo):
+        """Изменения основной ветки не попадают в статистику ветки."""
+        main = temp_repo.active_branch.name
+        temp_repo.git.checkout("-b", "feature", "v1.1.0")
+        path = os.path.join(temp_repo.working_dir, "feature.py")
+        with open(path, "w") as f:
+            f.write("x\n")
+        temp_repo.index.add([path])
+        temp_repo.index.commit("feat: feature")
+
+        assert get_diff_stats(temp_repo, main, "feature") == DiffStats(1, 1, 0)
+
+    def test_cached_by_sha_pair(self, temp_repo, monkeypatch):
+        """Повторный запрос по тем же SHA не запускает git diff."""
+        get_diff_stats(temp_repo, "v1.0.0", "v1.1.0")
+        monkeypatch.setattr(diff_stats_module, "parse_shortstat", None)
+
+        assert get_diff_stats(temp_repo, "v1.0.0", "v1.1.0") == DiffStats(1, 3, 0)
+
+    def test_invalid_ref(self, temp_repo):
+        """Неизвестный ref — InvalidRepoError."""
+        with pytest.raises(InvalidRepoError, match="nope"):
+            get_diff_stats(temp_repo, "nope", "HEAD")
+
+
+class TestToolsDiffStats:
+    """Test diff stats in tool output."""
+
+    def test_json_changelog(self, temp_repo):
+        """В JSON каждая версия получает итоговую статистику."""
+        output = generate_changelog(temp_repo.working_dir, output_format="json", diff_stats=True)
+
+        stats = {v["version"]: v["stats"] for v in json.loads(output)["changelog"]}
+        assert stats["Unreleased"]["insertions"] == 1
+        assert stats["v1.1.0"]["files_changed"] == 1
+        assert stats["v1.1.0"]["insertions"] == 3
+        assert stats["v1.0.0"]["insertions"] == 2
+
+    def test_stream_matches(self, temp_repo):
+        """Потоковый режим даёт ту же статистику."""
+        def stats(output):
+            return [v["stats"] for v in json.loads(output)["changelog"]]
+
+        path = temp_repo.working_dir
+        assert stats(generate_changelog(path, output_format="json", diff_stats=True, stream=True)) == \
+            stats(generate_changelog(path, output_format="json", diff_stats=True))
+
+    def test_off_by_default(self, temp_repo):
+        """Без diff_stats статистика строк не выводится."""
+        output = generate_changelog(temp_repo.working_dir, output_format="json")
+
+        assert "insertions" not in output
+
+    @pytest.mark.parametrize("options", [
+        {"commit_types": ["feat"]},
+        {"authors": ["Test User"]},
+        {"breaking_only": True},
+        {"since": "2024-01-01"},
+        {"max_commits": 1},
+    ])
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_not_with_commit_filters(self, temp_repo, options, stream):
+        """diff_stats с фильтрами коммитов — ошибка: diff покрывает весь релиз."""
+        output = generate_changelog(
+            temp_repo.working_dir, output_format="json", diff_stats=True, stream=stream, **options
+        )
+
+        assert output == "Error: diff_stats cannot be combined with commit filters"
+
+    def test_release_notes(self, temp_repo):
+        """Release notes показывают строки релиза."""
+        notes = generate_release_notes(temp_repo.working_dir, "v1.1.0", use_ai=False)
+
+        assert "**Files changed:** 1" in notes
+        assert "**Lines:** +3 / -0" in notes
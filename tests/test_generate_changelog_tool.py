@@ -6,6 +6,7 @@ Tests cover:
 - Filters (from_version, include_unreleased)
 - Error handling (invalid repo, empty path, path injection)
 - Edge cases (single commit, no tags)
+- Progress and partial output notifications over an MCP client
 """
 
 import os
@@ -13,10 +14,12 @@ import shutil
 import tempfile
 from datetime import datetime
 
+import anyio
 import pytest
+from fastmcp import Client
 from git import Repo
 
-from mcp_server.server import generate_changelog
+from mcp_server.server import generate_changelog, mcp
 
 
 # =============================================================================
@@ -296,6 +299,52 @@ class TestGenerateChangelogFilters:
         # v1.1.0 should be included (string comparison "v1.1.0" >= "v1.1.0" is True)
         # Note: Due to date-based grouping, v1.1.0 may contain commits
 
+    def test_generate_changelog_with_to_version(self, temp_repo_with_tags):
+        """Generate changelog up to a specific version (no Unreleased)."""
+        # Act
+        result = generate_changelog(temp_repo_with_tags, output_format="markdown", to_version="v1.0.0")
+
+        # Assert
+        assert "## v1.0.0" in result
+        assert "## v1.1.0" not in result
+        assert "## Unreleased" not in result
+        assert "add helper function" not in result
+
+    def test_generate_changelog_version_range_walk(self, temp_repo_with_tags, monkeypatch):
+        """Version bounds are pushed down into the git revision range."""
+        # Arrange
+        from mcp_server.services import analyzer
+        ranges = []
+        original = analyzer.get_commits_between
+
+        def recording(repo, from_ref=None, to_ref=None, *args, **kwargs):
+            ranges.append((from_ref, to_ref))
+            return original(repo, from_ref, to_ref, *args, **kwargs)
+
+        monkeypatch.setattr(analyzer, "get_commits_between", recording)
+
+        # Act
+        result = generate_changelog(temp_repo_with_tags, from_version="v1.1.0", to_version="v1.1.0")
+
+        # Assert
+        assert ranges == [("v1.0.0", "v1.1.0")]
+        assert "## v1.1.0" in result
+        assert "## v1.0.0" not in result
+
+    def test_generate_changelog_from_version_semver(self, temp_repo_with_tags):
+        """from_version uses semver ordering, not string comparison."""
+        # Arrange
+        repo = Repo(temp_repo_with_tags)
+        repo.create_tag("v1.10.0", message="Version 1.10.0")
+        repo.close()
+
+        # Act - "v1.10.0" >= "v1.9.0" is False as strings
+        result = generate_changelog(temp_repo_with_tags, from_version="v1.9.0")
+
+        # Assert
+        assert "## v1.10.0" in result
+        assert "## v1.1.0" not in result
+
     def test_generate_changelog_exclude_unreleased(self, temp_repo_with_tags):
         """Generate changelog excluding unreleased changes."""
         # Arrange
@@ -538,3 +587,91 @@ class TestGenerateChangelogIntegration:
         # Assert
         assert result is not None
         assert "Contributors" in result or "contributors" in result.lower()
+
+
+# =============================================================================
+# Progress Notification Tests
+# =============================================================================
+
+def _call_with_notifications(arguments: dict) -> tuple[str, list, list]:
+    """Call generate_changelog through an in-memory MCP client."""
+    progress, partials = [], []
+
+    async def on_progress(value, total, message):
+        progress.append((value, total, message))
+
+    async def on_log(params):
+        if params.logger == "changelog.partial":
+            partials.append(params.data["msg"])
+
+    async def run():
+        async with Client(mcp, log_handler=on_log) as client:
+            result = await client.call_tool(
+                "generate_changelog", arguments, progress_handler=on_progress
+            )
+            return result.content[0].text
+
+    text = anyio.run(run)
+    return text, progress, partials
+
+
+class TestGenerateChangelogProgress:
+    """Test progress reporting and partial output."""
+
+    def test_progress_stages(self, temp_repo_with_tags):
+        """Обычный режим сообщает этапы: теги, коммиты, версии, рендер."""
+        text, progress, partials = _call_with_notifications(
+            {"repo_path": temp_repo_with_tags}
+        )
+
+        assert text == generate_changelog(temp_repo_with_tags)
+        assert [p[0] for p in progress] == [1, 2, 3, 4]
+        assert progress[-1][2].endswith("bytes rendered")
+        assert partials == []
+
+    def test_stream_partials(self, temp_repo_with_tags):
+        """stream=True присылает вывод по частям и прогресс по релизам."""
+        text, progress, partials = _call_with_notifications(
+            {"repo_path": temp_repo_with_tags, "stream": True}
+        )
+
+        assert "".join(partials) == text
+        assert len(partials) > 1
+        values = [p[0] for p in progress]
+        assert values == sorted(set(values))
+        assert values[-1] == progress[-1][1]
+        assert "commits walked" in progress[-1][2]
+
+    def test_direct_call_without_context(self, temp_repo_with_tags):
+        """Прямой вызов без контекста работает как раньше."""
+        result = generate_changelog(temp_repo_with_tags, stream=True)
+
+        assert "## v1.1.0" in result
+
+
+class TestGenerateChangelogPaths:
+    """Test the paths filter."""
+
+    def test_only_commits_touching_paths(self, temp_repo_with_tags):
+        """Только коммиты по путям, релизы — по тегам всего репозитория."""
+        result = generate_changelog(temp_repo_with_tags, paths=["README.md"])
+
+        assert "initial README" in result
+        assert "add main script" not in result
+        assert "## v1.0.0" in result
+        assert "## v1.1.0" not in result
+        assert "Unreleased" not in result
+
+    def test_stream_matches(self, temp_repo_with_tags):
+        """Потоковый путь даёт тот же результат."""
+        expected = generate_changelog(temp_repo_with_tags, paths=["main.py"])
+
+        assert generate_changelog(temp_repo_with_tags, paths=["main.py"], stream=True) == expected
+        assert "fix output" in expected
+        assert "add helper function" not in expected
+
+    def test_not_with_diff_stats(self, temp_repo_with_tags):
+        """diff_stats с paths — ошибка."""
+        result = generate_changelog(temp_repo_with_tags, paths=["main.py"], diff_stats=True)
+
+        assert result.startswith("Error:")
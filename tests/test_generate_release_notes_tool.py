@@ -0,0 +1,314 @@
+"""Tests for generate_release_notes MCP tool.
+
+Tests cover:
+- Notes for tagged versions and Unreleased
+- Range-scoped history walk (version tag minus older releases)
+- Custom from_ref/to_ref ranges
+- Error handling (unknown version, missing version)
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+from git import Repo
+
+from mcp_server.server import generate_changelog, generate_release_notes
+from mcp_server.services import analyzer, pipeline
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture
+def temp_repo_with_tags():
+    """Create a repository with two tags, unreleased work and a feature branch."""
+    tmpdir = tempfile.mkdtemp()
+    repo_path = os.path.join(tmpdir, "test_repo")
+    os.makedirs(repo_path)
+
+    repo = Repo.init(repo_path)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+
+    def commit(name, message, date):
+        path = os.path.join(repo_path, name)
+        with open(path, "a") as f:
+            f.write(message + "\n")
+        repo.index.add([path])
+        repo.index.commit(message, commit_date=date, author_date=date)
+
+    commit("README.md", "docs: initial README", "2024-01-01T10:00:00")
+    commit("main.py", "feat: add main script", "2024-01-02T10:00:00")
+    repo.create_tag("v1.0.0", message="Version 1.0.0")
+
+    commit("main.py", "fix: fix output", "2024-01-03T10:00:00")
+    commit("main.py", "feat!: refactor main function", "2024-01-04T10:00:00")
+    repo.create_tag("v1.1.0", message="Version 1.1.0")
+
+    commit("utils.py", "feat: add helper function", "2024-01-05T10:00:00")
+    main_branch = repo.active_branch.name
+
+    repo.git.checkout("-b", "feature/login")
+    commit("login.py", "feat(auth): add login form", "2024-01-06T10:00:00")
+    repo.git.checkout(main_branch)
+
+    yield repo_path
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+@pytest.fixture
+def maintenance_repo():
+    """v1.0.1 tagged on a maintenance branch merged back before v1.2.0."""
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    main = repo.active_branch.name
+
+    def commit(name, message, day):
+        path = os.path.join(tmpdir, name)
+        with open(path, "a") as f:
+            f.write(message + "\n")
+        repo.index.add([path])
+        date = f"2024-01-{day:02d}T10:00:00"
+        repo.index.commit(message, commit_date=date, author_date=date)
+
+    commit("main.py", "feat: initial", 1)
+    repo.create_tag("v1.0.0")
+    repo.git.checkout("-b", "maint")
+    commit("fix.py", "fix: backported crash", 2)
+    repo.create_tag("v1.0.1")
+    repo.git.checkout(main)
+    commit("main.py", "feat: new api", 3)
+    repo.create_tag("v1.1.0")
+    repo.git.merge("maint", "--no-ff", "-m", "Merge branch 'maint'")
+    commit("main.py", "feat: search", 5)
+    repo.create_tag("v1.2.0")
+    commit("main.py", "feat: export", 6)
+
+    yield tmpdir
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+@pytest.fixture
+def walked_revs(monkeypatch):
+    """Record the revisions of every release walk."""
+    walks = []
+    original = pipeline.iter_enriched_commits
+
+    def recording(repo, rev_range, *args, **kwargs):
+        walks.append(rev_range)
+        return original(repo, rev_range, *args, **kwargs)
+
+    monkeypatch.setattr(pipeline, "iter_enriched_commits", recording)
+    return walks
+
+
+@pytest.fixture
+def walked_ranges(monkeypatch):
+    """Record (from_ref, to_ref) of every history walk."""
+    ranges = []
+    original = analyzer.get_commits_between
+
+    def recording(repo, from_ref=None, to_ref=None, *args, **kwargs):
+        ranges.append((from_ref, to_ref))
+        return original(repo, from_ref, to_ref, *args, **kwargs)
+
+    monkeypatch.setattr(analyzer, "get_commits_between", recording)
+    return ranges
+
+
+# =============================================================================
+# Version Tests
+# =============================================================================
+
+class TestGenerateReleaseNotesVersions:
+    """Test release notes for tagged versions."""
+
+    def test_release_notes_for_tag(self, temp_repo_with_tags):
+        """Notes contain only commits of that release."""
+        result = generate_release_notes(temp_repo_with_tags, "v1.1.0", use_ai=False)
+
+        assert "# Release Notes: v1.1.0" in result
+        assert "fix output" in result
+        assert "refactor main function" in result
+        assert "add main script" not in result
+        assert "add helper function" not in result
+        assert "**Date:**" in result
+
+    def test_release_notes_oldest_tag(self, temp_repo_with_tags):
+        """The oldest release covers history up to its tag."""
+        result = generate_release_notes(temp_repo_with_tags, "v1.0.0", use_ai=False)
+
+        assert "add main script" in result
+        assert "fix output" not in result
+
+    def test_release_notes_unreleased(self, temp_repo_with_tags):
+        """Unreleased covers commits after the newest tag."""
+        result = generate_release_notes(temp_repo_with_tags, "Unreleased", use_ai=False)
+
+        assert "add helper function" in result
+        assert "refactor main function" not in result
+
+    def test_paths(self, temp_repo_with_tags):
+        """С paths — только коммиты, затрагивающие эти пути."""
+        result = generate_release_notes(
+            temp_repo_with_tags, "v1.0.0", use_ai=False, paths=["main.py"]
+        )
+
+        assert "add main script" in result
+        assert "**Commits:** 1" in result
+
+    def test_walks_only_release_range(self, temp_repo_with_tags, walked_revs):
+        """History walk is scoped to the version tag minus older releases."""
+        generate_release_notes(temp_repo_with_tags, "v1.1.0", use_ai=False)
+
+        repo = Repo(temp_repo_with_tags)
+        assert walked_revs == [[
+            repo.commit("v1.1.0").hexsha, f"^{repo.commit('v1.0.0').hexsha}"
+        ]]
+        repo.close()
+
+    @pytest.mark.parametrize("version", ["v1.0.1", "v1.1.0", "v1.2.0", "Unreleased"])
+    def test_grouped_like_changelog(self, maintenance_repo, version):
+        """Исправление из v1.0.1 не повторяется в следующих релизах."""
+        result = generate_release_notes(maintenance_repo, version, use_ai=False)
+
+        changelog = generate_changelog(maintenance_repo)
+        section = changelog.split(f"## {version}")[1].split("\n## ")[0]
+        assert ("backported crash" in result) == (version == "v1.0.1")
+        assert ("backported crash" in section) == (version == "v1.0.1")
+        assert f"**Commits:** {section.count('- ')}" in result
+
+    def test_unmerged_release(self, maintenance_repo):
+        """Релиз вне истории HEAD исключает только содержащиеся в нём релизы."""
+        repo = Repo(maintenance_repo)
+        main = repo.active_branch.name
+        repo.git.checkout("-b", "maint-1.1", "v1.1.0")
+        with open(os.path.join(maintenance_repo, "fix.py"), "a") as f:
+            f.write("hotfix\n")
+        repo.index.add([os.path.join(maintenance_repo, "fix.py")])
+        repo.index.commit("fix: hotfix")
+        repo.create_tag("v1.1.1")
+        repo.git.checkout(main)
+        repo.close()
+
+        result = generate_release_notes(maintenance_repo, "v1.1.1", use_ai=False)
+
+        assert "hotfix" in result
+        assert "**Commits:** 1" in result
+
+    def test_explicit_from_ref_kept(self, temp_repo_with_tags, walked_ranges):
+        """Явный from_ref не заменяется предыдущим тегом."""
+        result = generate_release_notes(
+            temp_repo_with_tags, "v1.1.0", use_ai=False, from_ref="v1.0.0~1"
+        )
+
+        repo = Repo(temp_repo_with_tags)
+        start = repo.commit("v1.0.0~1").hexsha
+        repo.close()
+        assert walked_ranges == [(start, "v1.1.0")]
+        assert "add main script" in result
+        assert "**Date:**" in result
+
+    def test_explicit_from_ref_unreleased(self, temp_repo_with_tags, walked_ranges):
+        """Для Unreleased явный from_ref тоже сохраняется."""
+        generate_release_notes(
+            temp_repo_with_tags, "Unreleased", use_ai=False, from_ref="v1.0.0"
+        )
+
+        repo = Repo(temp_repo_with_tags)
+        start = repo.commit("v1.0.0").hexsha
+        repo.close()
+        assert walked_ranges == [(start, "HEAD")]
+
+
+# =============================================================================
+# Custom Range Tests
+# =============================================================================
+
+class TestGenerateReleaseNotesRanges:
+    """Test release notes for custom ranges."""
+
+    def test_branch_against_main(self, temp_repo_with_tags):
+        """Feature branch since its merge-base with main."""
+        repo = Repo(temp_repo_with_tags)
+        main_branch = repo.active_branch.name
+        repo.close()
+
+        result = generate_release_notes(
+            temp_repo_with_tags,
+            from_ref=main_branch,
+            to_ref="feature/login",
+            use_ai=False,
+        )
+
+        assert "# Release Notes: feature/login" in result
+        assert "add login form" in result
+        assert "add helper function" not in result
+
+    def test_custom_range_with_title(self, temp_repo_with_tags):
+        """Version is used as the title of a custom range."""
+        result = generate_release_notes(
+            temp_repo_with_tags,
+            version="v1.2.0-preview",
+            from_ref="v1.1.0",
+            to_ref="HEAD",
+            use_ai=False,
+        )
+
+        assert "# Release Notes: v1.2.0-preview" in result
+        assert "add helper function" in result
+
+
+# =============================================================================
+# Error Handling Tests
+# =============================================================================
+
+class TestGenerateReleaseNotesErrors:
+    """Test generate_release_notes error handling."""
+
+    def test_version_not_found(self, temp_repo_with_tags):
+        """Unknown version lists available versions."""
+        result = generate_release_notes(temp_repo_with_tags, "v9.9.9", use_ai=False)
+
+        assert result.startswith("Error: Version 'v9.9.9' not found")
+        assert "v1.1.0" in result
+
+    def test_version_required(self, temp_repo_with_tags):
+        """Version or to_ref is required."""
+        result = generate_release_notes(temp_repo_with_tags, use_ai=False)
+
+        assert result == "Error: Version is required"
+
+    def test_invalid_range(self, temp_repo_with_tags):
+        """Invalid refs produce an error string."""
+        result = generate_release_notes(
+            temp_repo_with_tags, from_ref="nope", to_ref="HEAD", use_ai=False
+        )
+
+        assert result.startswith("Error analyzing repo:")
+
+    @pytest.mark.parametrize("ref", ["from_ref", "to_ref"])
+    def test_option_like_ref_rejected(self, temp_repo_with_tags, tmp_path, ref):
+        """Ref, похожий на опцию git, не передаётся в командную строку."""
+        target = tmp_path / "pwned.txt"
+        refs = {"from_ref": "v1.0.0", "to_ref": "HEAD", ref: f"--output={target}"}
+
+        result = generate_release_notes(temp_repo_with_tags, use_ai=False, **refs)
+
+        assert result == f"Error analyzing repo: Invalid ref: --output={target}"
+        assert not target.exists()
+
+    def test_invalid_repo(self):
+        """Non-existent repository."""
+        result = generate_release_notes("/nonexistent/path", "v1.0.0", use_ai=False)
+
+        assert result.startswith("Error")
@@ -0,0 +1,194 @@
+"""Tests for streaming git log reader."""
+
+import io
+import os
+import shutil
+import tempfile
+
+import pytest
+from git import Repo
+
+from mcp_server.services.analyzer import (
+    BACKEND_GITPYTHON,
+    BACKEND_LOG,
+    InvalidRepoError,
+    get_commits_between,
+)
+from mcp_server.services.git_log import iter_log_records, parse_log_stream
+from mcp_server.services.parser_service import parse_commit
+
+
+@pytest.fixture
+def temp_repo():
+    """Repository with renames, binary files, a merge and an empty commit."""
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    git = repo.git
+
+    with open(os.path.join(tmpdir, "a.txt"), "w") as f:
+        f.write("one\ntwo\n")
+    with open(os.path.join(tmpdir, "b.bin"), "wb") as f:
+        f.write(b"\x00\x01\x02")
+    git.add(".")
+    git.commit("-m", "feat: initial files")
+    main_branch = repo.active_branch.name
+
+    git.mv("a.txt", "c.txt")
+    git.commit("-m", "refactor: rename a to c")
+
+    git.checkout("-b", "feature")
+    with open(os.path.join(tmpdir, "d.txt"), "w") as f:
+        f.write("feature\n")
+    git.add(".")
+    git.commit("-m", "feat(api): add d\n\nBREAKING CHANGE: d replaces c")
+
+    git.checkout(main_branch)
+    with open(os.path.join(tmpdir, "c.txt"), "a") as f:
+        f.write("three\n")
+    git.add(".")
+    git.commit("-m", "fix: extend c")
+    git.merge("--no-ff", "feature", "-m", "Merge branch 'feature'")
+
+    git.commit("--allow-empty", "-m", "chore: empty commit")
+    git.commit("--allow-empty", "-m", "WIP: not yet")
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+class TestParseLogStream:
+    """Test parse_log_stream on raw git output."""
+
+    def test_header_only(self):
+        """Записи без numstat."""
+        raw = (
+            b"\x01" + b"a" * 40 + b"\0\0Alice\0a@x\x00100\x00\x00feat: one\n\0"
+            b"\x01" + b"b" * 40 + b"\0" + b"a" * 40 + b"\0Bob\0b@x\x00200\x00\x00fix: two\n\0"
+        )
+        records = list(parse_log_stream(io.BytesIO(raw)))
+
+        assert [r.hash for r in records] == ["a" * 40, "b" * 40]
+        assert records[0].parents == ()
+        assert records[1].parents == ("a" * 40,)
+        assert records[1].author == "Bob"
+        assert records[1].timestamp == 200
+        assert records[0].message == b"feat: one\n"
+        assert records[0].trailers == ()
+
+    def test_numstat_rename_and_binary(self):
+        """Переименования и бинарные файлы в numstat."""
+        raw = (
+            b"\x01" + b"a" * 40 + b"\0\0A\0a@x\x00100\x00\x00msg\n\0"
+            b"\n3\t1\tsrc/x.py\0-\t-\tlogo.png\0" b"0\t0\t\0old.txt\0new.txt\0"
+        )
+        record = next(parse_log_stream(io.BytesIO(raw)))
+
+        assert record.files_changed == 3
+        assert record.insertions == 3
+        assert record.deletions == 1
+
+    def test_tokens_split_across_chunks(self, monkeypatch):
+        """Токены, разорванные границей чанка."""
+        monkeypatch.setattr("mcp_server.services.git_log.CHUNK_SIZE", 3)
+        body = b"x" * 100
+        raw = b"\x01" + b"a" * 40 + b"\0\0A\0a@x\x00100\x00\x00" + body + b"\0\n1\t2\tf\0"
+        record = next(parse_log_stream(io.BytesIO(raw)))
+
+        assert record.message == body
+        assert record.insertions == 1
+        assert record.deletions == 2
+
+    def test_trailers(self):
+        """Трейлеры приходят от git уже разделёнными на ключ и значение."""
+        trailers = (
+            b"Refs\x1e#12\x1f"
+            b"BREAKING CHANGE: drop v1\x1f"
+            b"Co-authored-by\x1eBob <b@x>\x1f"
+        )
+        raw = b"\x01" + b"a" * 40 + b"\0\0A\0a@x\x00100\x00" + trailers + b"\0msg\n\0"
+        record = next(parse_log_stream(io.BytesIO(raw)))
+
+        assert record.trailers == (
+            ("Refs", "#12"),
+            ("BREAKING CHANGE", "drop v1"),
+            ("Co-authored-by", "Bob <b@x>"),
+        )
+
+
+class TestLogBackend:
+    """Cross-check streaming backend against GitPython."""
+
+    def test_backends_match(self, temp_repo):
+        """Оба бэкенда возвращают одинаковые коммиты и статистику."""
+        log = get_commits_between(temp_repo, backend=BACKEND_LOG)
+        gp = get_commits_between(temp_repo, backend=BACKEND_GITPYTHON)
+
+        assert len(log) == len(gp) == 6
+        assert log == gp
+
+    def test_backends_match_range(self, temp_repo):
+        """Совпадение на диапазоне ревизий."""
+        log = get_commits_between(temp_repo, "HEAD~3", "HEAD", backend=BACKEND_LOG)
+        gp = get_commits_between(temp_repo, "HEAD~3", "HEAD", backend=BACKEND_GITPYTHON)
+
+        assert log == gp
+
+    def test_invalid_ref(self, temp_repo):
+        """Невалидный ref вызывает InvalidRepoError."""
+        with pytest.raises(InvalidRepoError):
+            get_commits_between(temp_repo, "nonexistent-tag", "HEAD", backend=BACKEND_LOG)
+
+    def test_unknown_backend(self, temp_repo):
+        """Неизвестный бэкенд."""
+        with pytest.raises(ValueError):
+            get_commits_between(temp_repo, backend="svn")
+
+    def test_early_stop(self, temp_repo):
+        """Досрочная остановка генератора завершает процесс git без ошибок."""
+        records = iter_log_records(temp_repo, "HEAD")
+        first = next(records)
+        records.close()
+
+        assert first.message.startswith(b"WIP")
+
+    def test_trailers_from_git(self, temp_repo):
+        """git разбирает трейлеры, включая блок с BREAKING CHANGE."""
+        temp_repo.git.commit(
+            "--allow-empty", "-m",
+            "feat: pair work\n\nDetails.\n\n"
+            "BREAKING CHANGE: new config\nRefs: #7\n"
+            "Co-authored-by: Bob <b@x>\nReviewed-by: Eve\n  <e@x>",
+        )
+        record = next(iter_log_records(temp_repo, "HEAD", numstat=False))
+
+        assert record.trailers == (
+            ("BREAKING CHANGE", "new config"),
+            ("Refs", "#7"),
+            ("Co-authored-by", "Bob <b@x>"),
+            ("Reviewed-by", "Eve <e@x>"),
+        )
+
+        [commit] = get_commits_between(temp_repo, "HEAD~1", "HEAD", backend=BACKEND_LOG)
+        assert commit.parsed.breaking
+        assert commit.parsed.trailer("co-authored-by") == ["Bob <b@x>"]
+
+    @pytest.mark.parametrize("body", [
+        "BREAKING CHANGE: new config",
+        "BREAKING-CHANGE: new config",
+        "Some text\nRefs: #1\nBREAKING CHANGE: new config",
+        "Some text\nFoo: bar",
+        "Signed-off-by: A <a@x>\nSome text",
+        "Foo: bar\n  continued",
+    ])
+    def test_trailers_fallback_matches_git(self, temp_repo, body):
+        """Разбор трейлеров без git даёт то же, что и git."""
+        message = f"feat: x\n\n{body}"
+        temp_repo.git.commit("--allow-empty", "-m", message)
+        record = next(iter_log_records(temp_repo, "HEAD", numstat=False))
+
+        assert parse_commit(message).trailers == record.trailers
+        assert parse_commit(message).breaking == parse_commit(message, record.trailers).breaking
@@ -0,0 +1,144 @@
+"""Tests for commit-graph maintenance and path-limited queries."""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+from git import Repo
+
+from mcp_server.server import optimize_repository
+from mcp_server.services.analyzer import (
+    BACKEND_GITPYTHON,
+    BACKEND_LOG,
+    analyze_repo,
+    get_commits_between,
+)
+from mcp_server.services.maintenance import (
+    commit_graph_status,
+    write_commit_graph,
+)
+
+
+@pytest.fixture
+def temp_repo():
+    """Repository with commits touching different files."""
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    for i, (name, message) in enumerate([
+        ("src/app.py", "feat: add app"),
+        ("docs/guide.md", "docs: add guide"),
+        ("src/app.py", "fix: fix app"),
+        ("README.md", "docs: readme"),
+    ]):
+        path = os.path.join(tmpdir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a") as f:
+            f.write(f"{message}\n")
+        other = os.path.join(tmpdir, f"extra{i}.txt")
+        with open(other, "w") as f:
+            f.write("x\n")
+        repo.index.add([path, other])
+        repo.index.commit(message)
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+class TestCommitGraph:
+    """Test commit-graph detection and writing."""
+
+    def test_no_graph_initially(self, temp_repo):
+        """Новый репозиторий без commit-graph."""
+        status = commit_graph_status(temp_repo)
+
+        assert status["commit_graph"] is False
+        assert status["commits"] == 0
+
+    def test_write_graph_with_bloom_filters(self, temp_repo):
+        """Запись commit-graph с Bloom-фильтрами."""
+        status = write_commit_graph(temp_repo)
+
+        assert status["commit_graph"] is True
+        assert status["commits"] == 4
+        assert status["bloom_filters"] is True
+
+    def test_write_without_changed_paths(self, temp_repo):
+        """Без --changed-paths фильтры не пишутся."""
+        status = write_commit_graph(temp_repo, changed_paths=False)
+
+        assert status["commit_graph"] is True
+        assert status["bloom_filters"] is False
+
+    def test_multi_pack_index_needs_packs(self, temp_repo):
+        """multi-pack-index пишется только при наличии pack-файлов."""
+        assert write_commit_graph(temp_repo)["multi_pack_index"] is False
+
+        temp_repo.git.repack("-d")
+
+        assert write_commit_graph(temp_repo)["multi_pack_index"] is True
+
+    def test_split_chain_detected(self, temp_repo):
+        """Split commit-graph (цепочка слоёв) распознаётся."""
+        temp_repo.git.commit_graph("write", "--reachable", "--split")
+        temp_repo.git.commit("--allow-empty", "-m", "chore: more")
+        temp_repo.git.commit_graph("write", "--reachable", "--split=no-merge")
+
+        status = commit_graph_status(temp_repo)
+
+        assert status["layers"] == 2
+        assert status["commits"] == 5
+
+
+class TestPathLimitedQueries:
+    """Test paths filter in analyzer."""
+
+    @pytest.mark.parametrize("backend", [BACKEND_LOG, BACKEND_GITPYTHON])
+    def test_paths_filter(self, temp_repo, backend):
+        """Только коммиты, затрагивающие указанные пути."""
+        commits = get_commits_between(temp_repo, backend=backend, paths=["src"])
+
+        assert [c.parsed.description for c in commits] == ["fix app", "add app"]
+
+    def test_paths_keep_full_stats(self, temp_repo):
+        """Статистика покрывает все файлы коммита, как в GitPython."""
+        log = get_commits_between(temp_repo, backend=BACKEND_LOG, paths=["src"])
+        gitpython = get_commits_between(temp_repo, backend=BACKEND_GITPYTHON, paths=["src"])
+
+        assert [c.files_changed for c in log] == [2, 2]
+        assert log == gitpython
+
+    def test_same_result_with_commit_graph(self, temp_repo):
+        """commit-graph не меняет результат запроса по путям."""
+        before = get_commits_between(temp_repo, paths=["docs"])
+        write_commit_graph(temp_repo)
+
+        assert get_commits_between(temp_repo, paths=["docs"]) == before
+
+    def test_analyze_repo_paths(self, temp_repo):
+        """analyze_repo учитывает paths (и в ключе кэша)."""
+        full = analyze_repo(temp_repo.working_dir)
+        docs = analyze_repo(temp_repo.working_dir, paths=["docs", "README.md"])
+
+        assert full["summary"]["total_commits"] == 4
+        assert docs["summary"]["total_commits"] == 2
+
+
+class TestOptimizeRepositoryTool:
+    """Test optimize_repository MCP tool."""
+
+    def test_reports_before_and_after(self, temp_repo):
+        """Инструмент сообщает состояние до и после."""
+        result = optimize_repository(temp_repo.working_dir)
+
+        assert result.startswith("Before: no commit-graph")
+        assert "After: commit-graph with 4 commits" in result
+        assert "Bloom filters: yes" in result
+
+    def test_invalid_repo(self):
+        """Несуществующий репозиторий."""
+        assert optimize_repository("/nonexistent/path").startswith("Error")
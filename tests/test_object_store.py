@@ -0,0 +1,195 @@
+"""Tests for in-process git object reader."""
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+from git import Repo
+
+from mcp_server.services.analyzer import (
+    BACKEND_LOG,
+    BACKEND_OBJECTS,
+    InvalidRepoError,
+    get_commits_between,
+)
+from mcp_server.services.git_log import iter_log_records
+from mcp_server.services.object_store import (
+    ObjectStoreError,
+    RepoObjects,
+    apply_delta,
+    iter_object_records,
+)
+
+
+@pytest.fixture
+def temp_repo():
+    """Repository with a merge, tags and a file edited many times."""
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    base = repo.active_branch.name
+
+    def commit(message, day, name="data.txt"):
+        path = os.path.join(tmpdir, name)
+        with open(path, "a") as f:
+            # Large, mostly unchanged file: repack stores it as deltas
+            f.write(f"{message}\n" + "line of text\n" * 200)
+        repo.index.add([path])
+        date = f"2024-01-{day:02d}T10:00:00"
+        repo.index.commit(message, commit_date=date, author_date=date)
+
+    commit("feat: first", 1)
+    commit("fix: second", 2)
+    repo.create_tag("v1.0.0", message="Version 1.0.0")
+    repo.git.checkout("-b", "feature")
+    commit("feat: feature work", 3, "feature.txt")
+    repo.git.checkout(base)
+    commit("docs: main work", 4)
+    repo.git.merge("feature", "--no-ff", "-m", "Merge branch 'feature'",
+                   env={"GIT_COMMITTER_DATE": "2024-01-05T10:00:00"})
+    repo.create_tag("v1.1.0")
+    commit("feat: unreleased", 6)
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+def _records(records):
+    return [(r.hash, r.parents, r.author, r.email, r.timestamp, r.message) for r in records]
+
+
+def _cross_check(repo, rev_range):
+    expected = _records(iter_log_records(repo, rev_range, numstat=False))
+    assert _records(iter_object_records(repo, rev_range)) == expected
+
+
+class TestWalk:
+    """Walks match git log."""
+
+    @pytest.mark.parametrize("rev_range", ["HEAD", "v1.0.0..HEAD", "v1.0.0..v1.1.0", "feature"])
+    def test_loose_objects(self, temp_repo, rev_range):
+        """Рыхлые объекты: тот же порядок и поля, что у git log."""
+        _cross_check(temp_repo, rev_range)
+
+    @pytest.mark.parametrize("offset_deltas", [True, False])
+    def test_packed_objects(self, temp_repo, offset_deltas):
+        """Упакованные объекты с OFS- и REF-дельтами."""
+        temp_repo.git(c=f"repack.useDeltaBaseOffset={str(offset_deltas).lower()}").repack("-adf")
+
+        _cross_check(temp_repo, "HEAD")
+        _cross_check(temp_repo, "v1.0.0..v1.1.0")
+
+    def test_deltified_blob(self, temp_repo):
+        """Дельта-цепочки разворачиваются в исходное содержимое."""
+        temp_repo.git.repack("-adf")
+        blob = temp_repo.head.commit.tree["data.txt"].hexsha
+        expected = subprocess.run(
+            ["git", "cat-file", "blob", blob],
+            cwd=temp_repo.working_dir, capture_output=True, check=True,
+        ).stdout
+
+        with RepoObjects(temp_repo) as objects:
+            assert objects.store.read(blob) == ("blob", expected)
+
+
+class TestLazyExclusion:
+    """Excluded history is walked only down to the range boundary."""
+
+    @pytest.fixture
+    def long_repo(self, temp_repo):
+        """Thirty more commits, one dated before its parent."""
+        path = os.path.join(temp_repo.working_dir, "long.txt")
+        for hour in range(30):
+            with open(path, "a") as f:
+                f.write(f"{hour}\n")
+            temp_repo.index.add([path])
+            # Clock skew: one commit claims an older date than its parent
+            date = f"2024-02-{1 if hour == 15 else 2 + hour // 24:02d}T{hour % 24:02d}:00:00"
+            temp_repo.index.commit(f"chore: step {hour}", commit_date=date, author_date=date)
+        return temp_repo
+
+    def test_excluded_ancestors_not_read(self, long_repo, monkeypatch):
+        """Старая история за исключённым коммитом не читается."""
+        reads = []
+        original = RepoObjects.read_commit
+        monkeypatch.setattr(
+            RepoObjects, "read_commit",
+            lambda self, sha: reads.append(sha) or original(self, sha),
+        )
+
+        assert len(list(iter_object_records(long_repo, "HEAD~2..HEAD"))) == 2
+        assert len(reads) < 15
+
+    @pytest.mark.parametrize("rev_range", ["HEAD~12..HEAD", "HEAD~20..HEAD~5", "v1.1.0..HEAD"])
+    def test_skewed_dates_match_log(self, long_repo, rev_range):
+        """При сдвинутых датах результат совпадает с git log."""
+        _cross_check(long_repo, rev_range)
+
+
+class TestResolve:
+    """Test ref resolution."""
+
+    def test_revisions(self, temp_repo):
+        """Имена, суффиксы и сокращённые SHA разрешаются как в git."""
+        temp_repo.git.pack_refs("--all")
+        revs = ["HEAD", "v1.0.0", "v1.1.0^2", "HEAD~2", "feature", "v1.0.0^{commit}", "HEAD~1^1"]
+
+        with RepoObjects(temp_repo) as objects:
+            for rev in revs:
+                assert objects.resolve(rev) == temp_repo.git.rev_parse(f"{rev}^{{commit}}")
+            assert objects.resolve(temp_repo.head.commit.hexsha[:8]) == temp_repo.head.commit.hexsha
+            assert objects.resolve("nonexistent") is None
+
+    def test_unsupported_syntax(self, temp_repo):
+        """Неподдерживаемый синтаксис — ObjectStoreError."""
+        with RepoObjects(temp_repo) as objects, pytest.raises(ObjectStoreError):
+            objects.resolve("HEAD@{1}")
+
+
+class TestBackend:
+    """Test the 'objects' analyzer backend."""
+
+    def test_same_as_log(self, temp_repo):
+        """Бэкенд objects возвращает те же коммиты и граф, что и log."""
+        graph_log, graph_objects = {}, {}
+
+        expected = get_commits_between(temp_repo, "v1.0.0", backend=BACKEND_LOG,
+                                       include_stats=False, graph=graph_log)
+        actual = get_commits_between(temp_repo, "v1.0.0", backend=BACKEND_OBJECTS,
+                                     include_stats=False, graph=graph_objects)
+
+        assert actual == expected
+        assert graph_objects == graph_log
+
+    def test_stats_fall_back_to_log(self, temp_repo):
+        """Статистика читается через git log."""
+        commits = get_commits_between(temp_repo, backend=BACKEND_OBJECTS)
+
+        assert all(c.insertions > 0 for c in commits if len(c.parents) == 1)
+
+    def test_unsupported_syntax_falls_back(self, temp_repo):
+        """Неподдерживаемая ревизия обрабатывается через git log."""
+        commits = get_commits_between(temp_repo, to_ref="HEAD@{0}",
+                                      backend=BACKEND_OBJECTS, include_stats=False)
+
+        assert commits[0].hash == temp_repo.head.commit.hexsha
+
+    def test_invalid_ref(self, temp_repo):
+        """Несуществующий ref — InvalidRepoError."""
+        with pytest.raises(InvalidRepoError):
+            get_commits_between(temp_repo, "nonexistent", backend=BACKEND_OBJECTS,
+                                include_stats=False)
+
+
+def test_apply_delta():
+    """Копирование из базы и вставка литералов."""
+    base = b"hello world"
+    # source size 11, target size 11, copy 6 bytes from 0, insert "there"
+    delta = bytes([11, 11, 0x90, 6, 5]) + b"there"
+
+    assert apply_delta(base, delta) == b"hello there"
@@ -1,7 +1,7 @@
 """Tests for Conventional Commits Parser Service."""
 
 import pytest
-from mcp_server.services.parser_service import parse_commit, ParsedCommit
+from mcp_server.services.parser_service import parse_commit, parse_merge_unit, ParsedCommit
 
 
 class TestParseCommit:
@@ -128,3 +128,127 @@ BREAKING CHANGE: authentication method has changed"""
         assert result.type == "non-conventional"
         assert result.description == "update code"
         assert result.body == "This commit updates the code."
+
+
+
+class TestParseCommitBytes:
+    """Test parse_commit on raw bytes."""
+
+    def test_bytes_and_memoryview(self):
+        """bytes и memoryview разбираются так же, как str."""
+        message = "feat(api): добавить auth\n\nТело коммита\n\nBREAKING CHANGE: новый токен\n"
+        expected = parse_commit(message)
+
+        assert parse_commit(message.encode()) == expected
+        assert parse_commit(memoryview(message.encode())) == expected
+        assert expected.breaking is True
+        assert expected.description == "добавить auth"
+
+    def test_body_decoded_lazily(self):
+        """Тело не декодируется, пока его не запросили."""
+        body = b"generated line\n" * 500_000
+        message = b"chore: regenerate fixtures\n\n" + body
+
+        result = parse_commit(message)
+
+        assert result._body is None
+        assert result.breaking is False
+        assert result.body == body.decode().strip()
+
+    def test_breaking_footer_in_bytes(self):
+        """BREAKING CHANGE в теле находится без декодирования."""
+        result = parse_commit(b"fix: x\n\ndetails\nBREAKING CHANGE: api removed")
+        assert result.breaking is True
+
+        result = parse_commit(b"fix: x\n\nmentions BREAKING CHANGE: inline")
+        assert result.breaking is False
+
+    def test_invalid_utf8(self):
+        """Некорректный UTF-8 заменяется, а не вызывает ошибку."""
+        result = parse_commit(b"fix: caf\xe9\n\n\xff")
+        assert result.description == "caf\ufffd"
+        assert result.body == "\ufffd"
+
+    def test_wip_and_empty(self):
+        """WIP и пустые сообщения в байтах пропускаются."""
+        assert parse_commit(b"WIP: draft\n\nlarge body") is None
+        assert parse_commit(b"\n\n  \n") is None
+
+class TestTrailers:
+    """Test commit trailers."""
+
+    def test_parsed_from_body(self):
+        """Без трейлеров от git они разбираются из последнего абзаца."""
+        result = parse_commit(
+            "fix: race\n\nRefs: #1 in text\n\n"
+            "Refs: #12\nCo-authored-by: Bob\n  <b@x>\nnot a trailer"
+        )
+        assert result.trailers == (("Refs", "#12"), ("Co-authored-by", "Bob <b@x>"))
+        assert result.trailer("REFS") == ["#12"]
+        assert result.trailer("Reviewed-by") == []
+
+    def test_given_trailers_not_reparsed(self):
+        """Трейлеры от git используются как есть, тело не читается."""
+        result = parse_commit(b"fix: race\n\nRefs: #99", trailers=(("Refs", "#12"),))
+        assert result.trailers == (("Refs", "#12"),)
+        assert result._body is None
+
+    def test_breaking_trailer(self):
+        """BREAKING-CHANGE из трейлеров делает коммит breaking."""
+        result = parse_commit("feat: x", trailers=(("BREAKING-CHANGE", "drop v1"),))
+        assert result.breaking is True
+
+    def test_no_body(self):
+        """Коммит без тела не имеет трейлеров."""
+        assert parse_commit("feat: x").trailers == ()
+
+    def test_breaking_change_hyphen_footer(self):
+        """Футер BREAKING-CHANGE распознаётся и без трейлеров от git."""
+        result = parse_commit(b"feat: x\n\nBREAKING-CHANGE: drop v1")
+
+        assert result.breaking is True
+        assert result.trailers == (("BREAKING-CHANGE", "drop v1"),)
+
+    def test_lone_breaking_footer_not_a_trailer(self):
+        """Одиночный футер BREAKING CHANGE — не трейлер, как и для git."""
+        result = parse_commit("feat: x\n\nBREAKING CHANGE: drop v1")
+
+        assert result.breaking is True
+        assert result.trailers == ()
+
+    def test_block_with_text_needs_known_key(self):
+        """Абзац с обычным текстом — трейлеры, только если есть известный ключ."""
+        assert parse_commit("feat: x\n\nSome text\nFoo: bar").trailers == ()
+        assert parse_commit("feat: x\n\nSome text\nRefs: #1").trailers == (("Refs", "#1"),)
+        assert parse_commit(
+            "feat: x\n\nOne\nTwo\nThree\nFour\nRefs: #1"
+        ).trailers == ()
+
+
+class TestParseMergeUnit:
+    """Test parse_merge_unit function."""
+
+    def test_pr_title_in_body(self):
+        """Заголовок PR из тела merge-коммита GitHub."""
+        result = parse_merge_unit("Merge pull request #12 from user/login\n\nfeat(auth): add login")
+        assert result.type == "feat"
+        assert result.scope == "auth"
+        assert result.description == "add login"
+
+    def test_custom_merge_message(self):
+        """Conventional-сообщение merge разбирается как есть."""
+        result = parse_merge_unit("fix: handle timeout (#7)", "chore: unrelated")
+        assert result.type == "fix"
+        assert result.description == "handle timeout (#7)"
+
+    def test_side_branch_fallback(self):
+        """Без заголовка PR — сообщение последнего коммита ветки."""
+        result = parse_merge_unit("Merge branch 'feature'", "perf: cache results")
+        assert result.type == "perf"
+        assert result.description == "cache results"
+
+    def test_non_conventional_pr_title(self):
+        """Не-conventional заголовок PR остаётся описанием."""
+        result = parse_merge_unit("Merge pull request #3 from a/b\n\nAdd dark mode", "wip stuff")
+        assert result.type == "non-conventional"
+        assert result.description == "Add dark mode"
@@ -0,0 +1,158 @@
+"""Tests for patch-id based cherry-pick detection."""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+from git import Repo
+
+from mcp_server.server import generate_changelog
+from mcp_server.services import patch_ids as patch_ids_module
+from mcp_server.services.patch_ids import (
+    DuplicateFilter,
+    compute_patch_ids,
+    get_patch_ids,
+)
+from mcp_server.services.pipeline import OUTPUT_DIR_ENV
+
+
+@pytest.fixture
+def temp_repo():
+    """
+    Maintenance release with a cherry-picked fix, merged back to main.
+
+        v1.0.0 -- fix (X) -- feat ------------ merge -- v1.1.0
+              \\                               /
+               +-- fix (X', cherry-pick) -- v1.0.1
+    """
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    main = repo.active_branch.name
+
+    def commit(name, content, message, day):
+        path = os.path.join(tmpdir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        repo.index.add([path])
+        date = f"2024-01-{day:02d}T10:00:00"
+        return repo.index.commit(message, commit_date=date, author_date=date)
+
+    def dated(day):
+        return {"GIT_COMMITTER_DATE": f"2024-01-{day:02d}T10:00:00"}
+
+    commit("app.py", "print('hello')\n", "feat: initial app", 1)
+    repo.create_tag("v1.0.0")
+    fix = commit("app.py", "print('hello, world')\n", "fix: correct greeting", 2)
+    commit("utils.py", "pass\n", "feat: add utils", 3)
+
+    repo.git.checkout("-b", "maint", "v1.0.0")
+    repo.git.cherry_pick(fix.hexsha, env=dated(4))
+    repo.create_tag("v1.0.1")
+
+    repo.git.checkout(main)
+    repo.git.merge("maint", "--no-ff", "-s", "ours", "-m", "Merge branch 'maint'", env=dated(5))
+    repo.create_tag("v1.1.0")
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+class TestPatchIds:
+    """Test patch-id computation."""
+
+    def test_cherry_pick_same_patch_id(self, temp_repo):
+        """У cherry-pick тот же patch-id, у merge-коммита его нет."""
+        original = temp_repo.commit("HEAD~2").hexsha
+        picked = temp_repo.tags["v1.0.1"].commit.hexsha
+        merge = temp_repo.head.commit.hexsha
+
+        ids = compute_patch_ids(temp_repo, [original, picked, merge])
+
+        assert ids[original] == ids[picked]
+        assert merge not in ids
+
+    def test_empty_input(self, temp_repo):
+        """Пустой список — пустой результат, HEAD не читается."""
+        assert compute_patch_ids(temp_repo, []) == {}
+
+    def test_cached_by_sha(self, temp_repo, monkeypatch):
+        """Повторный запрос считает только новые коммиты."""
+        shas = [c.hexsha for c in temp_repo.iter_commits("HEAD")]
+        calls = []
+        original = patch_ids_module.compute_patch_ids
+        monkeypatch.setattr(
+            patch_ids_module, "compute_patch_ids",
+            lambda repo, missing: calls.append(list(missing)) or original(repo, missing),
+        )
+
+        first = get_patch_ids(temp_repo, shas[1:])
+        second = get_patch_ids(temp_repo, shas)
+
+        assert calls == [shas[1:], shas[:1]]
+        assert second == first
+
+
+class TestDuplicateFilter:
+    """Test DuplicateFilter."""
+
+    def test_keeps_last_seen(self):
+        """Остаётся последний встреченный коммит с данным patch-id."""
+        duplicates = DuplicateFilter({"a": "p1", "b": "p2", "c": "p1"})
+
+        kept = [sha for sha in ["a", "b", "c", "d"] if duplicates.keep(sha)]
+
+        assert kept == ["b", "c", "d"]
+
+
+class TestGenerateChangelogDedupe:
+    """Test dedupe_cherry_picks in generate_changelog."""
+
+    def test_fix_listed_once(self, temp_repo):
+        """Исправление выводится один раз — в самом старом релизе."""
+        repo_path = temp_repo.working_dir
+
+        plain = generate_changelog(repo_path)
+        deduped = generate_changelog(repo_path, dedupe_cherry_picks=True)
+
+        assert plain.count("correct greeting") == 2
+        assert deduped.count("correct greeting") == 1
+        v101 = deduped.index("## v1.0.1")
+        assert deduped.index("correct greeting") > v101
+
+    def test_streaming_same_as_in_memory(self, temp_repo, monkeypatch):
+        """Потоковый режим даёт тот же результат."""
+        repo_path = temp_repo.working_dir
+        output_path = os.path.join(repo_path, "CHANGELOG.md")
+        monkeypatch.setenv(OUTPUT_DIR_ENV, repo_path)
+
+        generate_changelog(repo_path, output_path="CHANGELOG.md", dedupe_cherry_picks=True)
+
+        with open(output_path, encoding="utf-8") as f:
+            assert f.read() == generate_changelog(repo_path, dedupe_cherry_picks=True)
+
+    def test_filtered_copy_keeps_newer(self, temp_repo):
+        """Если старую копию отсёк фильтр, остаётся новая."""
+        repo_path = temp_repo.working_dir
+        until = "2024-01-03T12:00:00"
+
+        streamed = generate_changelog(
+            repo_path, stream=True, dedupe_cherry_picks=True, until=until
+        )
+
+        assert streamed == generate_changelog(repo_path, dedupe_cherry_picks=True, until=until)
+        assert streamed.count("correct greeting") == 1
+        assert "## v1.0.1" not in streamed
+
+    def test_limited_copy_keeps_newer(self, temp_repo):
+        """Если старая копия не вошла в max_commits, остаётся новая."""
+        streamed = generate_changelog(
+            temp_repo.working_dir, stream=True, dedupe_cherry_picks=True, max_commits=3
+        )
+
+        assert streamed.count("correct greeting") == 1
+        assert "## v1.0.1" not in streamed
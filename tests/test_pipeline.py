@@ -0,0 +1,352 @@
+"""Tests for streaming changelog pipeline."""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+import pytest
+from git import Repo
+
+from mcp_server.server import generate_changelog
+from mcp_server.services import pipeline
+from mcp_server.services.analyzer import get_repo, get_tags
+from mcp_server.services.pipeline import (
+    OUTPUT_DIR_ENV,
+    iter_changelog_versions,
+    iter_release_ranges,
+    iter_release_walks,
+    stream_changelog,
+)
+
+
+@pytest.fixture
+def temp_repo():
+    """Repository with two releases and unreleased work."""
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+
+    def commit(name, message, date):
+        path = os.path.join(tmpdir, name)
+        with open(path, "a") as f:
+            f.write(message + "\n")
+        repo.index.add([path])
+        repo.index.commit(message, commit_date=date, author_date=date)
+
+    commit("README.md", "docs: initial README", "2024-01-01T10:00:00")
+    commit("main.py", "feat: add main script", "2024-01-02T10:00:00")
+    repo.create_tag("v1.0.0")
+    commit("main.py", "fix(main): fix output", "2024-01-03T10:00:00")
+    commit("main.py", "WIP: draft", "2024-01-04T10:00:00")
+    commit("main.py", "feat!: refactor main function", "2024-01-05T10:00:00")
+    repo.create_tag("v1.1.0")
+    commit("utils.py", "feat: add helper", "2024-01-06T10:00:00")
+
+    yield tmpdir
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+@pytest.fixture(params=[True, False], ids=["merged", "unmerged"])
+def maintenance_repo(request):
+    """
+    v1.0.1 tagged on a maintenance branch, its fix cherry-picked to main.
+
+        v1.0.0 -- feat -- fix (X', cherry-pick) -- v1.1.0 -- [merge] -- docs
+              \\                                              /
+               +-- fix (X) -- v1.0.1 -----------------------+
+
+    The maintenance branch is merged back after v1.1.0 only in the
+    'merged' variant.
+    """
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    main = repo.active_branch.name
+
+    def commit(name, content, message, day):
+        path = os.path.join(tmpdir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        repo.index.add([path])
+        date = f"2024-01-{day:02d}T10:00:00"
+        return repo.index.commit(message, commit_date=date, author_date=date)
+
+    commit("app.py", "print('hello')\n", "feat: initial app", 1)
+    repo.create_tag("v1.0.0")
+
+    repo.git.checkout("-b", "maint")
+    commit("app.py", "print('hello, world')\n", "fix: correct greeting", 2)
+    repo.create_tag("v1.0.1")
+
+    repo.git.checkout(main)
+    commit("utils.py", "pass\n", "feat: add utils", 3)
+    commit("app.py", "print('hello, world')\n", "fix: correct greeting", 4)
+    repo.create_tag("v1.1.0")
+    if request.param:
+        env = {"GIT_COMMITTER_DATE": "2024-01-05T10:00:00"}
+        repo.git.merge("maint", "--no-ff", "-m", "Merge branch 'maint'", env=env)
+    commit("README.md", "# App\n", "docs: add README", 6)
+
+    yield tmpdir, request.param
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+@pytest.fixture
+def many_releases_repo():
+    """
+    Thirty releases on main with release candidates, and a maintenance
+    release every ten releases, merged back when the next one branches.
+    """
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    main = repo.active_branch.name
+    day = iter(range(1, 1000))
+
+    def commit(message, name="app.py"):
+        path = os.path.join(tmpdir, name)
+        with open(path, "a") as f:
+            f.write(message + "\n")
+        repo.index.add([path])
+        date = datetime.fromtimestamp(1704067200 + next(day) * 3600).isoformat()
+        repo.index.commit(message, commit_date=date, author_date=date)
+
+    for minor in range(30):
+        commit(f"feat: feature {minor}")
+        repo.create_tag(f"v1.{minor}.0-rc1")
+        commit(f"fix: polish {minor}")
+        repo.create_tag(f"v1.{minor}.0")
+        if minor % 10 == 0:
+            if minor:
+                repo.git.merge(f"maint-{minor - 10}", "--no-ff", "-m", "Merge maint")
+            repo.git.checkout("-b", f"maint-{minor}")
+            commit(f"fix: backport {minor}", f"backport_{minor}.py")
+            repo.create_tag(f"v1.{minor}.1")
+            repo.git.checkout(main)
+
+    yield tmpdir
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+class TestIterReleaseRanges:
+    """Test iter_release_ranges."""
+
+    def test_ranges_newest_first(self):
+        """Диапазоны от новых релизов к старым, Unreleased первым."""
+        tags = [
+            {"name": "v1.0.0", "hash": "a", "date": datetime(2024, 1, 1)},
+            {"name": "v1.1.0", "hash": "b", "date": datetime(2024, 2, 1)},
+        ]
+
+        ranges = list(iter_release_ranges(tags))
+
+        assert ranges == [
+            ("Unreleased", None, "b..HEAD"),
+            ("v1.1.0", "2024-02-01", "a..b"),
+            ("v1.0.0", "2024-01-01", "a"),
+        ]
+
+    def test_no_tags(self):
+        """Без тегов — вся история как Unreleased."""
+        assert list(iter_release_ranges([])) == [("Unreleased", None, "HEAD")]
+        assert list(iter_release_ranges([], include_unreleased=False)) == []
+
+
+class TestStreamChangelog:
+    """Test streaming rendering."""
+
+    @pytest.mark.parametrize("output_format", ["markdown", "keepachangelog"])
+    def test_same_output_as_in_memory(self, temp_repo, output_format):
+        """Потоковый рендер совпадает с обычным."""
+        template = {
+            "markdown": "changelog.md.j2",
+            "keepachangelog": "keepachangelog.md.j2",
+        }[output_format]
+        out = io.StringIO()
+
+        written = stream_changelog(temp_repo, out, template)
+
+        assert out.getvalue() == generate_changelog(temp_repo, output_format)
+        assert written == len(out.getvalue())
+
+    def test_json_is_valid(self, temp_repo):
+        """JSON, собранный по частям, валиден."""
+        out = io.StringIO()
+        stream_changelog(temp_repo, out, "changelog.json.j2")
+
+        parsed = json.loads(out.getvalue())
+        versions = [entry["version"] for entry in parsed["changelog"]]
+        assert versions == ["Unreleased", "v1.1.0", "v1.0.0"]
+
+    def test_versions_walked_lazily(self, temp_repo, monkeypatch):
+        """Каждый релиз читается только когда до него дошёл рендер."""
+        walked = []
+        original = pipeline.iter_enriched_commits
+        monkeypatch.setattr(
+            pipeline, "iter_enriched_commits",
+            lambda repo, rev_range, **kw: walked.append(rev_range) or original(repo, rev_range, **kw),
+        )
+        repo = get_repo(temp_repo)
+
+        versions = iter_changelog_versions(repo)
+        first = next(versions)
+
+        assert first.version == "Unreleased"
+        assert len(walked) == 1
+        assert [v.version for v in versions] == ["v1.1.0", "v1.0.0"]
+        repo.close()
+
+    def test_to_version_excludes_unreleased(self, temp_repo):
+        """С to_version Unreleased не выводится."""
+        repo = get_repo(temp_repo)
+
+        versions = [v.version for v in iter_changelog_versions(repo, to_version="v1.0.0")]
+
+        assert versions == ["v1.0.0"]
+        repo.close()
+
+    def test_tool_output_path(self, temp_repo, monkeypatch):
+        """generate_changelog с output_path пишет файл в CHANGELOG_OUTPUT_DIR."""
+        monkeypatch.setenv(OUTPUT_DIR_ENV, temp_repo)
+        output_path = os.path.join(os.path.realpath(temp_repo), "CHANGELOG.md")
+
+        result = generate_changelog(temp_repo, output_path="CHANGELOG.md")
+
+        assert result.startswith(f"Changelog written to {output_path}")
+        with open(output_path, encoding="utf-8") as f:
+            content = f.read()
+        assert "## v1.1.0" in content
+        assert "refactor main function" in content
+        assert "draft" not in content
+
+    @pytest.mark.parametrize("output_path", ["../CHANGELOG.md", "/tmp/CHANGELOG.md", "link/x.md"])
+    def test_output_path_outside_dir(self, temp_repo, tmp_path, monkeypatch, output_path):
+        """Файл вне CHANGELOG_OUTPUT_DIR не пишется."""
+        root = tmp_path / "out"
+        root.mkdir()
+        (root / "link").symlink_to(tmp_path)
+        monkeypatch.setenv(OUTPUT_DIR_ENV, str(root))
+
+        result = generate_changelog(temp_repo, output_path=output_path)
+
+        assert result.startswith("Error: output_path must be a file inside")
+        assert not (tmp_path / "x.md").exists()
+
+    def test_output_path_disabled(self, temp_repo, monkeypatch):
+        """Без CHANGELOG_OUTPUT_DIR запись в файл отключена."""
+        monkeypatch.delenv(OUTPUT_DIR_ENV, raising=False)
+
+        result = generate_changelog(temp_repo, output_path="CHANGELOG.md")
+
+        assert result == f"Error: output_path is disabled: set {OUTPUT_DIR_ENV} to allow it"
+        assert not os.path.exists(os.path.join(temp_repo, "CHANGELOG.md"))
+
+
+class TestNonLinearHistory:
+    """Test releases tagged on a maintenance branch."""
+
+    def test_same_output_as_in_memory(self, maintenance_repo):
+        """Потоковый changelog совпадает с группировкой по предкам."""
+        path, _ = maintenance_repo
+
+        assert generate_changelog(path, stream=True) == generate_changelog(path)
+
+    def test_commit_in_first_containing_release(self, maintenance_repo):
+        """Исправление попадает в v1.0.1 один раз, а не ещё и в Unreleased."""
+        path, merged = maintenance_repo
+        repo = get_repo(path)
+        fix = repo.tags["v1.0.1"].commit.hexsha
+
+        versions = {
+            v.version: [c.hash for c in v.commits] for v in iter_changelog_versions(repo)
+        }
+
+        if merged:
+            assert list(versions) == ["Unreleased", "v1.1.0", "v1.0.1", "v1.0.0"]
+            assert versions["v1.0.1"] == [fix]
+        else:
+            # Outside the history of HEAD, like in the in-memory path
+            assert list(versions) == ["Unreleased", "v1.1.0", "v1.0.0"]
+        assert sum(fix in shas for shas in versions.values()) == int(merged)
+        repo.close()
+
+    def test_dedupe_cherry_pick_from_maintenance(self, maintenance_repo):
+        """Cherry-pick между веткой сопровождения и main показывается один раз."""
+        path, merged = maintenance_repo
+
+        deduped = generate_changelog(path, stream=True, dedupe_cherry_picks=True)
+
+        assert deduped == generate_changelog(path, dedupe_cherry_picks=True)
+        assert deduped.count("correct greeting") == 1
+        # The oldest release that shipped the fix keeps it
+        release = "## v1.0.1" if merged else "## v1.1.0"
+        assert deduped.index(release) < deduped.index("correct greeting")
+        assert deduped.index("correct greeting") < deduped.index("## v1.0.0")
+
+    def test_paths_same_as_in_memory(self, maintenance_repo):
+        """С paths исправление с ветки сопровождения не теряется в обычном режиме."""
+        path, merged = maintenance_repo
+
+        streamed = generate_changelog(path, stream=True, paths=["app.py"])
+
+        assert streamed == generate_changelog(path, paths=["app.py"])
+        assert streamed == generate_changelog(path, paths=["app.py"], memory_budget="1K")
+        assert streamed.count("correct greeting") == 1 + merged
+
+    def test_first_parent_same_as_in_memory(self, maintenance_repo):
+        """С first_parent тег ветки сопровождения не становится релизом."""
+        path, _ = maintenance_repo
+
+        streamed = generate_changelog(path, stream=True, first_parent=True)
+
+        assert streamed == generate_changelog(path, first_parent=True)
+        assert "## v1.0.1" not in streamed
+
+
+class TestManyReleases:
+    """Test release walks on a history with many tags."""
+
+    def test_walks_stay_short(self, many_releases_repo):
+        """Релиз исключает только теги, которые до него дотягиваются."""
+        repo = get_repo(many_releases_repo)
+
+        walks = {name: revs for name, _, revs in iter_release_walks(repo, get_tags(repo))}
+
+        # 60 releases on main, v1.0.1 and v1.10.1 merged back, Unreleased
+        assert len(walks) == 63
+        # The previous release, plus maintenance releases merged since
+        assert max(len(revs) for revs in walks.values()) <= 3
+        assert walks["v1.10.1"] == [
+            repo.tags["v1.10.1"].commit.hexsha,
+            f"^{repo.tags['v1.0.1'].commit.hexsha}",
+            f"^{repo.tags['v1.10.0'].commit.hexsha}",
+        ]
+        assert walks["v1.11.0-rc1"] == [
+            repo.tags["v1.11.0-rc1"].commit.hexsha,
+            f"^{repo.tags['v1.10.1'].commit.hexsha}",
+        ]
+        repo.close()
+
+    @pytest.mark.parametrize("release_tags", [None, "v*,!*-rc*"])
+    @pytest.mark.parametrize("first_parent", [False, True])
+    def test_same_output_as_in_memory(self, many_releases_repo, release_tags, first_parent):
+        """Потоковый changelog совпадает с обычным при многих тегах."""
+        options = dict(release_tags=release_tags, first_parent=first_parent)
+
+        streamed = generate_changelog(many_releases_repo, stream=True, **options)
+
+        assert streamed == generate_changelog(many_releases_repo, **options)
+        assert "## v1.29.0" in streamed
+        assert ("## v1.0.0-rc1" in streamed) == (release_tags is None)
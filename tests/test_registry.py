@@ -0,0 +1,182 @@
+"""Tests for bare mirrors and the repository registry."""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import pytest
+from git import Repo
+
+from mcp_server.server import generate_changelog, list_repositories, refresh_repositories
+from mcp_server.services import registry as registry_module
+from mcp_server.services.analyzer import InvalidRepoError, get_repo
+from mcp_server.services.registry import RegistryEntry, RepoRegistry
+from mcp_server.services.repo_pool import RepoPool
+
+
+@pytest.fixture
+def upstream():
+    """Working repository on main with two releases, plus a scratch dir for mirrors."""
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, "upstream")
+    repo = Repo.init(path)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    repo.git.checkout("-b", "main")
+
+    def commit(message):
+        file = os.path.join(path, "main.py")
+        with open(file, "a") as f:
+            f.write(message + "\n")
+        repo.index.add([file])
+        repo.index.commit(message)
+
+    commit("feat: initial")
+    repo.create_tag("v1.0.0")
+    commit("fix: crash")
+    repo.create_tag("v1.1.0")
+    commit("feat: plugins")
+
+    yield {"repo": repo, "path": path, "tmpdir": tmpdir, "commit": commit}
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+@pytest.fixture
+def registry(upstream, monkeypatch):
+    """Shared registry with one mirror of upstream, served through a private pool."""
+    pool = RepoPool()
+    mirror = os.path.join(upstream["tmpdir"], "mirror.git")
+    reg = RepoRegistry([RegistryEntry("app", mirror, upstream["path"])], pool)
+    monkeypatch.setattr(registry_module, "_registry", reg)
+
+    yield reg
+
+    reg.stop_refresher()
+    pool.close_all()
+
+
+class TestBareRepositories:
+    """Test opening bare repositories."""
+
+    def test_get_repo_bare(self, upstream):
+        """Bare-репозиторий открывается без рабочего дерева."""
+        path = os.path.join(upstream["tmpdir"], "bare.git")
+        Repo.clone_from(upstream["path"], path, bare=True).close()
+
+        repo = get_repo(path)
+
+        assert repo.bare
+        repo.close()
+
+    def test_plain_directory_rejected(self, upstream):
+        """Обычная директория по-прежнему отклоняется."""
+        path = os.path.join(upstream["tmpdir"], "plain")
+        os.makedirs(os.path.join(path, "refs"))
+
+        with pytest.raises(InvalidRepoError, match="Not a git repository"):
+            get_repo(path)
+
+    def test_changelog_from_bare_clone(self, upstream):
+        """CHANGELOG из bare-клона совпадает с рабочим репозиторием."""
+        path = os.path.join(upstream["tmpdir"], "bare.git")
+        Repo.clone_from(upstream["path"], path, bare=True).close()
+
+        assert generate_changelog(path) == generate_changelog(upstream["path"])
+
+
+class TestRepoRegistry:
+    """Test registry loading and mirror refresh."""
+
+    def test_load(self, upstream):
+        """Пути в файле реестра считаются относительно файла."""
+        path = os.path.join(upstream["tmpdir"], "registry.json")
+        with open(path, "w") as f:
+            json.dump({
+                "app": {"mirror": "mirrors/app.git", "upstream": "upstream"},
+                "docs": "/srv/docs.git",
+            }, f)
+
+        reg = RepoRegistry.load(path, RepoPool())
+
+        assert reg.resolve("app") == os.path.join(upstream["tmpdir"], "mirrors/app.git")
+        assert reg.entries["app"].upstream == upstream["path"]
+        assert reg.resolve("docs") == "/srv/docs.git"
+        assert reg.entries["docs"].upstream is None
+        assert reg.resolve("nope") is None
+
+    def test_load_invalid(self, upstream):
+        """Запись без пути зеркала — ValueError."""
+        path = os.path.join(upstream["tmpdir"], "registry.json")
+        with open(path, "w") as f:
+            json.dump({"app": {"upstream": "upstream"}}, f)
+
+        with pytest.raises(ValueError, match="app"):
+            RepoRegistry.load(path)
+
+    def test_first_refresh_creates_mirror(self, registry, upstream):
+        """Первое обновление создаёт bare-зеркало с HEAD как у upstream."""
+        updated = registry.refresh("app")
+
+        mirror = Repo(registry.resolve("app"))
+        assert mirror.bare
+        assert mirror.git.symbolic_ref("HEAD") == "refs/heads/main"
+        assert mirror.head.commit.hexsha == upstream["repo"].head.commit.hexsha
+        assert updated == 3  # main, v1.0.0, v1.1.0
+        mirror.close()
+
+    def test_incremental_refresh(self, registry, upstream):
+        """Повторное обновление переносит только изменённые ссылки."""
+        registry.refresh("app")
+        assert registry.refresh("app") == 0
+
+        repo = upstream["repo"]
+        upstream["commit"]("fix: late fix")
+        repo.create_tag("v1.2.0")
+        repo.delete_tag(repo.tags["v1.0.0"])
+
+        assert registry.refresh("app") == 3  # main moved, v1.2.0 added, v1.0.0 pruned
+        assert registry.entries["app"].refreshed is not None
+
+    def test_refresh_error(self, registry, upstream):
+        """Недоступный upstream — ошибка сохраняется в записи."""
+        registry.entries["app"].upstream = os.path.join(upstream["tmpdir"], "missing")
+
+        results = refresh_repositories(["app", "nope"])
+
+        assert results["app"].startswith("Error:")
+        assert results["nope"] == "Error: Unknown repository"
+        assert registry.entries["app"].error
+        assert list_repositories()[0]["error"]
+
+    def test_tools_accept_name(self, registry, upstream):
+        """Инструменты принимают имя из реестра вместо пути."""
+        assert refresh_repositories() == {"app": "3 refs updated"}
+
+        assert generate_changelog("app") == generate_changelog(upstream["path"])
+
+    def test_warm_pins_handles(self, registry):
+        """Прогретые дескрипторы зеркал не закрываются по таймауту."""
+        registry.refresh("app")
+        registry.pool.idle_timeout = 0
+
+        assert registry.warm() == 1
+        assert registry.pool.prune() == 0
+        stats = registry.pool.stats()
+        assert stats["pinned"] == 1
+        assert stats["idle"] == 1
+
+    def test_background_refresh(self, registry, upstream):
+        """Фоновый поток обновляет зеркала по расписанию."""
+        registry.start_refresher(0.05)
+
+        deadline = time.monotonic() + 10
+        while registry.entries["app"].refreshed is None:
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+        registry.stop_refresher()
+
+        assert Repo(registry.resolve("app")).bare
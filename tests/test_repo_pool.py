@@ -0,0 +1,179 @@
+"""Tests for pooled Repo handles."""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+from git import Repo
+
+from mcp_server.server import generate_changelog
+from mcp_server.services.analyzer import InvalidRepoError, analyze_repo
+from mcp_server.services.repo_pool import RepoPool
+
+
+def _make_repo(path):
+    repo = Repo.init(path)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    file = os.path.join(path, "README.md")
+    with open(file, "w") as f:
+        f.write("# Test\n")
+    repo.index.add([file])
+    repo.index.commit("docs: initial README")
+    repo.create_tag("v1.0.0")
+    repo.close()
+
+
+@pytest.fixture
+def repo_paths():
+    """Three small repositories."""
+    tmpdir = tempfile.mkdtemp()
+    paths = []
+    for name in ("a", "b", "c"):
+        path = os.path.join(tmpdir, name)
+        _make_repo(path)
+        paths.append(path)
+
+    yield paths
+
+    shutil.rmtree(tmpdir)
+
+
+class TestRepoPool:
+    """Test RepoPool checkout and eviction."""
+
+    def test_reuses_returned_handle(self, repo_paths):
+        """Возвращённый дескриптор переиспользуется, путь нормализуется."""
+        pool = RepoPool()
+
+        with pool.checkout(repo_paths[0]) as first:
+            pass
+        with pool.checkout(repo_paths[0] + "/./") as second:
+            pass
+
+        assert second is first
+        assert pool.stats()["opened"] == 1
+        assert pool.stats()["reused"] == 1
+        pool.close_all()
+
+    def test_concurrent_checkouts_get_own_handles(self, repo_paths):
+        """Одновременные пользователи получают разные дескрипторы."""
+        pool = RepoPool()
+
+        with pool.checkout(repo_paths[0]) as first, pool.checkout(repo_paths[0]) as second:
+            assert first is not second
+            assert pool.stats()["checked_out"] == 2
+
+        assert pool.stats()["idle"] == 2
+        pool.close_all()
+
+    def test_lru_eviction(self, repo_paths):
+        """При заполнении пула закрывается давно не использованный."""
+        pool = RepoPool(max_handles=2)
+
+        for path in repo_paths:
+            with pool.checkout(path):
+                pass
+
+        stats = pool.stats()
+        assert stats["idle"] == 2
+        assert stats["closed"] == 1
+        with pool.checkout(repo_paths[0]):
+            pass
+        assert pool.stats()["opened"] == 4
+        pool.close_all()
+
+    def test_overflow_closed_on_return(self, repo_paths):
+        """Дескрипторы сверх лимита закрываются при возврате."""
+        pool = RepoPool(max_handles=1)
+
+        with pool.checkout(repo_paths[0]), pool.checkout(repo_paths[1]):
+            pass
+
+        stats = pool.stats()
+        assert stats["idle"] == 1
+        assert stats["closed"] == 1
+        pool.close_all()
+
+    def test_idle_timeout(self, repo_paths):
+        """Простаивающие дескрипторы закрываются."""
+        pool = RepoPool(idle_timeout=0)
+
+        with pool.checkout(repo_paths[0]):
+            pass
+
+        assert pool.prune() == 1
+        assert pool.stats()["idle"] == 0
+
+    def test_pinned_evicted_last(self, repo_paths):
+        """Закреплённые дескрипторы переживают таймаут и вытесняются последними."""
+        pool = RepoPool(max_handles=2, idle_timeout=0)
+        pool.pin(repo_paths[0])
+
+        for path in repo_paths:
+            with pool.checkout(path):
+                pass
+        pool.prune()
+
+        with pool.checkout(repo_paths[0]):
+            pass
+        assert pool.stats()["reused"] == 1
+        pool.close_all()
+
+    def test_invalid_path(self, repo_paths):
+        """Неверный путь — InvalidRepoError, счётчики не сбиваются."""
+        pool = RepoPool()
+
+        with pytest.raises(InvalidRepoError):
+            with pool.checkout(os.path.join(repo_paths[0], "missing")):
+                pass
+
+        assert pool.stats()["checked_out"] == 0
+
+    def test_removed_repository(self, repo_paths):
+        """Удалённый репозиторий не отдаётся из пула."""
+        pool = RepoPool()
+        with pool.checkout(repo_paths[0]):
+            pass
+        shutil.rmtree(repo_paths[0])
+
+        with pytest.raises(InvalidRepoError):
+            with pool.checkout(repo_paths[0]):
+                pass
+        assert pool.stats()["idle"] == 0
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_soak_resources_flat(repo_paths):
+    """Под нагрузкой число дескрипторов файлов и процессов не растёт."""
+    pid = str(os.getpid())
+
+    def child_processes():
+        count = 0
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    with open(f"/proc/{entry}/stat") as f:
+                        fields = f.read().rsplit(")", 1)[1].split()
+                except OSError:
+                    continue
+                # fields: state, ppid, ...; zombies count as leaked too
+                if fields[1] == pid:
+                    count += 1
+        return count
+
+    def run():
+        for path in repo_paths:
+            analyze_repo(path, use_cache=False)
+            generate_changelog(path)
+
+    run()  # Warm up pools
+    fds = len(os.listdir("/proc/self/fd"))
+    processes = child_processes()
+
+    for _ in range(30):
+        run()
+
+    assert len(os.listdir("/proc/self/fd")) <= fds
+    assert child_processes() <= processes
@@ -0,0 +1,238 @@
+"""Tests for memory-budgeted sorting and grouping."""
+
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+from git import Repo
+
+from mcp_server.server import generate_changelog
+from mcp_server.services.pipeline import PipelineProgress, iter_changelog_versions
+from mcp_server.services.spill import (
+    MEMORY_BUDGET_ENV,
+    SpillBudget,
+    SpilledList,
+    parse_size,
+    sort_spilled,
+)
+from mcp_server.services.template_service import TemplateService
+
+
+@pytest.fixture
+def temp_repo():
+    """Two releases and unreleased work, commit dates out of order."""
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+
+    days = iter([1, 3, 2, 5, 4, 6, 8, 7, 9, 10, 12, 11])
+
+    def commit(message):
+        path = os.path.join(tmpdir, "main.py")
+        with open(path, "a") as f:
+            f.write(message + "\n")
+        repo.index.add([path])
+        date = f"2024-01-{next(days):02d}T10:00:00"
+        repo.index.commit(message, commit_date=date, author_date=date)
+
+    for i in range(4):
+        commit(f"feat: feature {i}")
+    commit("fix!: breaking fix")
+    repo.create_tag("v1.0.0", message="v1.0.0")
+    for i in range(4):
+        commit(f"fix(core): bug {i}")
+    repo.create_tag("v1.1.0", message="v1.1.0")
+    for i in range(3):
+        commit(f"docs: page {i}")
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+@pytest.fixture
+def maintenance_repo():
+    """v1.0.1 tagged on a maintenance branch merged back after v1.1.0."""
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    main = repo.active_branch.name
+
+    def commit(name, message, day):
+        path = os.path.join(tmpdir, name)
+        with open(path, "a") as f:
+            f.write(message + "\n")
+        repo.index.add([path])
+        date = f"2024-01-{day:02d}T10:00:00"
+        repo.index.commit(message, commit_date=date, author_date=date)
+
+    commit("main.py", "feat: initial", 1)
+    repo.create_tag("v1.0.0")
+    repo.git.checkout("-b", "maint")
+    commit("fix.py", "fix: backported crash", 2)
+    repo.create_tag("v1.0.1")
+    repo.git.checkout(main)
+    commit("main.py", "feat: new api", 3)
+    repo.create_tag("v1.1.0")
+    repo.git.merge("maint", "--no-ff", "-m", "Merge branch 'maint'",
+                   env={"GIT_COMMITTER_DATE": "2024-01-04T10:00:00"})
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+class TestParseSize:
+    """Test parse_size."""
+
+    def test_units(self):
+        """Байты и суффиксы K, M, G."""
+        assert parse_size("65536") == 65536
+        assert parse_size("64K") == 64 * 1024
+        assert parse_size("512m") == 512 * 1024 * 1024
+        assert parse_size(" 1GB ") == 1024 ** 3
+
+    def test_invalid(self):
+        """Некорректный или нулевой размер — ValueError."""
+        with pytest.raises(ValueError):
+            parse_size("lots")
+        with pytest.raises(ValueError):
+            parse_size("0")
+
+
+class TestSortSpilled:
+    """Test the external sort."""
+
+    def test_matches_sorted(self):
+        """Результат совпадает с sorted(), в том числе порядок равных ключей."""
+        items = [(i * 7919 % 50, i) for i in range(2000)]
+        budget = SpillBudget(4096)
+
+        result = list(sort_spilled(items, lambda x: x[0], budget, reverse=True))
+
+        assert result == sorted(items, key=lambda x: x[0], reverse=True)
+        assert budget.spills > 1
+        assert budget.used == 0
+
+    def test_fits_in_memory(self):
+        """В пределах бюджета на диск ничего не пишется."""
+        budget = SpillBudget(1 << 20)
+
+        assert list(sort_spilled([3, 1, 2], lambda x: x, budget)) == [1, 2, 3]
+        assert budget.spills == 0
+
+
+class TestSpilledList:
+    """Test SpilledList."""
+
+    def test_len_bool_and_iteration(self):
+        """Длина, истинность и повторный обход после сброса на диск."""
+        budget = SpillBudget(2048)
+        items = SpilledList(budget)
+        assert not items
+
+        for i in range(500):
+            items.append({"n": i})
+
+        assert len(items) == 500
+        assert budget.spills > 0
+        assert list(items) == [{"n": i} for i in range(500)]
+        assert list(items) == [{"n": i} for i in range(500)]
+
+    def test_shared_budget(self):
+        """Превышение бюджета сбрасывает все списки."""
+        budget = SpillBudget(1024)
+        first, second = SpilledList(budget), SpilledList(budget)
+
+        for i in range(50):
+            first.append(i)
+            second.append(-i)
+
+        assert budget.used <= budget.limit
+        assert list(first) == list(range(50))
+
+
+class TestBudgetedChangelog:
+    """Test changelog generation under a memory budget."""
+
+    def test_versions_match_unbudgeted(self, temp_repo):
+        """Версии совпадают с обычной группировкой, коммиты от новых к старым."""
+        progress = PipelineProgress()
+        budgeted = list(iter_changelog_versions(temp_repo, progress=progress, memory_budget=512))
+        plain = list(iter_changelog_versions(temp_repo))
+
+        assert progress.spills > 0
+        assert [v.version for v in budgeted] == [v.version for v in plain]
+        for spilled, version in zip(budgeted, plain):
+            assert list(spilled.commits) == sorted(
+                version.commits, key=lambda c: c.date, reverse=True
+            )
+            assert list(spilled.breaking_changes) == [
+                c for c in spilled.commits if c.breaking
+            ]
+            assert {t: list(c) for t, c in spilled.commits_by_type.items()} == {
+                t: [c for c in spilled.commits if c.type == t]
+                for t in version.commits_by_type
+            }
+
+    def test_create_version_sorts_newest_first(self):
+        """create_version с бюджетом сортирует коммиты по дате."""
+        from mcp_server.services.analyzer import EnrichedCommit
+        from mcp_server.services.parser_service import parse_commit
+
+        start = datetime(2024, 1, 1)
+        commits = [
+            EnrichedCommit(
+                parsed=parse_commit(f"feat: f{i}"), hash=f"{i:040d}", short_hash=f"{i:07d}",
+                author="A", email="a@x", date=start + timedelta(days=i % 7),
+                files_changed=0, insertions=0, deletions=0,
+            )
+            for i in range(100)
+        ]
+
+        version = TemplateService().create_version(commits, "v1", None, SpillBudget(1024))
+
+        dates = [c.date for c in version.commits]
+        assert dates == sorted(dates, reverse=True)
+        assert len(version.commits_by_type["feat"]) == 100
+
+    def test_tool_output_matches(self, temp_repo):
+        """С бюджетом инструмент выдаёт тот же changelog."""
+        expected = generate_changelog(temp_repo.working_dir)
+
+        # JSON embeds the generation time
+        for output_format in ("markdown", "keepachangelog"):
+            assert generate_changelog(
+                temp_repo.working_dir, output_format=output_format, memory_budget="1K"
+            ) == generate_changelog(temp_repo.working_dir, output_format=output_format)
+        assert "breaking fix" in expected
+
+    def test_grouping_unchanged_on_side_branch(self, maintenance_repo):
+        """Бюджет не меняет, в какой релиз попадает коммит ветки сопровождения."""
+        path = maintenance_repo.working_dir
+
+        budgeted = generate_changelog(path, memory_budget="1K")
+
+        assert budgeted == generate_changelog(path)
+        assert budgeted.count("backported crash") == 1
+        assert budgeted.index("backported crash") > budgeted.index("## v1.0.1")
+
+    def test_environment_default(self, temp_repo, monkeypatch):
+        """Бюджет по умолчанию берётся из CHANGELOG_MEMORY_BUDGET."""
+        monkeypatch.setenv(MEMORY_BUDGET_ENV, "1K")
+        budgeted = generate_changelog(temp_repo.working_dir)
+        monkeypatch.delenv(MEMORY_BUDGET_ENV)
+
+        assert budgeted == generate_changelog(temp_repo.working_dir)
+
+    def test_invalid_budget(self, temp_repo):
+        """Некорректный бюджет возвращается текстом ошибки."""
+        result = generate_changelog(temp_repo.working_dir, memory_budget="lots")
+
+        assert result.startswith("Error:")
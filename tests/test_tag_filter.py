@@ -0,0 +1,168 @@
+"""Tests for release tag filtering."""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+from git import Git, Repo
+
+from mcp_server.server import generate_changelog
+from mcp_server.services.analyzer import get_tags
+from mcp_server.services.tag_filter import RELEASE_TAGS_ENV, TagFilter
+
+
+@pytest.fixture
+def temp_repo():
+    """Releases mixed with rc, nightly and per-package tags."""
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+
+    day = iter(range(1, 30))
+
+    def commit(message, *tags):
+        path = os.path.join(tmpdir, "main.py")
+        with open(path, "a") as f:
+            f.write(message + "\n")
+        repo.index.add([path])
+        date = f"2024-01-{next(day):02d}T10:00:00"
+        repo.index.commit(message, commit_date=date, author_date=date)
+        for tag in tags:
+            repo.create_tag(tag, message=tag)
+
+    commit("feat: initial", "v1.0.0")
+    commit("fix: crash", "v1.1.0-rc1", "nightly-20240102")
+    commit("feat: plugins", "v1.1.0", "pkg/core/v0.3.0")
+    commit("docs: update readme", "nightly-20240104")
+
+    yield repo
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+def spy_for_each_ref(monkeypatch):
+    """Record arguments of every git for-each-ref call."""
+    calls = []
+    monkeypatch.setattr(
+        Git, "for_each_ref",
+        lambda self, *args: calls.append(args) or self._call_process("for_each_ref", *args),
+        raising=False,
+    )
+    return calls
+
+
+def names(tags):
+    # Tags created in the same second have no stable date order
+    return sorted(t["name"] for t in tags)
+
+
+class TestTagFilter:
+    """Test TagFilter parsing and matching."""
+
+    def test_parse(self):
+        """Глобы, исключения и regex до конца строки."""
+        spec = TagFilter.parse(" v*, !*-rc* ,re:v\\d+\\.\\d{1,3}")
+
+        assert spec == TagFilter(("v*",), ("*-rc*",), "v\\d+\\.\\d{1,3}")
+        assert TagFilter.parse(None) == TagFilter()
+        assert TagFilter.parse("") == TagFilter()
+
+    def test_invalid_regex(self):
+        """Некорректный regex — ValueError."""
+        with pytest.raises(ValueError, match="regex"):
+            TagFilter.parse("re:v(")
+
+    def test_glob_does_not_cross_slash(self):
+        """* не совпадает с /, ** совпадает — как в git."""
+        assert TagFilter.parse("v*").matches("v1.0.0")
+        assert not TagFilter.parse("v*").matches("v1/hotfix")
+        assert TagFilter.parse("pkg/*/v*").matches("pkg/core/v0.3.0")
+        assert TagFilter.parse("**").matches("pkg/core/v0.3.0")
+
+    def test_exclude_and_regex(self):
+        """Исключения и regex применяются вместе с include."""
+        spec = TagFilter.parse("!nightly-*,re:v\\d+\\.\\d+\\.\\d+")
+
+        assert spec.matches("v1.1.0")
+        assert not spec.matches("v1.1.0-rc1")
+        assert not spec.matches("nightly-20240102")
+
+
+class TestGetTagsFiltered:
+    """Test tag filtering in get_tags."""
+
+    def test_no_filter(self, temp_repo):
+        """Без фильтра возвращаются все теги."""
+        assert len(get_tags(temp_repo, tag_filter=TagFilter())) == 6
+
+    def test_include_pushed_to_git(self, temp_repo, monkeypatch):
+        """Include-глобы передаются git как шаблоны ссылок."""
+        calls = spy_for_each_ref(monkeypatch)
+
+        tags = get_tags(temp_repo, use_cache=False, tag_filter=TagFilter.parse("v*"))
+
+        assert names(tags) == ["v1.0.0", "v1.1.0", "v1.1.0-rc1"]
+        assert len(calls) == 1
+        assert calls[0][-1] == "refs/tags/v*"
+
+    def test_excluded_tags_not_peeled(self, temp_repo, monkeypatch):
+        """Исключённые теги отсеиваются по имени до чтения объектов."""
+        calls = spy_for_each_ref(monkeypatch)
+
+        tags = get_tags(temp_repo, use_cache=False, tag_filter=TagFilter.parse("v*,!*-rc*"))
+
+        assert names(tags) == ["v1.0.0", "v1.1.0"]
+        # Names only, then only the selected refs are peeled
+        assert calls[0] == ("--format=%(refname)", "refs/tags/v*")
+        assert calls[1][2:] == ("refs/tags/v1.0.0", "refs/tags/v1.1.0")
+
+    def test_regex(self, temp_repo):
+        """Regex выбирает релизы по semver."""
+        tags = get_tags(temp_repo, tag_filter=TagFilter.parse("re:v\\d+\\.\\d+\\.\\d+"))
+
+        assert names(tags) == ["v1.0.0", "v1.1.0"]
+
+    def test_nothing_selected(self, temp_repo):
+        """Ни один тег не подошёл — пустой список."""
+        assert get_tags(temp_repo, tag_filter=TagFilter.parse("!**")) == []
+
+    def test_cached_per_filter(self, temp_repo):
+        """Кэш не смешивает результаты разных фильтров."""
+        assert len(get_tags(temp_repo, tag_filter=TagFilter.parse("v*"))) == 3
+        assert len(get_tags(temp_repo, tag_filter=TagFilter.parse("nightly-*"))) == 2
+
+    def test_environment_default(self, temp_repo, monkeypatch):
+        """По умолчанию фильтр берётся из RELEASE_TAGS."""
+        monkeypatch.setenv(RELEASE_TAGS_ENV, "pkg/core/*")
+
+        assert names(get_tags(temp_repo)) == ["pkg/core/v0.3.0"]
+
+
+class TestGenerateChangelogReleaseTags:
+    """Test the release_tags tool parameter."""
+
+    def test_rc_and_nightly_not_versions(self, temp_repo):
+        """rc и nightly-теги не становятся границами версий."""
+        changelog = generate_changelog(temp_repo.working_dir, release_tags="v*,!*-rc*")
+
+        assert "v1.1.0-rc1" not in changelog
+        assert "nightly" not in changelog
+        assert "## v1.1.0" in changelog
+        assert "crash" in changelog
+
+    def test_stream_path(self, temp_repo):
+        """Фильтр работает и в потоковом режиме."""
+        changelog = generate_changelog(
+            temp_repo.working_dir, release_tags="v*,!*-rc*", stream=True
+        )
+
+        assert changelog == generate_changelog(temp_repo.working_dir, release_tags="v*,!*-rc*")
+
+    def test_invalid_spec(self, temp_repo):
+        """Ошибка в regex возвращается текстом."""
+        result = generate_changelog(temp_repo.working_dir, release_tags="re:(")
+
+        assert result.startswith("Error:")
@@ -8,7 +8,12 @@ Tests cover:
 """
 
 import json
+import os
+import shutil
+import tempfile
+
 import pytest
+from git import Repo
 from pathlib import Path
 
 from mcp_server.services.template_service import TemplateService
@@ -307,6 +312,134 @@ class TestTemplateServiceIntegration:
             assert "contributors" in stats
 
 
+# =============================================================================
+# Ancestry-based Grouping Tests
+# =============================================================================
+
+def _mock_commit(sha: str, date: datetime):
+    """Minimal EnrichedCommit stand-in."""
+    return type('EnrichedCommit', (), {
+        'hash': sha,
+        'short_hash': sha[:7],
+        'date': date,
+        'author': 'Test Author',
+        'parsed': type('ParsedCommit', (), {
+            'type': 'feat',
+            'scope': None,
+            'description': f'change {sha}',
+            'breaking': False,
+        })(),
+    })()
+
+
+@pytest.fixture
+def merge_repo():
+    """
+    Repository where a feature branch is merged after its tag date.
+
+    main:    base -- main (v1.0.0) -- fix -- merge (v1.1.0) -- next
+    feature:  +-- login (dated before v1.0.0) --+
+    """
+    tmpdir = tempfile.mkdtemp()
+    repo = Repo.init(tmpdir)
+    repo.config_writer().set_value("user", "name", "Test User").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+
+    def commit(name, message, date):
+        path = os.path.join(tmpdir, name)
+        with open(path, "a") as f:
+            f.write(message + "\n")
+        repo.index.add([path])
+        return repo.index.commit(message, commit_date=date, author_date=date).hexsha
+
+    commit("README.md", "docs: base", "2024-01-01T10:00:00")
+    main_branch = repo.active_branch.name
+    repo.git.checkout("-b", "feature")
+    login = commit("login.py", "feat(auth): add login", "2024-01-02T10:00:00")
+    repo.git.checkout(main_branch)
+    commit("main.py", "feat: add main", "2024-01-03T10:00:00")
+    repo.create_tag("v1.0.0")
+    commit("main.py", "fix: fix output", "2024-01-04T10:00:00")
+    repo.git.merge(
+        "--no-ff", "-m", "chore: merge feature", "feature",
+        env={"GIT_AUTHOR_DATE": "2024-01-05T10:00:00",
+             "GIT_COMMITTER_DATE": "2024-01-05T10:00:00"},
+    )
+    repo.create_tag("v1.1.0")
+    commit("next.py", "feat: next", "2024-01-06T10:00:00")
+
+    yield {"path": tmpdir, "login": login}
+
+    repo.close()
+    shutil.rmtree(tmpdir)
+
+
+class TestGroupByAncestry:
+    """Test graph-based version assignment."""
+
+    def test_merged_branch_goes_to_containing_release(self, merge_repo):
+        """Коммит из ветки, влитой после тега, попадает в релиз с merge."""
+        result = analyze_repo(merge_repo["path"], fields={"commits", "tags", "graph"})
+        ts = TemplateService()
+
+        versions = ts.group_commits_by_version(
+            result["commits"], result["tags"], result["graph"]
+        )
+        by_name = {v.version: {c.hash for c in v.commits} for v in versions}
+
+        assert [v.version for v in versions] == ["Unreleased", "v1.1.0", "v1.0.0"]
+        assert merge_repo["login"] in by_name["v1.1.0"]
+        assert len(by_name["v1.0.0"]) == 2
+        assert len(by_name["Unreleased"]) == 1
+
+    def test_dense_tags_not_collapsed(self):
+        """Теги на соседних коммитах дают отдельные версии."""
+        ts = TemplateService()
+        date = datetime(2024, 1, 1)
+        graph = {"a": (), "b": ("a",), "c": ("b",), "d": ("c",)}
+        commits = [_mock_commit(sha, date) for sha in "dcba"]
+        tags = [
+            {"name": "v1.0.0", "hash": "a", "date": date},
+            {"name": "v1.0.1", "hash": "b", "date": date},
+            {"name": "v1.0.2", "hash": "c", "date": date},
+        ]
+
+        versions = ts.group_commits_by_version(commits, tags, graph)
+
+        assert [v.version for v in versions] == ["Unreleased", "v1.0.2", "v1.0.1", "v1.0.0"]
+        assert [[c.hash for c in v.commits] for v in versions] == [["d"], ["c"], ["b"], ["a"]]
+
+    def test_tag_outside_walked_range(self):
+        """Теги вне пройденного диапазона не забирают коммиты."""
+        ts = TemplateService()
+        date = datetime(2024, 1, 1)
+        graph = {"c": ("b",), "d": ("c",)}
+        commits = [_mock_commit(sha, date) for sha in "dc"]
+        tags = [
+            {"name": "v1.0.0", "hash": "b", "date": date},
+            {"name": "v1.1.0", "hash": "c", "date": date},
+        ]
+
+        versions = ts.group_commits_by_version(commits, tags, graph)
+
+        assert [v.version for v in versions] == ["Unreleased", "v1.1.0"]
+
+    def test_same_commit_tagged_twice(self):
+        """Второй тег на том же коммите не создаёт пустую версию."""
+        ts = TemplateService()
+        date = datetime(2024, 1, 1)
+        graph = {"a": ()}
+        tags = [
+            {"name": "v1.0.0", "hash": "a", "date": date},
+            {"name": "v1.0.0-final", "hash": "a", "date": date},
+        ]
+
+        versions = ts.group_commits_by_version([_mock_commit("a", date)], tags, graph)
+
+        assert len(versions) == 1
+        assert len(versions[0].commits) == 1
+
+
 # =============================================================================
 # Edge Cases and Boundary Tests
 # =============================================================================
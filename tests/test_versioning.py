@@ -0,0 +1,116 @@
+"""Tests for semantic version helpers."""
+
+from datetime import datetime
+
+from mcp_server.services.versioning import (
+    order_tags,
+    parse_version,
+    select_version_range,
+)
+
+
+def _tags(*names):
+    """Tag dicts in the given (date) order."""
+    return [
+        {"name": name, "hash": f"h{i}", "date": datetime(2024, 1, i + 1)}
+        for i, name in enumerate(names)
+    ]
+
+
+class TestParseVersion:
+    """Test parse_version."""
+
+    def test_numeric_ordering(self):
+        """v1.10.0 новее v1.9.0 (строковое сравнение ошибается)."""
+        assert parse_version("v1.10.0") > parse_version("v1.9.0")
+        assert "v1.10.0" < "v1.9.0"
+
+    def test_prerelease_before_release(self):
+        """Пре-релиз младше релиза."""
+        assert parse_version("v1.0.0-rc.1") < parse_version("v1.0.0")
+        assert parse_version("v1.0.0-alpha") < parse_version("v1.0.0-beta")
+        assert parse_version("v1.0.0-rc.2") < parse_version("v1.0.0-rc.10")
+        assert parse_version("v1.0.0-1") < parse_version("v1.0.0-alpha")
+
+    def test_prefixes_and_short_versions(self):
+        """Префиксы и неполные версии."""
+        assert parse_version("release-2.1") == parse_version("2.1.0")
+        assert parse_version("v2") == parse_version("v2.0.0")
+
+    def test_not_a_version(self):
+        """Теги без номера версии."""
+        assert parse_version("nightly") is None
+        assert parse_version("v1.0.0 beta") is None
+
+
+class TestOrderTags:
+    """Test order_tags."""
+
+    def test_semver_order(self):
+        """Сортировка по semver, а не по дате."""
+        tags = _tags("v1.10.0", "v1.9.0", "v1.2.0")
+
+        assert [t["name"] for t in order_tags(tags)] == ["v1.2.0", "v1.9.0", "v1.10.0"]
+
+    def test_mixed_tags_keep_date_order(self):
+        """Если есть не-semver теги, сохраняется порядок по дате."""
+        tags = _tags("v2.0.0", "nightly", "v1.0.0")
+
+        assert order_tags(tags) == tags
+
+
+class TestSelectVersionRange:
+    """Test select_version_range."""
+
+    def test_no_bounds(self):
+        """Без границ — вся история до HEAD."""
+        from_ref, to_ref, selected = select_version_range(_tags("v1.0.0", "v1.1.0"))
+
+        assert (from_ref, to_ref) == (None, None)
+        assert len(selected) == 2
+
+    def test_from_version(self):
+        """from_version включительно: диапазон начинается после предыдущего релиза."""
+        tags = _tags("v1.9.0", "v1.10.0", "v1.11.0")
+        from_ref, to_ref, selected = select_version_range(tags, from_version="v1.10.0")
+
+        assert from_ref == "v1.9.0"
+        assert to_ref is None
+        assert [t["name"] for t in selected] == ["v1.10.0", "v1.11.0"]
+
+    def test_to_version(self):
+        """to_version включительно: диапазон заканчивается на теге."""
+        tags = _tags("v1.9.0", "v1.10.0", "v1.11.0")
+        from_ref, to_ref, selected = select_version_range(tags, to_version="v1.10.0")
+
+        assert from_ref is None
+        assert to_ref == "v1.10.0"
+        assert [t["name"] for t in selected] == ["v1.9.0", "v1.10.0"]
+
+    def test_bounds_between_tags(self):
+        """Границы, не совпадающие с тегами."""
+        tags = _tags("v1.0.0", "v2.0.0", "v3.0.0")
+        from_ref, to_ref, selected = select_version_range(
+            tags, from_version="v1.5", to_version="v2.5"
+        )
+
+        assert (from_ref, to_ref) == ("v1.0.0", "v2.0.0")
+        assert [t["name"] for t in selected] == ["v2.0.0"]
+
+    def test_from_version_after_all_tags(self):
+        """from_version новее всех тегов — только unreleased."""
+        from_ref, to_ref, selected = select_version_range(
+            _tags("v1.0.0"), from_version="v9.9.9"
+        )
+
+        assert from_ref == "v1.0.0"
+        assert selected == []
+
+    def test_to_version_before_all_tags(self):
+        """to_version старше всех тегов — пустой диапазон."""
+        from_ref, to_ref, selected = select_version_range(
+            _tags("v1.0.0"), to_version="v0.1.0"
+        )
+
+        assert to_ref is None
+        assert selected == []